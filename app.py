@@ -11,6 +11,7 @@ from flask import Flask, render_template, request, jsonify, send_file
 from werkzeug.utils import secure_filename
 import pandas as pd
 import json
+import time
 from datetime import datetime
 from threading import Thread
 
@@ -19,6 +20,16 @@ from modules.proxy_manager import ProxyManager
 from modules.file_parser import FileParser
 from modules.scraper import GoogleMapsScraper
 from modules.utils import DataUtils, NotificationManager, ProxyHealthMonitor
+from modules.filters import BusinessFilter
+from modules.budgets import Budget
+from modules.data_extractor import DataExtractor
+from modules.selector_stats import SelectorStats
+from modules.proxy_prober import ProxyProber
+from modules.proxy_leases import SharedLeaseTable
+from modules.proxy_health_store import ProxyHealthStore
+from modules.proxy_timeseries import ProxyTimeSeries
+from modules.job_planner import ThroughputHistory, JobPlanner, LiveEta, query_kind
+from modules.reviews import job_fingerprint
 
 
 # Initialize Flask app
@@ -49,6 +60,10 @@ app_state = {
     'failure_count': 0,
     'current_query': '',
     'current_proxy': '',
+    'budget_stops': [],  # Queries (or the job) ended by a budget
+    'job_summary': None,  # Set when a job finishes
+    'reviews_count': 0,  # Reviews streamed to the reviews CSV (reviews mode)
+    'plan': None,  # Duration and cost estimate made when the job started
     'results': []
 }
 
@@ -57,16 +72,39 @@ proxy_manager = None
 scraper = None
 notification_manager = None
 proxy_health_monitor = None
+proxy_prober = None
+throughput_history = None
+job_eta = None
 
 
 def initialize_components():
     """Initialize proxy manager and scraper."""
-    global proxy_manager, scraper, notification_manager, proxy_health_monitor
+    global proxy_manager, scraper, notification_manager, proxy_health_monitor, proxy_prober, throughput_history
     
     try:
+        # Proxy health: outcomes recorded by the scraper drive proxy selection
+        # Saved health is loaded so selection starts from recent data instead of re-learning
+        proxy_health_monitor = ProxyHealthMonitor(
+            half_life=Config.PROXY_HEALTH_HALF_LIFE,
+            failure_threshold=Config.PROXY_FAILURE_THRESHOLD,
+            cooldown=Config.PROXY_COOLDOWN,
+            max_cooldown=Config.PROXY_MAX_COOLDOWN,
+            store=ProxyHealthStore(Config.PROXY_HEALTH_DB) if Config.PROXY_HEALTH_DB else None,
+            flush_interval=Config.PROXY_HEALTH_FLUSH_INTERVAL,
+            timeseries=ProxyTimeSeries(
+                interval=Config.PROXY_TIMESERIES_INTERVAL,
+                capacity=Config.PROXY_TIMESERIES_CAPACITY
+            )
+        )
+        logger.info("Initialized ProxyHealthMonitor")
+        
         proxy_manager = ProxyManager(
             proxy_file=Config.PROXY_FILE,
-            rotation_threshold=Config.ROTATION_THRESHOLD
+            rotation_threshold=Config.ROTATION_THRESHOLD,
+            health_monitor=proxy_health_monitor,
+            weighted_rotation=Config.HEALTH_WEIGHTED_PROXIES,
+            max_users_per_proxy=Config.MAX_USERS_PER_PROXY,
+            lease_table=SharedLeaseTable(Config.PROXY_LEASE_DB, Config.PROXY_LEASE_TTL) if Config.SHARED_PROXY_LEASES else None
         )
         proxy_count = proxy_manager.get_proxy_count()
         logger.info(f"Initialized ProxyManager with {proxy_count} proxies")
@@ -77,6 +115,32 @@ def initialize_components():
             logger.error(f"Add proxies to {Config.PROXY_FILE} in format: IP:PORT:USERNAME:PASSWORD")
             return False
         
+        # Pre-flight probe: quarantine dead proxies and rank live ones by latency before any job
+        proxy_prober = ProxyProber(
+            health_monitor=proxy_health_monitor,
+            target=Config.PROXY_PROBE_TARGET,
+            timeout=Config.PROXY_PROBE_TIMEOUT,
+            max_concurrent=Config.PROXY_PROBE_CONCURRENCY,
+            slow_latency=Config.PROXY_PROBE_SLOW_LATENCY
+        )
+        if Config.PROXY_PROBE_ON_STARTUP:
+            ranked = asyncio.run(proxy_prober.probe_all(proxy_manager.proxies))
+            healthy = [result for result in ranked if result['ok']]
+            if healthy:
+                proxy_manager.select_proxy(healthy[0]['proxy'])
+            else:
+                logger.warning("No proxy passed the pre-flight probe - they stay in rotation after their cooldown")
+        if Config.PROXY_PROBE_INTERVAL:
+            proxy_prober.run_periodic(lambda: proxy_manager.proxies, Config.PROXY_PROBE_INTERVAL)
+            logger.info(f"Scheduled proxy probes every {Config.PROXY_PROBE_INTERVAL}s")
+        
+        # Hot reload of the proxy file; new proxies are probed before they join the pool
+        if Config.PROXY_FILE_WATCH_INTERVAL:
+            proxy_manager.watch(
+                Config.PROXY_FILE_WATCH_INTERVAL,
+                probe=lambda proxies: asyncio.run(proxy_prober.probe_all(proxies))
+            )
+        
         scraper = GoogleMapsScraper(
             proxy_manager=proxy_manager,
             headless=Config.HEADLESS
@@ -91,9 +155,18 @@ def initialize_components():
             )
             logger.info("Initialized NotificationManager")
         
-        # Initialize proxy health monitor
-        proxy_health_monitor = ProxyHealthMonitor()
-        logger.info("Initialized ProxyHealthMonitor")
+        # Self-tuning selector ordering (persisted across restarts)
+        DataExtractor.selector_stats = SelectorStats(
+            stats_file=Config.SELECTOR_STATS_FILE,
+            skip_after=Config.SELECTOR_SKIP_AFTER
+        )
+        logger.info("Initialized SelectorStats")
+        
+        # Selector and email page timeouts share the scraper's latency histograms
+        DataExtractor.timeouts = scraper.timeouts
+        
+        # Per-query timings, businesses and bytes for job duration and cost estimates
+        throughput_history = ThroughputHistory(Config.JOB_HISTORY_FILE)
         
         return True
     except Exception as e:
@@ -112,44 +185,178 @@ def reset_state():
         'failure_count': 0,
         'current_query': '',
         'current_proxy': '',
+        'budget_stops': [],
+        'job_summary': None,
+        'reviews_count': 0,
+        'plan': None,
         'results': []
     }
 
 
-async def scrape_queries_async(queries):
+def make_planner():
+    """Create a job planner for the current settings and recorded throughput."""
+    return JobPlanner(
+        throughput_history or ThroughputHistory(),
+        parallel_tabs=Config.PARALLEL_TABS,
+        cost_per_gb=Config.PROXY_COST_PER_GB,
+        rate_limit=Config.PROXY_RATE_LIMIT,
+        delay_between_queries=Config.DELAY_BETWEEN_QUERIES
+    )
+
+
+def job_bytes():
+    """Get the proxy bytes the current job has used so far."""
+    if not scraper or not scraper.bandwidth:
+        return 0
+    return scraper.bandwidth.get_job_summary(top=0)['total']['total_bytes']
+
+
+def parse_job_options(source):
+    """
+    Build per-job scraper options from a /start JSON body or an upload form.
+    
+    Args:
+        source: Dict-like object (parsed JSON or request.form)
+        
+    Returns:
+        Tuple of (options dict, error message or None)
+    """
+    options = {}
+    
+    extraction_mode = str(source.get('extraction_mode') or '').strip().lower()
+    if extraction_mode:
+        if extraction_mode not in ('tab', 'panel'):
+            return {}, "Invalid extraction_mode. Use 'tab' or 'panel'"
+        options['extraction_mode'] = extraction_mode
+    
+    # Field projection: only the requested columns are extracted
+    fields = source.get('fields')
+    if fields:
+        if isinstance(fields, str):
+            fields = fields.split(',')
+        if not isinstance(fields, list):
+            return {}, 'fields must be a list or comma-separated string'
+        fields = [str(field).strip() for field in fields if str(field).strip()]
+        unknown = [field for field in fields if field not in DataExtractor.DETAIL_FIELDS]
+        if unknown:
+            return {}, f"Unknown fields: {', '.join(unknown)}"
+        options['fields'] = fields
+    
+    # Filter predicates evaluated on result cards before detail tabs are opened
+    business_filter, error = BusinessFilter.from_options(source)
+    if error:
+        return {}, error
+    if business_filter:
+        options['filter'] = business_filter
+    
+    # Budgets: max_businesses / max_seconds / max_bytes per query, job_-prefixed for the whole job
+    query_budget, error = Budget.from_options(source, 'query')
+    if error:
+        return {}, error
+    if query_budget:
+        options['query_budget'] = query_budget
+    
+    job_budget, error = Budget.from_options(source, 'job', prefix='job_')
+    if error:
+        return {}, error
+    if job_budget:
+        options['job_budget'] = job_budget
+    
+    # Reviews mode: stream each place's reviews to a separate CSV
+    reviews = source.get('reviews')
+    if isinstance(reviews, str):
+        reviews = reviews.strip().lower() in ('1', 'true', 'yes', 'on')
+    if reviews:
+        options['reviews'] = True
+    
+    max_reviews = source.get('max_reviews_per_place')
+    if max_reviews not in (None, ''):
+        try:
+            max_reviews = int(max_reviews)
+        except (TypeError, ValueError):
+            return {}, 'max_reviews_per_place must be a number'
+        if max_reviews < 0:
+            return {}, 'max_reviews_per_place must not be negative'
+        options['max_reviews_per_place'] = max_reviews
+    
+    return options, None
+
+
+async def scrape_queries_async(queries, options=None):
     """
     Asynchronously scrape all queries with comprehensive error handling.
     Saves results incrementally to CSV.
     
     Args:
         queries: List of query dictionaries
+        options: Optional per-job scraper options (see parse_job_options)
     """
-    global app_state, scraper, proxy_manager
+    global app_state, scraper, proxy_manager, job_eta
+    
+    # Setup incremental CSV saving
+    location = queries[0].get('zip_code', 'results') if queries else 'results'
+    location = location.lower().replace(' ', '-')
+    timestamp = datetime.now().strftime('%Y-%m-%d')
+    csv_filename = f'{location}-{timestamp}.csv'
+    csv_filepath = os.path.join('output', csv_filename)
+    reviews_filepath = os.path.join('output', f'{location}-{timestamp}-reviews.csv')
+    
+    # Create CSV file with headers
+    csv_headers_written = False
+    reviews_headers_written = False
+    
+    def save_review_to_csv(review):
+        """Callback to append each streamed review to the reviews CSV (reviews are not kept in memory)."""
+        nonlocal reviews_headers_written
+        
+        try:
+            df = pd.DataFrame([review])
+            if not reviews_headers_written:
+                df.to_csv(reviews_filepath, mode='w', index=False, header=True)
+                reviews_headers_written = True
+                logger.info(f"Created reviews CSV file: {reviews_filepath}")
+            else:
+                df.to_csv(reviews_filepath, mode='a', index=False, header=False)
+            app_state['reviews_count'] += 1
+        except Exception as e:
+            logger.error(f"Error saving review to CSV: {e}")
     
     try:
+        if options and options.get('reviews'):
+            # Same queries and cap: a job restarted after an interruption resumes its reviews
+            options = dict(options, reviews_job=job_fingerprint(queries, options))
+        scraper.set_job_options(options, review_callback=save_review_to_csv)
+        
         app_state['status'] = 'running'
         app_state['total_queries'] = len(queries)
         app_state['processed'] = 0
         app_state['success_count'] = 0
         app_state['failure_count'] = 0
+        app_state['budget_stops'] = []
+        app_state['job_summary'] = None
+        app_state['reviews_count'] = 0
         app_state['results'] = []
         
+        # Estimate up front; the live ETA starts from it and follows the observed throughput
+        app_state['plan'] = make_planner().estimate(queries, options)
+        job_eta = LiveEta(
+            len(queries),
+            app_state['plan']['seconds_per_query'],
+            app_state['plan']['bytes_per_query'],
+            cost_per_gb=Config.PROXY_COST_PER_GB
+        )
+        
         logger.info(f"Starting scraping for {len(queries)} queries")
+        logger.info(
+            f"Estimated {app_state['plan']['seconds'] / 60:.0f} min "
+            f"(slow case {app_state['plan']['seconds_p90'] / 60:.0f} min), "
+            f"{app_state['plan']['gb']:.2f} GB proxy traffic"
+        )
     except Exception as e:
         logger.error(f"Error initializing scrape: {e}", exc_info=True)
         app_state['status'] = 'completed'
         return
     
-    # Setup incremental CSV saving
-    location = queries[0].get('zip_code', 'results') if queries else 'results'
-    location = location.lower().replace(' ', '-')
-    timestamp = datetime.now().strftime('%Y-%m-%d')
-    csv_filename = f'{location}-{timestamp}.csv'
-    csv_filepath = os.path.join('output', csv_filename)
-    
-    # Create CSV file with headers
-    csv_headers_written = False
-    
     def save_to_csv(business_info):
         """Callback to save each business to CSV incrementally AND update app_state for real-time map."""
         nonlocal csv_headers_written
@@ -188,6 +395,10 @@ async def scrape_queries_async(queries):
         logger.info(f"Processing query {idx}/{len(queries)}: {keyword} in {zip_code}")
         logger.info(f"Using proxy: {app_state['current_proxy']}")
         
+        query_started = time.monotonic()
+        bytes_before = job_bytes()
+        businesses = None
+        
         try:
             # Scrape the query with incremental CSV saving (businesses are added to app_state in real-time via callback)
             businesses = await scraper.scrape_query(query, csv_callback=save_to_csv)
@@ -212,8 +423,31 @@ async def scrape_queries_async(queries):
         
         app_state['processed'] += 1
         
+        # Feed the throughput history (future estimates) and the live ETA; a query a budget
+        # cut short is not a sample of how long queries take
+        query_bytes = job_bytes() - bytes_before
+        truncated = bool(scraper.stop_reason)
+        if throughput_history and businesses is not None and app_state['status'] != 'stopped' and not truncated:
+            throughput_history.record_query(
+                query_kind(query), time.monotonic() - query_started, len(businesses),
+                query_bytes, scraper.get_query_tabs()
+            )
+        job_eta.query_done(query_bytes)
+        
+        # Report which budget ended the query; a job budget ends the job
+        if scraper.stop_reason:
+            app_state['budget_stops'].append({
+                'query': app_state['current_query'],
+                'budget': scraper.stop_reason
+            })
+            if scraper.stop_reason.startswith('job'):
+                logger.info(f"Job budget exhausted ({scraper.stop_reason}) - skipping remaining queries")
+                break
+        
         # Configurable delay between queries to avoid rate limiting
-        await asyncio.sleep(Config.DELAY_BETWEEN_QUERIES)
+        # (not needed when every navigation already waits on its proxy's token bucket)
+        if not scraper.rate_limiter:
+            await asyncio.sleep(Config.DELAY_BETWEEN_QUERIES)
     
     # Cleanup
     try:
@@ -222,6 +456,15 @@ async def scrape_queries_async(queries):
     except Exception as e:
         logger.error(f"Error during scraper cleanup: {e}")
     
+    # A job that ran to the end has no reviews to resume
+    if app_state['status'] != 'stopped':
+        scraper.finish_job()
+    
+    if DataExtractor.selector_stats:
+        DataExtractor.selector_stats.save()
+    if proxy_health_monitor:
+        proxy_health_monitor.flush()
+    
     # Deduplicate results if enabled
     original_count = len(app_state['results'])
     if Config.DEDUPLICATE_RESULTS and app_state['results']:
@@ -241,6 +484,22 @@ async def scrape_queries_async(queries):
     logger.info(f"Scraping finished: {app_state['success_count']} successful, {app_state['failure_count']} failed")
     logger.info(f"Total businesses collected: {len(app_state['results'])}")
     logger.info(f"Results saved to: {csv_filepath}")
+    if app_state['reviews_count']:
+        logger.info(f"{app_state['reviews_count']} reviews saved to: {reviews_filepath}")
+    
+    # Proxy traffic and cost for the job
+    bandwidth_summary = scraper.bandwidth.get_job_summary() if scraper.bandwidth else None
+    app_state['job_summary'] = {
+        'total_businesses': original_count,
+        'unique_businesses': len(app_state['results']),
+        'bandwidth': bandwidth_summary
+    }
+    if bandwidth_summary:
+        total = bandwidth_summary['total']
+        logger.info(
+            f"Proxy traffic: {total['total_bytes'] / (1024 * 1024):.1f} MB "
+            f"({total['website_bytes'] / (1024 * 1024):.1f} MB websites), cost {total['cost']:.4f}"
+        )
     
     # Send completion notification if enabled
     if notification_manager and Config.ENABLE_NOTIFICATIONS:
@@ -250,24 +509,26 @@ async def scrape_queries_async(queries):
                 'success_count': app_state['success_count'],
                 'failure_count': app_state['failure_count'],
                 'total_businesses': original_count,
-                'unique_businesses': len(app_state['results'])
+                'unique_businesses': len(app_state['results']),
+                'bandwidth': bandwidth_summary['total'] if bandwidth_summary else None
             })
         except Exception as e:
             logger.error(f"Failed to send notification: {e}")
 
 
-def run_scraping_thread(queries):
+def run_scraping_thread(queries, options=None):
     """
     Run scraping in a separate thread with asyncio.
     
     Args:
         queries: List of query dictionaries
+        options: Optional per-job scraper options
     """
     try:
         logger.info("Scraping thread started")
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        loop.run_until_complete(scrape_queries_async(queries))
+        loop.run_until_complete(scrape_queries_async(queries, options))
         loop.close()
         logger.info("Scraping thread completed")
     except Exception as e:
@@ -315,52 +576,139 @@ plumbers,33101,
     )
 
 
-@app.route('/upload', methods=['POST'])
-def upload_file():
+def parse_uploaded_queries():
     """
-    Handle file upload (CSV or Excel).
-    Parse and validate the file, then start scraping.
+    Save the uploaded CSV or Excel file and parse its queries.
+    
+    Returns:
+        Tuple of (queries, error message or None)
     """
-    try:
-        if 'file' not in request.files:
-            return jsonify({'error': 'No file provided'}), 400
+    if 'file' not in request.files:
+        return [], 'No file provided'
+    
+    file = request.files['file']
+    
+    if file.filename == '':
+        return [], 'No file selected'
+    
+    # Check file extension
+    if not file.filename.lower().endswith(('.csv', '.xlsx', '.xls')):
+        return [], 'Invalid file format. Please upload CSV or Excel file.'
+    
+    # Save file
+    filename = secure_filename(file.filename)
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    file.save(filepath)
+    
+    logger.info(f"File uploaded: {filename}")
+    
+    # Parse file
+    queries, error = FileParser.parse_file(filepath)
+    
+    if error:
+        return [], error
+    
+    if not queries:
+        return [], 'No valid queries found in file'
+    
+    return queries, None
+
+
+def build_queries(data):
+    """
+    Build queries from a /start JSON body.
+    Supports three modes:
+    - keyword: keyword + location search
+    - search_url: Google Maps search URL
+    - business_urls: Multiple business URLs
+    
+    Args:
+        data: Parsed JSON body
+        
+    Returns:
+        Tuple of (queries, error message or None)
+    """
+    mode = data.get('mode', 'keyword')
+    
+    if mode == 'keyword':
+        # Traditional keyword + location mode
+        keyword = data.get('keyword', '').strip()
+        location = data.get('location', '').strip()
+        
+        if not keyword or not location:
+            return [], 'Keyword and location are required'
+        
+        return [{
+            'keyword': keyword,
+            'zip_code': location,
+            'url': ''
+        }], None
         
-        file = request.files['file']
+    elif mode == 'search_url':
+        # Google Maps search URL mode
+        url = data.get('url', '').strip()
         
-        if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
+        if not url:
+            return [], 'Search URL is required'
         
-        # Check file extension
-        if not file.filename.lower().endswith(('.csv', '.xlsx', '.xls')):
-            return jsonify({'error': 'Invalid file format. Please upload CSV or Excel file.'}), 400
+        if 'google.com/maps' not in url:
+            return [], 'Invalid Google Maps URL'
         
-        # Save file
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        return [{
+            'keyword': '',
+            'zip_code': '',
+            'url': url
+        }], None
         
-        logger.info(f"File uploaded: {filename}")
+    elif mode == 'business_urls':
+        # Multiple business URLs mode
+        urls = data.get('urls', [])
         
-        # Parse file
-        queries, error = FileParser.parse_file(filepath)
+        if not urls or len(urls) == 0:
+            return [], 'At least one business URL is required'
         
+        # Validate URLs
+        for url in urls:
+            if 'google.com/maps' not in url:
+                return [], f'Invalid Google Maps URL: {url}'
+        
+        # Create a query for each URL
+        return [{
+            'keyword': '',
+            'zip_code': '',
+            'url': url
+        } for url in urls], None
+    
+    return [], 'Invalid mode'
+
+
+@app.route('/upload', methods=['POST'])
+def upload_file():
+    """
+    Handle file upload (CSV or Excel).
+    Parse and validate the file, then start scraping.
+    """
+    try:
+        queries, error = parse_uploaded_queries()
         if error:
             return jsonify({'error': error}), 400
         
-        if not queries:
-            return jsonify({'error': 'No valid queries found in file'}), 400
+        options, error = parse_job_options(request.form)
+        if error:
+            return jsonify({'error': error}), 400
         
         # Reset state
         reset_state()
         
         # Start scraping in background thread
-        thread = Thread(target=run_scraping_thread, args=(queries,))
+        thread = Thread(target=run_scraping_thread, args=(queries, options))
         thread.daemon = True
         thread.start()
         
         return jsonify({
             'message': 'Scraping started',
-            'query_count': len(queries)
+            'query_count': len(queries),
+            'estimate': make_planner().estimate(queries, options)
         }), 200
         
     except Exception as e:
@@ -371,11 +719,7 @@ def upload_file():
 @app.route('/start', methods=['POST'])
 def start_scraping():
     """
-    Start scraping with manually entered queries or URLs.
-    Supports three modes:
-    - keyword: keyword + location search
-    - search_url: Google Maps search URL
-    - business_urls: Multiple business URLs
+    Start scraping with manually entered queries or URLs (see build_queries for the modes).
     """
     try:
         data = request.get_json()
@@ -383,74 +727,28 @@ def start_scraping():
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
-        mode = data.get('mode', 'keyword')
-        queries = []
+        queries, error = build_queries(data)
+        if error:
+            return jsonify({'error': error}), 400
         
-        if mode == 'keyword':
-            # Traditional keyword + location mode
-            keyword = data.get('keyword', '').strip()
-            location = data.get('location', '').strip()
-            
-            if not keyword or not location:
-                return jsonify({'error': 'Keyword and location are required'}), 400
-            
-            queries = [{
-                'keyword': keyword,
-                'zip_code': location,
-                'url': ''
-            }]
-            
-        elif mode == 'search_url':
-            # Google Maps search URL mode
-            url = data.get('url', '').strip()
-            
-            if not url:
-                return jsonify({'error': 'Search URL is required'}), 400
-            
-            if 'google.com/maps' not in url:
-                return jsonify({'error': 'Invalid Google Maps URL'}), 400
-            
-            queries = [{
-                'keyword': '',
-                'zip_code': '',
-                'url': url
-            }]
-            
-        elif mode == 'business_urls':
-            # Multiple business URLs mode
-            urls = data.get('urls', [])
-            
-            if not urls or len(urls) == 0:
-                return jsonify({'error': 'At least one business URL is required'}), 400
-            
-            # Validate URLs
-            for url in urls:
-                if 'google.com/maps' not in url:
-                    return jsonify({'error': f'Invalid Google Maps URL: {url}'}), 400
-            
-            # Create a query for each URL
-            queries = [{
-                'keyword': '',
-                'zip_code': '',
-                'url': url
-            } for url in urls]
-            
-        else:
-            return jsonify({'error': 'Invalid mode'}), 400
+        options, error = parse_job_options(data)
+        if error:
+            return jsonify({'error': error}), 400
         
         # Reset state
         reset_state()
         
         # Start scraping in background thread
-        logger.info(f"Creating scraping thread for {len(queries)} queries (mode: {mode})")
-        thread = Thread(target=run_scraping_thread, args=(queries,))
+        logger.info(f"Creating scraping thread for {len(queries)} queries (mode: {data.get('mode', 'keyword')})")
+        thread = Thread(target=run_scraping_thread, args=(queries, options))
         thread.daemon = True
         thread.start()
         logger.info("Scraping thread started successfully")
         
         return jsonify({
             'message': 'Scraping started',
-            'query_count': len(queries)
+            'query_count': len(queries),
+            'estimate': make_planner().estimate(queries, options)
         }), 200
         
     except Exception as e:
@@ -458,13 +756,47 @@ def start_scraping():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/plan', methods=['POST'])
+def plan_job():
+    """
+    Estimate a job's duration and proxy traffic cost without starting it.
+    Accepts the same input as /upload (file + form options) or /start (JSON body).
+    """
+    try:
+        if request.files:
+            queries, error = parse_uploaded_queries()
+            source = request.form
+        else:
+            source = request.get_json(silent=True)
+            if not source:
+                return jsonify({'error': 'No data provided'}), 400
+            queries, error = build_queries(source)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        options, error = parse_job_options(source)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        return jsonify(make_planner().estimate(queries, options)), 200
+        
+    except Exception as e:
+        logger.error(f"Error in plan: {e}", exc_info=True)
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/status')
 def get_status():
     """
     Get current scraping status.
     Returns JSON with current state.
     """
-    return jsonify(app_state)
+    status = dict(app_state)
+    if scraper:
+        status['scraper_stats'] = scraper.get_stats()
+    if job_eta and app_state['status'] == 'running':
+        status['eta'] = job_eta.get()
+    return jsonify(status)
 
 
 @app.route('/stop', methods=['POST'])
@@ -495,10 +827,38 @@ def get_proxy_health():
     return jsonify({
         'proxy_stats': stats,
         'best_proxy': best_proxy,
-        'total_proxies': proxy_manager.get_proxy_count() if proxy_manager else 0
+        'total_proxies': proxy_manager.get_proxy_count() if proxy_manager else 0,
+        'bandwidth': scraper.bandwidth.get_proxy_stats() if scraper and scraper.bandwidth else {},
+        'probe': proxy_prober.get_stats() if proxy_prober else None,
+        'leases': proxy_manager.get_lease_stats() if proxy_manager else None
     })
 
 
+@app.route('/proxy-health/series')
+def get_proxy_health_series():
+    """
+    Get per-proxy, per-minute health samples newer than a cursor.
+    Query params: since (cursor from the previous response), proxy (optional filter).
+    """
+    if not proxy_health_monitor or not proxy_health_monitor.timeseries:
+        return jsonify({'error': 'Proxy time series not initialized'}), 500
+    
+    since = request.args.get('since', 0, type=int)
+    return jsonify(proxy_health_monitor.timeseries.get_samples(since=since, proxy=request.args.get('proxy')))
+
+
+@app.route('/selector-stats')
+def get_selector_stats():
+    """
+    Get selector hit/miss statistics.
+    A selector whose hit rate drops suddenly usually means Google changed its markup.
+    """
+    if not DataExtractor.selector_stats:
+        return jsonify({'error': 'Selector stats not initialized'}), 500
+    
+    return jsonify(DataExtractor.selector_stats.get_stats())
+
+
 @app.route('/download/<format>')
 def download_results(format):
     """
@@ -595,5 +955,9 @@ if __name__ == '__main__':
         logger.info("All components initialized successfully")
         logger.info(f"Server starting at http://127.0.0.1:5000")
         app.run(host='127.0.0.1', port=5000, debug=False)
+        
+        # Keep the latest proxy health for the next start
+        if proxy_health_monitor:
+            proxy_health_monitor.flush()
     else:
         logger.error("Failed to initialize components. Exiting.")
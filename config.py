@@ -20,6 +20,27 @@ class Config:
     # Scraper settings
     PROXY_FILE = 'proxies.txt'
     ROTATION_THRESHOLD = 14  # Rotate proxy after N requests
+    HEALTH_WEIGHTED_PROXIES = True  # Pick the next proxy by health instead of list order
+    PROXY_HEALTH_HALF_LIFE = 600  # Seconds; older outcomes weigh less in a proxy's score
+    PROXY_FAILURE_THRESHOLD = 3  # Consecutive failures that open a proxy's circuit
+    PROXY_COOLDOWN = 60  # Seconds a circuit-broken proxy is skipped (doubles on each re-trip)
+    PROXY_MAX_COOLDOWN = 900
+    PROXY_HEALTH_DB = 'proxy_health.db'  # Health survives restarts (None = in memory only)
+    PROXY_TIMESERIES_INTERVAL = 60  # Seconds per proxy health sample (dashboard trends)
+    PROXY_TIMESERIES_CAPACITY = 10000  # Samples kept in memory across all proxies (oldest dropped)
+    PROXY_HEALTH_FLUSH_INTERVAL = 30  # Seconds between writes of changed proxy health
+    PROXY_PROBE_ON_STARTUP = True  # Probe all proxies in parallel before any job runs
+    PROXY_PROBE_INTERVAL = 300  # Seconds between scheduled re-probes (0 = never)
+    PROXY_PROBE_TARGET = 'www.google.com:443'  # host:port each proxy must tunnel to
+    PROXY_PROBE_TIMEOUT = 10  # Seconds per probe
+    PROXY_PROBE_CONCURRENCY = 50
+    PROXY_PROBE_SLOW_LATENCY = None  # Seconds; slower probes quarantine the proxy (None = no limit)
+    PROXY_FILE_WATCH_INTERVAL = 5  # Seconds between checks of PROXY_FILE for changes (0 = no hot reload)
+    MAX_USERS_PER_PROXY = 0  # Concurrent leases per proxy (browsers, hedge contexts; 0 = unlimited)
+    PROXY_LEASE_WAIT = 300  # Seconds a new browser waits for a proxy slot when every proxy is at MAX_USERS_PER_PROXY
+    SHARED_PROXY_LEASES = False  # Share leases between scraper processes through PROXY_LEASE_DB
+    PROXY_LEASE_DB = 'proxy_leases.db'
+    PROXY_LEASE_TTL = 3600  # Seconds before an unreleased lease is reclaimed
     REQUEST_TIMEOUT = 30  # Seconds to wait for page elements
     PAGE_LOAD_TIMEOUT = 60  # Seconds to wait for page load
     HEADLESS = False  # Set to True for production (no visible browser)
@@ -28,6 +49,56 @@ class Config:
     # Parallel scraping settings
     PARALLEL_TABS = 5  # Number of tabs to open simultaneously (3-5 recommended for stability)
     MAX_CONCURRENT_BUSINESSES = 5  # Max businesses to scrape at once
+    ADAPTIVE_CONCURRENCY = True  # Adjust tabs per proxy at runtime (AIMD), starting from PARALLEL_TABS
+    MIN_PARALLEL_TABS = 1
+    MAX_PARALLEL_TABS = 10
+    TAB_LATENCY_TARGET = 15  # Seconds; slower median tab latency cuts concurrency
+    MAX_RESULTS_PER_QUERY = 100  # Default cap; per-query and per-job budgets can lower it
+    EXTRACTION_MODE = 'tab'  # 'tab' = new tab per business, 'panel' = click cards in the results list
+    
+    # Self-tuning selector ordering
+    SELECTOR_STATS_FILE = 'selector_stats.json'
+    SELECTOR_SKIP_AFTER = 50  # Skip a selector after it missed on N consecutive pages
+    
+    # Per-proxy session state (cookies, localStorage) reused by new browsers
+    PERSIST_SESSIONS = True
+    SESSION_STATE_DIR = 'sessions'
+    SESSION_STATE_MAX_AGE = 6 * 3600  # Seconds; older sessions start cold
+    
+    # Proxy bandwidth metering (per proxy, query, job and business)
+    BANDWIDTH_METERING = True
+    PROXY_COST_PER_GB = float(os.environ.get('PROXY_COST_PER_GB', 0))  # Used for cost reporting
+    
+    # Shared on-disk LRU cache for static Maps assets (JS/CSS bundles, fonts, icons)
+    ASSET_CACHE = True
+    ASSET_CACHE_DIR = 'asset_cache'
+    ASSET_CACHE_MAX_MB = 300
+    
+    # Reviews mode (enabled per job with the 'reviews' option)
+    MAX_REVIEWS_PER_PLACE = 200  # Default per-place cap (0 = unlimited)
+    REVIEWS_CHECKPOINT_FILE = 'reviews_checkpoints.json'  # Last review seen per place, to resume an interrupted job
+    REVIEWS_CHECKPOINT_MAX_AGE = 24 * 3600  # Seconds an interrupted job's review progress is kept
+    REVIEWS_SCROLL_PAUSE = 1.0  # Seconds to wait for more reviews after each scroll
+    
+    # Lightweight place fetch for known business URLs (falls back to full render)
+    FAST_PLACE_FETCH = True
+    FAST_FETCH_TIMEOUT = 10  # Seconds
+    
+    # Browser recycling and hung-tab watchdog
+    BROWSER_RECYCLE_PAGES = 150  # Relaunch browser after N pages (0 = never)
+    BROWSER_RECYCLE_RSS_MB = 1500  # Relaunch browser above this RSS in MB (0 = never, needs psutil)
+    TAB_HARD_DEADLINE = 60  # Seconds before a stuck tab is killed and replaced
+    
+    # Adaptive timeouts: p99 latency per operation and proxy x factor, clamped per operation
+    ADAPTIVE_TIMEOUTS = True
+    TIMEOUT_PERCENTILE = 99
+    TIMEOUT_FACTOR = 2.0
+    TIMEOUT_MIN_SAMPLES = 20  # Fixed defaults are used until this many samples exist
+    
+    # Hedged requests: duplicate a detail tab that runs past the p95 latency on another proxy
+    HEDGE_REQUESTS = False
+    HEDGE_PERCENTILE = 95
+    MAX_HEDGE_RATE = 0.1  # Max hedges per detail tab (bounds extra bandwidth)
     
     # Browser settings
     VIEWPORT_WIDTH = 1920
@@ -41,8 +112,21 @@ class Config:
     EXTRACT_EMAILS_FROM_WEBSITES = True  # Extract emails from business websites
     EMAIL_EXTRACTION_TIMEOUT = 3  # Max seconds to spend on each website
     
+    # Job planner: per-query timings, businesses and bytes behind /plan and the live ETA in /status
+    JOB_HISTORY_FILE = 'job_history.json'  # None keeps the history in memory only
+    
+    # Page archive: compressed business pages for offline re-extraction
+    # (python -m modules.page_archive archive -o output/reextracted.csv)
+    ARCHIVE_PAGES = False  # Store every business page (rendered DOM or raw response)
+    PAGE_ARCHIVE_DIR = 'archive'  # Segments and index.db
+    PAGE_ARCHIVE_SEGMENT_MB = 256  # Start a new segment file after this size
+    
     # Rate limiting
     DELAY_BETWEEN_QUERIES = 2  # Seconds to wait between queries
+    PROXY_RATE_LIMIT = 0  # Google navigations per second per proxy (token refill rate, e.g. 0.5; 0 = off, use DELAY_BETWEEN_QUERIES)
+    PROXY_RATE_BURST = 5  # Navigations a rested proxy may make back to back (bucket size)
+    SHARED_RATE_LIMITS = False  # Share the per-proxy buckets between worker processes (SQLite)
+    RATE_LIMIT_DB = 'rate_limits.db'  # SQLite file for shared rate limits
     
     # Notifications (optional)
     ENABLE_NOTIFICATIONS = False
@@ -0,0 +1,255 @@
+"""
+Asset Cache Module
+Shared on-disk LRU cache for immutable static Google Maps assets, served through Playwright routing.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+
+
+# Versioned Maps JS/CSS bundles, fonts and icons; the URL changes whenever the content does.
+# Only these static paths: other gstatic content (e.g. reCAPTCHA) must always come from the network.
+STATIC_ASSET_PATTERN = re.compile(
+    r'^https://(?:'
+    r'maps\.gstatic\.com/(?:mapfiles|tactile)/|'
+    r'www\.gstatic\.com/(?:_/mss/|og/_/|images/icons/)|'
+    r'fonts\.gstatic\.com/s/|ssl\.gstatic\.com/images/|'
+    r'www\.google\.com/maps/_/(?:js|ss)/|www\.google\.com/maps/preview/_/'
+    r')'
+)
+
+# Headers that describe the wire encoding of the original response, not the cached body
+DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'set-cookie'}
+
+
+class AssetCache:
+    """Size-bounded LRU cache of static asset responses shared by all contexts and browser launches."""
+
+    def __init__(self, directory: str = 'asset_cache', max_bytes: int = 300 * 1024 * 1024):
+        """
+        Initialize the asset cache.
+
+        Entries are stored as '<key>.body' / '<key>.meta' file pairs and the
+        body file's mtime is the LRU clock, so several scraper processes can
+        share one directory.
+
+        Args:
+            directory: Cache directory
+            max_bytes: Maximum total size of cached bodies
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.evictions = 0
+        self.stored_bytes = 0
+        self.served = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self.stored_bytes = self._scan_size()
+
+    @staticmethod
+    def is_cacheable_url(url: str) -> bool:
+        """Check whether a URL is an immutable static asset."""
+        return bool(STATIC_ASSET_PATTERN.match(url))
+
+    @staticmethod
+    def is_cacheable_response(status: int, headers: Dict[str, str]) -> bool:
+        """Check whether a response may be stored (200 and not marked private/no-store)."""
+        if status != 200:
+            return False
+        cache_control = headers.get('cache-control', '').lower()
+        return 'no-store' not in cache_control and 'private' not in cache_control
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        """Get the body and metadata file paths for a URL."""
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + '.body', base + '.meta'
+
+    def get(self, url: str) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """
+        Look up a cached response and mark it as recently used.
+
+        Args:
+            url: Asset URL
+
+        Returns:
+            Tuple of (status, headers, body), or None on a miss
+        """
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+            # Another process may have replaced one file of the pair but not yet the other
+            if meta.get('size', len(body)) != len(body):
+                raise ValueError('body and metadata do not match')
+            os.utime(body_path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += len(body)
+        return meta['status'], meta['headers'], body
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        """
+        Store a response (atomic replace) and evict least recently used entries over the size limit.
+
+        Args:
+            url: Asset URL
+            status: HTTP status
+            headers: Response headers
+            body: Decoded response body
+        """
+        if len(body) > self.max_bytes:
+            return
+
+        body_path, meta_path = self._paths(url)
+        headers = {name: value for name, value in headers.items() if name.lower() not in DROPPED_HEADERS}
+        temp_paths = []
+        try:
+            previous_size = os.path.getsize(body_path) if os.path.exists(body_path) else 0
+            # Unique temp files: other processes sharing the directory may store the same URL
+            body_fd, body_tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            temp_paths.append(body_tmp)
+            with os.fdopen(body_fd, 'wb') as f:
+                f.write(body)
+            meta_fd, meta_tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            temp_paths.append(meta_tmp)
+            with os.fdopen(meta_fd, 'w') as f:
+                json.dump({'url': url, 'status': status, 'headers': headers, 'size': len(body)}, f)
+            os.replace(meta_tmp, meta_path)
+            os.replace(body_tmp, body_path)
+        except OSError as e:
+            self.logger.debug(f"Could not cache {url}: {e}")
+            for path in temp_paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            return
+
+        with self._lock:
+            self.stored_bytes += len(body) - previous_size
+            over_limit = self.stored_bytes > self.max_bytes
+        if over_limit:
+            self._evict()
+
+    def _scan_size(self) -> int:
+        """Get the total size of cached bodies on disk."""
+        total = 0
+        for name in os.listdir(self.directory):
+            if name.endswith('.body'):
+                try:
+                    total += os.path.getsize(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+        return total
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache is 90% of its size limit."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.body'):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        evicted = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            for stale in (path, path[:-len('.body')] + '.meta'):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self.stored_bytes = total
+            self.evictions += evicted
+        self.logger.debug(f"Evicted {evicted} cached assets")
+
+    async def attach(self, context) -> None:
+        """
+        Serve static assets of a Playwright browser context from the cache.
+
+        Args:
+            context: Playwright browser context
+        """
+        await context.route(STATIC_ASSET_PATTERN, self.handle_route)
+
+    async def handle_route(self, route) -> None:
+        """Playwright route handler: fulfill from the cache, or fetch through the proxy and store."""
+        request = route.request
+        if request.method != 'GET':
+            await route.continue_()
+            return
+
+        url = request.url
+        cached = await asyncio.to_thread(self.get, url)
+        if cached:
+            status, headers, body = cached
+            self.served.add(request)
+            await route.fulfill(status=status, headers=headers, body=body)
+            return
+
+        try:
+            response = await route.fetch()
+            body = await response.body()
+        except Exception as e:
+            self.logger.debug(f"Asset fetch failed for {url}: {e}")
+            await route.continue_()
+            return
+
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in DROPPED_HEADERS
+        }
+        if self.is_cacheable_response(response.status, response.headers):
+            await asyncio.to_thread(self.put, url, response.status, headers, body)
+        await route.fulfill(status=response.status, headers=headers, body=body)
+
+    def was_served(self, request) -> bool:
+        """Check whether a request was answered from the cache (no proxy traffic)."""
+        return request in self.served
+
+    def get_stats(self) -> Dict:
+        """Get cache hit-rate and size statistics for status reporting."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups * 100, 1) if lookups else None,
+                'bytes_saved': self.bytes_saved,
+                'stored_bytes': self.stored_bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions
+            }
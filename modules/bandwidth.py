@@ -0,0 +1,144 @@
+"""
+Bandwidth Module
+Per-request proxy byte accounting aggregated per proxy, query, job and business, with cost.
+"""
+
+import logging
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+# Hosts whose traffic is Google Maps itself; everything else is business websites (email harvesting)
+MAPS_HOST_SUFFIXES = ('google.com', 'gstatic.com', 'googleapis.com', 'googleusercontent.com', 'ggpht.com')
+
+GB = 1024 ** 3
+
+
+def classify_url(url: str) -> str:
+    """Get the traffic kind of a request URL: 'maps' or 'website'."""
+    host = urlparse(url).hostname or ''
+    if any(host == suffix or host.endswith('.' + suffix) for suffix in MAPS_HOST_SUFFIXES):
+        return 'maps'
+    return 'website'
+
+
+class BandwidthMeter:
+    """Counts bytes sent and received through proxies and turns them into cost."""
+
+    def __init__(self, cost_per_gb: float = 0.0, max_businesses: int = 5000, timeseries=None):
+        """
+        Initialize the meter.
+
+        Args:
+            cost_per_gb: Proxy price per GB (sent + received)
+            max_businesses: Businesses tracked individually per job (the rest only count in totals)
+            timeseries: Optional ProxyTimeSeries that also receives the bytes per proxy
+        """
+        self.cost_per_gb = cost_per_gb
+        self.max_businesses = max_businesses
+        self.timeseries = timeseries
+        self.logger = logging.getLogger(__name__)
+
+        self.proxies: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.start_job()
+
+    @staticmethod
+    def _empty_counter() -> Dict:
+        """Create an empty byte counter."""
+        return {'requests': 0, 'bytes_sent': 0, 'bytes_received': 0, 'maps_bytes': 0, 'website_bytes': 0}
+
+    def start_job(self) -> None:
+        """Reset the job, query and business counters (per-proxy totals are kept)."""
+        with self._lock:
+            self.job = self._empty_counter()
+            self.queries: Dict[str, Dict] = {}
+            self.businesses: Dict[str, Dict] = {}
+            self.current_query: Optional[str] = None
+
+    def start_query(self, label: str) -> None:
+        """
+        Attribute subsequent traffic to a query.
+
+        Args:
+            label: Query label (e.g. "dentist - 10001")
+        """
+        with self._lock:
+            self.current_query = label
+            self.queries.setdefault(label, self._empty_counter())
+
+    def record(self, proxy_key: str, sent: int, received: int, url: str = '',
+               business: Optional[str] = None, kind: Optional[str] = None) -> None:
+        """
+        Record one request.
+
+        Args:
+            proxy_key: Proxy the request went through ("ip:port")
+            sent: Request header and body bytes
+            received: Response header and body bytes
+            url: Request URL (used to classify Maps vs website traffic)
+            business: Business the request belongs to (URL or CID), if any
+            kind: 'maps' or 'website' (defaults to classifying the URL)
+        """
+        kind = kind or classify_url(url)
+        counters = []
+        with self._lock:
+            counters.append(self.proxies.setdefault(proxy_key, self._empty_counter()))
+            counters.append(self.job)
+            if self.current_query is not None:
+                counters.append(self.queries.setdefault(self.current_query, self._empty_counter()))
+            if business:
+                if business in self.businesses or len(self.businesses) < self.max_businesses:
+                    counters.append(self.businesses.setdefault(business, self._empty_counter()))
+
+            for counter in counters:
+                counter['requests'] += 1
+                counter['bytes_sent'] += sent
+                counter['bytes_received'] += received
+                counter[f'{kind}_bytes'] += sent + received
+
+        if self.timeseries:
+            self.timeseries.record_bytes(proxy_key, sent + received)
+
+    def _report(self, counter: Dict) -> Dict:
+        """Add totals and cost to a counter for reporting."""
+        total = counter['bytes_sent'] + counter['bytes_received']
+        return dict(counter, total_bytes=total, cost=round(total / GB * self.cost_per_gb, 4))
+
+    def get_proxy_stats(self) -> Dict:
+        """Get bytes and cost per proxy since startup."""
+        with self._lock:
+            return {key: self._report(counter) for key, counter in self.proxies.items()}
+
+    def get_job_summary(self, top: int = 10) -> Dict:
+        """
+        Get bytes and cost for the current job, per query, and per business.
+
+        Args:
+            top: Number of most expensive businesses to list
+
+        Returns:
+            Dictionary with 'total', 'queries', 'per_business' and 'top_businesses'
+        """
+        with self._lock:
+            businesses = {key: self._report(counter) for key, counter in self.businesses.items()}
+            summary = {
+                'cost_per_gb': self.cost_per_gb,
+                'total': self._report(self.job),
+                'queries': {key: self._report(counter) for key, counter in self.queries.items()}
+            }
+
+        if businesses:
+            average = sum(b['total_bytes'] for b in businesses.values()) / len(businesses)
+            summary['per_business'] = {
+                'businesses': len(businesses),
+                'avg_bytes': int(average),
+                'avg_cost': round(average / GB * self.cost_per_gb, 6)
+            }
+        else:
+            summary['per_business'] = {'businesses': 0, 'avg_bytes': 0, 'avg_cost': 0.0}
+
+        ranked = sorted(businesses.items(), key=lambda item: item[1]['total_bytes'], reverse=True)
+        summary['top_businesses'] = [dict(stats, business=key) for key, stats in ranked[:top]]
+        return summary
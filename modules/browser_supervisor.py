@@ -0,0 +1,152 @@
+"""
+Browser Supervisor Module
+Recycles long-lived browsers and enforces a hard deadline on each tab task.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Awaitable, Dict, Optional
+
+try:
+    import psutil
+except ImportError:  # RSS-based recycling is disabled without psutil
+    psutil = None
+
+
+class BrowserSupervisor:
+    """Tracks browser usage and kills tab tasks that overrun their deadline."""
+
+    def __init__(self, max_pages: int = 150, max_rss_mb: float = 1500,
+                 tab_deadline: float = 60, close_timeout: float = 5):
+        """
+        Initialize the browser supervisor.
+
+        Args:
+            max_pages: Recycle the browser after this many pages (0 disables)
+            max_rss_mb: Recycle the browser once its processes use this much RSS (0 disables)
+            tab_deadline: Hard wall-clock limit in seconds for a single tab task
+            close_timeout: Seconds to wait for a stuck page to close
+        """
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.tab_deadline = tab_deadline
+        self.close_timeout = close_timeout
+        self.logger = logging.getLogger(__name__)
+
+        self.pages_since_launch = 0
+        self.total_pages = 0
+        self.browser_launches = 0
+        self.browser_recycles = 0
+        self.tabs_killed = 0
+        self.last_rss_mb: Optional[float] = None
+
+    def record_launch(self) -> None:
+        """Record that a fresh browser has been launched."""
+        self.browser_launches += 1
+        self.pages_since_launch = 0
+
+    def record_recycle(self) -> None:
+        """Record that a browser was replaced because it hit a recycle limit."""
+        self.browser_recycles += 1
+
+    def record_page(self) -> None:
+        """Record that a page (tab or navigation) was used in the current browser."""
+        self.pages_since_launch += 1
+        self.total_pages += 1
+
+    def get_rss_mb(self) -> Optional[float]:
+        """
+        Get the combined RSS of all child processes (Playwright driver and Chromium).
+
+        Returns:
+            RSS in megabytes, or None if psutil is not available
+        """
+        if psutil is None:
+            return None
+
+        try:
+            children = psutil.Process(os.getpid()).children(recursive=True)
+            total = 0
+            for child in children:
+                try:
+                    total += child.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            self.last_rss_mb = round(total / (1024 * 1024), 1)
+            return self.last_rss_mb
+        except Exception as e:
+            self.logger.debug(f"Could not read browser RSS: {e}")
+            return None
+
+    def should_recycle(self) -> bool:
+        """
+        Check whether the current browser has reached a recycle limit.
+
+        Returns:
+            True if the browser should be closed and relaunched
+        """
+        if self.max_pages and self.pages_since_launch >= self.max_pages:
+            self.logger.info(f"Browser served {self.pages_since_launch} pages - recycle due")
+            return True
+
+        if self.max_rss_mb:
+            rss = self.get_rss_mb()
+            if rss is not None and rss >= self.max_rss_mb:
+                self.logger.info(f"Browser RSS {rss} MB >= {self.max_rss_mb} MB - recycle due")
+                return True
+
+        return False
+
+    async def run_tab(self, coro: Awaitable, page_ref: Dict, label: str = '') -> Optional[Dict]:
+        """
+        Run a tab task with a hard wall-clock deadline.
+
+        If the task overruns, it is cancelled and the page registered in
+        page_ref['page'] is force-closed. The job keeps going; the tab
+        simply yields no result.
+
+        Args:
+            coro: Coroutine performing the tab work
+            page_ref: Dict the task fills with its page under the 'page' key
+            label: Label used in log messages
+
+        Returns:
+            The task result, or None if it was killed
+        """
+        task = asyncio.ensure_future(coro)
+        try:
+            done, _ = await asyncio.wait({task}, timeout=self.tab_deadline)
+        except asyncio.CancelledError:
+            # Cancelled from outside (e.g. the losing attempt of a hedged pair)
+            task.cancel()
+            raise
+
+        if task in done:
+            return task.result()
+
+        self.tabs_killed += 1
+        self.logger.warning(f"{label} Tab exceeded {self.tab_deadline}s deadline - killing it")
+        task.cancel()
+
+        page = page_ref.get('page')
+        if page:
+            try:
+                await asyncio.wait_for(page.close(), timeout=self.close_timeout)
+            except Exception as e:
+                self.logger.debug(f"Could not close stuck page: {e}")
+
+        # Give the cancelled task a moment to unwind, but never block on it
+        await asyncio.wait({task}, timeout=self.close_timeout)
+        return None
+
+    def get_stats(self) -> Dict:
+        """Get supervisor statistics for status reporting."""
+        return {
+            'browser_launches': self.browser_launches,
+            'browser_recycles': self.browser_recycles,
+            'tabs_killed': self.tabs_killed,
+            'pages_since_launch': self.pages_since_launch,
+            'total_pages': self.total_pages,
+            'browser_rss_mb': self.last_rss_mb
+        }
@@ -0,0 +1,123 @@
+"""
+Budgets Module
+Per-query and per-job limits on businesses, wall-clock seconds and proxy bytes.
+"""
+
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+
+class Budget:
+    """Tracks usage against business, time and proxy-byte limits for one query or job."""
+
+    LIMITS = ('max_businesses', 'max_seconds', 'max_bytes')
+
+    def __init__(self, scope: str, max_businesses: Optional[int] = None,
+                 max_seconds: Optional[float] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize the budget.
+
+        Args:
+            scope: 'query' or 'job', used when reporting which budget ran out
+            max_businesses: Maximum businesses delivered
+            max_seconds: Maximum wall-clock seconds
+            max_bytes: Maximum bytes transferred through the proxy
+        """
+        self.scope = scope
+        self.max_businesses = max_businesses
+        self.max_seconds = max_seconds
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+        self.start()
+
+    @classmethod
+    def from_options(cls, source, scope: str, prefix: str = '') -> Tuple[Optional['Budget'], Optional[str]]:
+        """
+        Build a budget from request data (JSON body or form fields).
+
+        Reads '<prefix>max_businesses', '<prefix>max_seconds' and '<prefix>max_bytes'.
+
+        Args:
+            source: Dict-like object with the budget fields
+            scope: 'query' or 'job'
+            prefix: Option name prefix (e.g. 'job_')
+
+        Returns:
+            Tuple of (budget or None if no limits given, error message or None)
+        """
+        limits = {}
+        for limit in cls.LIMITS:
+            name = prefix + limit
+            value = source.get(name)
+            if value in (None, ''):
+                continue
+            try:
+                value = float(value) if limit == 'max_seconds' else int(value)
+            except (TypeError, ValueError):
+                return None, f'{name} must be a number'
+            if value <= 0:
+                return None, f'{name} must be positive'
+            limits[limit] = value
+
+        if not limits:
+            return None, None
+        return cls(scope, **limits), None
+
+    def start(self) -> None:
+        """Reset usage and start the clock."""
+        self.started_at = time.monotonic()
+        self.businesses = 0
+        self.bytes = 0
+        self.exhausted_by: Optional[str] = None
+
+    def add_business(self, count: int = 1) -> None:
+        """Count delivered businesses."""
+        self.businesses += count
+
+    def add_bytes(self, count: int) -> None:
+        """Count bytes transferred through the proxy."""
+        self.bytes += count
+
+    def elapsed(self) -> float:
+        """Get the seconds since the budget was started."""
+        return time.monotonic() - self.started_at
+
+    def remaining_businesses(self) -> Optional[int]:
+        """Get how many more businesses may be delivered, or None if unlimited."""
+        if self.max_businesses is None:
+            return None
+        return max(0, self.max_businesses - self.businesses)
+
+    def check(self) -> Optional[str]:
+        """
+        Check the limits.
+
+        Returns:
+            The exhausted limit as '<scope> <limit>' (e.g. 'query max_seconds'), or None
+        """
+        if self.exhausted_by:
+            return self.exhausted_by
+
+        if self.max_businesses is not None and self.businesses >= self.max_businesses:
+            self.exhausted_by = f'{self.scope} max_businesses'
+        elif self.max_seconds is not None and self.elapsed() >= self.max_seconds:
+            self.exhausted_by = f'{self.scope} max_seconds'
+        elif self.max_bytes is not None and self.bytes >= self.max_bytes:
+            self.exhausted_by = f'{self.scope} max_bytes'
+
+        if self.exhausted_by:
+            self.logger.info(f"Budget exhausted: {self.exhausted_by}")
+        return self.exhausted_by
+
+    def to_dict(self) -> Dict:
+        """Get limits and usage for status reporting."""
+        return {
+            'max_businesses': self.max_businesses,
+            'max_seconds': self.max_seconds,
+            'max_bytes': self.max_bytes,
+            'businesses': self.businesses,
+            'seconds': round(self.elapsed(), 1),
+            'bytes': self.bytes,
+            'exhausted_by': self.exhausted_by
+        }
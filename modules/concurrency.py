@@ -0,0 +1,164 @@
+"""
+Concurrency Module
+AIMD (additive increase, multiplicative decrease) controller for the number of parallel tabs.
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Dict, Optional
+
+try:
+    import psutil
+except ImportError:  # Host load checks are disabled without psutil
+    psutil = None
+
+
+class AIMDController:
+    """Adjusts concurrent tabs per proxy from observed latency, timeouts, CAPTCHAs and host load."""
+
+    def __init__(self, initial: int = 5, min_limit: int = 1, max_limit: int = 10,
+                 increase: float = 1, decrease_factor: float = 0.5,
+                 latency_target: float = 15, error_threshold: float = 0.2,
+                 cpu_limit: float = 85, memory_limit: float = 85, history_size: int = 500):
+        """
+        Initialize the controller.
+
+        Args:
+            initial: Starting number of concurrent tabs for a new proxy
+            min_limit: Lower bound on concurrent tabs
+            max_limit: Upper bound on concurrent tabs
+            increase: Tabs added after a healthy wave
+            decrease_factor: Multiplier applied after an unhealthy wave
+            latency_target: Median tab latency (seconds) above which a wave counts as unhealthy
+            error_threshold: Timeout/error rate above which a wave counts as unhealthy
+            cpu_limit: Host CPU percent above which concurrency is cut
+            memory_limit: Host memory percent above which concurrency is cut
+            history_size: Number of limit changes kept for reporting
+        """
+        self.initial = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.error_threshold = error_threshold
+        self.cpu_limit = cpu_limit
+        self.memory_limit = memory_limit
+        self.logger = logging.getLogger(__name__)
+
+        self.limits: Dict[str, float] = {}
+        self.windows: Dict[str, Dict] = {}
+        self.history = deque(maxlen=history_size)
+
+    def get_limit(self, key: str) -> int:
+        """
+        Get the current number of concurrent tabs for a proxy or context.
+
+        Args:
+            key: Proxy or context identifier
+
+        Returns:
+            Number of tabs to run at once
+        """
+        if key not in self.limits:
+            self.limits[key] = float(min(max(self.initial, self.min_limit), self.max_limit))
+        return max(self.min_limit, int(self.limits[key]))
+
+    def record(self, key: str, latency: Optional[float] = None, timeout: bool = False,
+               captcha: bool = False, error: bool = False) -> None:
+        """
+        Record the outcome of one tab.
+
+        Args:
+            key: Proxy or context identifier
+            latency: Seconds the tab took (successful tabs)
+            timeout: The tab timed out or was killed by the watchdog
+            captcha: The tab hit a CAPTCHA
+            error: The tab failed for another reason
+        """
+        window = self.windows.setdefault(key, self._empty_window())
+        window['total'] += 1
+        if latency is not None:
+            window['latencies'].append(latency)
+        if timeout:
+            window['timeouts'] += 1
+        if captcha:
+            window['captchas'] += 1
+        if error:
+            window['errors'] += 1
+
+    def adjust(self, key: str) -> int:
+        """
+        Apply AIMD to the outcomes recorded since the last adjustment.
+        Call once per wave of tabs.
+
+        Args:
+            key: Proxy or context identifier
+
+        Returns:
+            The new number of concurrent tabs
+        """
+        current = self.get_limit(key)
+        window = self.windows.pop(key, None)
+        if not window or not window['total']:
+            return current
+
+        reason = self._unhealthy_reason(window)
+        old_limit = self.limits[key]
+        if reason:
+            self.limits[key] = max(float(self.min_limit), old_limit * self.decrease_factor)
+        else:
+            reason = 'healthy'
+            self.limits[key] = min(float(self.max_limit), old_limit + self.increase)
+
+        new_limit = self.get_limit(key)
+        if new_limit != current:
+            self.logger.info(f"Concurrency for {key}: {current} -> {new_limit} ({reason})")
+        self.history.append({
+            'timestamp': time.time(),
+            'key': key,
+            'limit': new_limit,
+            'reason': reason
+        })
+        return new_limit
+
+    def _unhealthy_reason(self, window: Dict) -> Optional[str]:
+        """Get the reason a wave counts as unhealthy, or None if it was healthy."""
+        if window['captchas']:
+            return 'captcha'
+
+        failure_rate = (window['timeouts'] + window['errors']) / window['total']
+        if failure_rate > self.error_threshold:
+            return f"failure rate {failure_rate:.0%}"
+
+        latencies = sorted(window['latencies'])
+        if latencies:
+            median = latencies[len(latencies) // 2]
+            if median > self.latency_target:
+                return f"median latency {median:.1f}s"
+
+        if psutil is not None:
+            try:
+                cpu = psutil.cpu_percent(interval=None)
+                if cpu > self.cpu_limit:
+                    return f"host CPU {cpu:.0f}%"
+                memory = psutil.virtual_memory().percent
+                if memory > self.memory_limit:
+                    return f"host memory {memory:.0f}%"
+            except Exception as e:
+                self.logger.debug(f"Could not read host load: {e}")
+
+        return None
+
+    @staticmethod
+    def _empty_window() -> Dict:
+        """Create an empty outcome window."""
+        return {'total': 0, 'latencies': [], 'timeouts': 0, 'captchas': 0, 'errors': 0}
+
+    def get_stats(self) -> Dict:
+        """Get current and historical concurrency levels for status reporting."""
+        return {
+            'current': {key: self.get_limit(key) for key in self.limits},
+            'history': list(self.history)[-50:]
+        }
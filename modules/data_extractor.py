@@ -4,42 +4,277 @@ Handles extraction and cleaning of business data from Google Maps.
 """
 
 import re
+import asyncio
 import logging
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Set
+
+
+# Reads the data visible on a result card, given the card's place link element
+RESULT_CARD_JS = """a => {
+    const card = a.closest('[role="article"]') || a.parentElement;
+    const stars = card ? card.querySelector('[role="img"][aria-label*="star" i]') : null;
+    return {
+        url: a.href,
+        name: a.getAttribute('aria-label') || '',
+        rating_label: stars ? stars.getAttribute('aria-label') : '',
+        text: card ? card.innerText : ''
+    };
+}"""
 
 
 class DataExtractor:
     """Extracts and cleans business information from Google Maps."""
     
+    # Every field extract_detailed_business_info can produce, in output order
+    DETAIL_FIELDS = (
+        'name', 'full_address', 'latitude', 'longitude', 'phone',
+        'website', 'email', 'rating', 'review_count', 'category',
+        'opening_hours', 'plus_code', 'cid', 'url', 'description'
+    )
+    
+    # Fields that are always extracted: free (from the URL) or needed for validation and dedup
+    ALWAYS_FIELDS = ('name', 'cid', 'url')
+    
+    # Where each detail page field is read from, shared by the live extractor and the offline
+    # archive parser (modules/page_archive.py). Selectors are tried in order (SelectorStats may
+    # reorder them) and each reads the first matching element: its text content ('text') or an
+    # attribute, with '|' separating fallbacks read from the same element. Values failing
+    # min_length or listed in reject make the next selector be tried. Selectors are kept to
+    # tag, .class and [attr], [attr="v"], [attr*="v"] parts and descendant combinators,
+    # which is all the archive parser matches.
+    DETAIL_SELECTORS = {
+        'name': {
+            'selectors': [
+                ('h1.DUwDvf', 'text'),  # Main heading
+                ('h1[class*="fontHeadline"]', 'text'),
+                ('h1', 'text'),
+                ('div[role="main"] h1', 'text')
+            ],
+            'reject': ('Results',)
+        },
+        'category': {'selectors': [('button[jsaction*="category"]', 'text')]},
+        # Rating and review count come from the same text, e.g. "4.5(1,234)" or "4.5 stars 1,234 Reviews"
+        'rating': {
+            'selectors': [
+                ('div.F7nice', 'text'),
+                ('span[role="img"][aria-label*="star"]', 'aria-label')
+            ],
+            'fields': ('rating', 'review_count')
+        },
+        'full_address': {'selectors': [('button[data-item-id="address"]', 'text')]},
+        'phone': {'selectors': [('button[data-item-id*="phone"]', 'text')]},
+        'website': {'selectors': [('a[data-item-id="authority"]', 'href')], 'timeout': 2000},
+        'plus_code': {'selectors': [('button[data-item-id="oloc"]', 'text')]},
+        'opening_hours': {
+            'selectors': [
+                ('button[data-item-id*="hours"]', 'aria-label|text'),
+                ('div[aria-label*="Hours"]', 'aria-label|text'),
+                ('button[aria-label*="Hours"]', 'aria-label|text')
+            ],
+            'min_length': 6,
+            'timeout': 2000
+        },
+        'description': {
+            'selectors': [
+                ('div[class*="description"]', 'text'),
+                ('div[jsaction*="description"]', 'text'),
+                ('div[aria-label*="About"]', 'text')
+            ],
+            'min_length': 11,
+            'timeout': 2000
+        },
+        # Only read when the URL has no coordinates
+        'latitude': {'selectors': [('[data-latitude]', 'data-latitude')], 'timeout': 1000},
+        'longitude': {'selectors': [('[data-longitude]', 'data-longitude')], 'timeout': 1000}
+    }
+    
+    # Optional SelectorStats instance used to order selectors by observed hit rate
+    selector_stats = None
+    
+    # Optional AdaptiveTimeouts instance used to derive selector and email page timeouts
+    timeouts = None
+    
+    @staticmethod
+    def _timeout(operation: str, default: int) -> int:
+        """Get a timeout in milliseconds, derived from observed latency when adaptive timeouts are enabled."""
+        if DataExtractor.timeouts is None:
+            return default
+        return DataExtractor.timeouts.get(operation, default=default)
+    
+    @staticmethod
+    def _ordered_selectors(field: str, selectors: List[str]) -> List[str]:
+        """Order a selector list by observed hit rate when selector stats are enabled."""
+        if DataExtractor.selector_stats is None:
+            return selectors
+        return DataExtractor.selector_stats.order(field, selectors)
+    
+    @staticmethod
+    def _record_selector(field: str, selector: str, hit: bool, started: float, timed_out: bool = False) -> None:
+        """
+        Record a selector attempt that started at loop time `started`.
+        
+        Args:
+            field: Business field the selector extracts
+            selector: The selector that was tried
+            hit: Whether it produced a value
+            started: Loop time the attempt started
+            timed_out: The miss waited out the selector timeout while the page was still loading
+        """
+        elapsed = asyncio.get_running_loop().time() - started
+        if DataExtractor.selector_stats is not None:
+            DataExtractor.selector_stats.record(field, selector, hit, elapsed)
+        if DataExtractor.timeouts is None:
+            return
+        # Hits feed the latency histogram; timed-out misses count against the derived timeout,
+        # so it widens again when slower pages start missing fields
+        if hit:
+            DataExtractor.timeouts.record('selector', None, elapsed)
+        elif timed_out:
+            DataExtractor.timeouts.record_timeout('selector', None)
+    
+    @staticmethod
+    async def _page_loading(page) -> bool:
+        """Check whether the page document was still loading (a closed or unreadable page counts as loaded)."""
+        try:
+            return await page.evaluate('document.readyState') != 'complete'
+        except Exception:
+            return False
+    
+    @staticmethod
+    def clean_selector_value(field: str, value: Optional[str]) -> Optional[str]:
+        """
+        Normalize a value read by a DETAIL_SELECTORS selector and check it against the field's rules.
+        
+        Args:
+            field: DETAIL_SELECTORS field
+            value: Raw text content or attribute value
+            
+        Returns:
+            The value with whitespace collapsed, or None if it is not usable
+        """
+        spec = DataExtractor.DETAIL_SELECTORS[field]
+        value = ' '.join((value or '').split())
+        if not value or len(value) < spec.get('min_length', 1) or value in spec.get('reject', ()):
+            return None
+        return value
+    
+    @staticmethod
+    def apply_detail_values(business_info: Dict, values: Dict[str, Optional[str]]) -> None:
+        """
+        Fill business info from the values read with DETAIL_SELECTORS (live page or archived HTML).
+        
+        Args:
+            business_info: Business info to update (only fields it contains are set)
+            values: Cleaned value per DETAIL_SELECTORS field (None when not found)
+        """
+        for field, value in values.items():
+            if not value or field in ('rating', 'latitude', 'longitude'):
+                continue
+            if field in business_info:
+                business_info[field] = DataExtractor.clean_phone_number(value) if field == 'phone' else value
+        
+        rating_text = values.get('rating')
+        if rating_text:
+            rating = DataExtractor.clean_rating(rating_text)
+            if rating is not None and 'rating' in business_info:
+                business_info['rating'] = rating
+            review_count = DataExtractor.extract_review_count(rating_text)
+            if review_count is not None and 'review_count' in business_info:
+                business_info['review_count'] = review_count
+        
+        # Page coordinates only stand in for missing URL coordinates
+        if values.get('latitude') and values.get('longitude') and business_info.get('latitude') == 'Not given':
+            business_info['latitude'] = values['latitude']
+            business_info['longitude'] = values['longitude']
+    
+    @staticmethod
+    async def _read_field(page, field: str) -> Optional[str]:
+        """
+        Read a detail page field with its DETAIL_SELECTORS, recording each attempt.
+        
+        Args:
+            page: Playwright page on the business detail view
+            field: DETAIL_SELECTORS field
+            
+        Returns:
+            The cleaned value of the first selector that yields a usable one, or None
+        """
+        spec = DataExtractor.DETAIL_SELECTORS[field]
+        sources = dict(spec['selectors'])
+        timeout = DataExtractor._timeout('selector', spec.get('timeout', 3000))
+        
+        for selector in DataExtractor._ordered_selectors(field, list(sources)):
+            started = asyncio.get_running_loop().time()
+            try:
+                value = None
+                for source in sources[selector].split('|'):
+                    element = page.locator(selector).first
+                    if source == 'text':
+                        value = await element.text_content(timeout=timeout)
+                    else:
+                        value = await element.get_attribute(source, timeout=timeout)
+                    if value:
+                        break
+            except Exception:
+                # Only a miss on a page that was still loading says the timeout is too tight;
+                # an optional field that is simply absent from a loaded page is a plain miss
+                timed_out = await DataExtractor._page_loading(page)
+                DataExtractor._record_selector(field, selector, False, started, timed_out=timed_out)
+                continue
+            
+            value = DataExtractor.clean_selector_value(field, value)
+            DataExtractor._record_selector(field, selector, value is not None, started)
+            if value is not None:
+                return value
+        return None
+    
+    @staticmethod
+    def expand_fields(fields: Optional[Iterable[str]]) -> Optional[Set[str]]:
+        """
+        Get the set of fields that must be extracted to produce the requested ones.
+        
+        Args:
+            fields: Requested fields, or None for all fields
+            
+        Returns:
+            Set of fields to extract, or None for all fields
+        """
+        if fields is None:
+            return None
+        
+        wanted = set(fields) | set(DataExtractor.ALWAYS_FIELDS)
+        # Emails are harvested from the business website
+        if 'email' in wanted:
+            wanted.add('website')
+        # Coordinates are parsed together
+        if 'latitude' in wanted or 'longitude' in wanted:
+            wanted.update(('latitude', 'longitude'))
+        return wanted
+    
     @staticmethod
-    async def extract_detailed_business_info(page) -> Dict:
+    async def extract_detailed_business_info(page, fields: Optional[Iterable[str]] = None) -> Dict:
         """
         Extract comprehensive business information from Google Maps detail page.
         
         Args:
             page: Playwright page object on business detail page
+            fields: Optional fields to extract; unrequested fields cost no
+                selector waits or clicks and are left out of the result
             
         Returns:
             Dictionary with comprehensive business information
         """
         logger = logging.getLogger(__name__)
         
+        wanted = DataExtractor.expand_fields(fields)
+        
+        def want(*names) -> bool:
+            return wanted is None or any(name in wanted for name in names)
+        
         business_info = {
-            'name': 'Not given',
-            'full_address': 'Not given',
-            'latitude': 'Not given',
-            'longitude': 'Not given',
-            'phone': 'Not given',
-            'website': 'Not given',
-            'email': 'Not given',
-            'rating': 'Not given',
-            'review_count': 'Not given',
-            'category': 'Not given',
-            'opening_hours': 'Not given',
-            'plus_code': 'Not given',
-            'cid': 'Not given',
-            'url': 'Not given',
-            'description': 'Not given'
+            field: 'Not given'
+            for field in DataExtractor.DETAIL_FIELDS
+            if want(field)
         }
         
         try:
@@ -56,202 +291,58 @@ class DataExtractor:
                 pass
             
             # Extract coordinates from URL (multiple methods)
-            try:
-                logger.debug(f"Current URL for coordinate extraction: {current_url}")
-                
-                # Method 1: Extract from @ symbol (e.g., @40.7128,-74.0060,17z)
-                if '@' in current_url:
-                    coords = current_url.split('@')[1].split(',')
-                    if len(coords) >= 2:
-                        business_info['latitude'] = coords[0]
-                        business_info['longitude'] = coords[1]
-                        logger.debug(f"Extracted coordinates from @: lat={coords[0]}, lng={coords[1]}")
-                
-                # Method 2: Extract from !3d and !4d parameters (e.g., !3d40.7128!4d-74.0060)
-                if business_info['latitude'] == 'Not given' and '!3d' in current_url and '!4d' in current_url:
-                    try:
-                        lat_part = current_url.split('!3d')[1].split('!')[0]
-                        lng_part = current_url.split('!4d')[1].split('!')[0]
-                        business_info['latitude'] = lat_part
-                        business_info['longitude'] = lng_part
-                        logger.debug(f"Extracted coordinates from !3d/!4d: lat={lat_part}, lng={lng_part}")
-                    except:
-                        pass
-                
-                # Method 3: Extract from data attributes or meta tags
-                if business_info['latitude'] == 'Not given':
-                    try:
-                        # Try to find coordinates in page metadata
-                        lat_elem = await page.locator('[data-latitude]').first.get_attribute('data-latitude', timeout=1000)
-                        lng_elem = await page.locator('[data-longitude]').first.get_attribute('data-longitude', timeout=1000)
-                        if lat_elem and lng_elem:
-                            business_info['latitude'] = lat_elem
-                            business_info['longitude'] = lng_elem
-                            logger.debug(f"Extracted coordinates from data attributes: lat={lat_elem}, lng={lng_elem}")
-                    except:
-                        pass
-                
-                if business_info['latitude'] == 'Not given':
-                    logger.warning(f"Could not extract coordinates from URL: {current_url}")
-                    
-            except Exception as e:
-                logger.error(f"Error extracting coordinates: {e}")
-            
-            # Extract business name
-            try:
-                # Try multiple selectors for the business name
-                name_selectors = [
-                    'h1.DUwDvf',  # Main heading
-                    'h1[class*="fontHeadline"]',
-                    'h1',
-                    'div[role="main"] h1'
-                ]
+            if want('latitude', 'longitude'):
+                try:
+                    logger.debug(f"Current URL for coordinate extraction: {current_url}")
                 
-                for selector in name_selectors:
-                    try:
-                        name_elem = await page.locator(selector).first.text_content(timeout=3000)
-                        if name_elem and name_elem.strip() and name_elem.strip() != 'Results':
-                            business_info['name'] = name_elem.strip()
-                            break
-                    except:
-                        continue
-            except:
-                pass
-            
-            # Extract category
-            try:
-                category_elem = await page.locator('button[jsaction*="category"]').first.text_content(timeout=3000)
-                if category_elem:
-                    business_info['category'] = category_elem.strip()
-            except:
-                pass
-            
-            # Extract rating and reviews - FIXED
-            try:
-                # Look for the rating in the main info section
-                # Google Maps shows rating like "4.5" followed by review count
-                rating_text = await page.locator('div.F7nice').first.text_content(timeout=3000)
+                    # Method 1: Extract from @ symbol (e.g., @40.7128,-74.0060,17z)
+                    if '@' in current_url:
+                        coords = current_url.split('@')[1].split(',')
+                        if len(coords) >= 2:
+                            business_info['latitude'] = coords[0]
+                            business_info['longitude'] = coords[1]
+                            logger.debug(f"Extracted coordinates from @: lat={coords[0]}, lng={coords[1]}")
                 
-                if rating_text:
-                    # Extract rating (first number)
-                    rating_match = re.search(r'(\d+\.?\d*)', rating_text)
-                    if rating_match:
-                        rating_value = float(rating_match.group(1))
-                        if 0 <= rating_value <= 5:
-                            business_info['rating'] = rating_value
-                            logger.debug(f"Extracted rating: {rating_value}")
-                    
-                    # Extract review count
-                    review_match = re.search(r'\(?([\d,]+)\)?', rating_text)
-                    if review_match:
-                        review_str = review_match.group(1).replace(',', '')
-                        business_info['review_count'] = int(review_str)
-                        logger.debug(f"Extracted reviews: {review_str}")
-            except Exception as e:
-                logger.debug(f"Could not extract rating: {e}")
-                # Try alternative method
-                try:
-                    # Sometimes rating is in aria-label
-                    rating_elem = await page.locator('span[role="img"][aria-label*="star"]').first.get_attribute('aria-label', timeout=2000)
-                    if rating_elem:
-                        rating = DataExtractor.clean_rating(rating_elem)
-                        if rating:
-                            business_info['rating'] = rating
-                        review_count = DataExtractor.extract_review_count(rating_elem)
-                        if review_count:
-                            business_info['review_count'] = review_count
-                except:
-                    pass
-            
-            # Extract address
-            try:
-                address_button = await page.locator('button[data-item-id="address"]').first.text_content(timeout=3000)
-                if address_button:
-                    business_info['full_address'] = address_button.strip()
-            except:
-                pass
-            
-            # Extract phone
-            try:
-                phone_button = await page.locator('button[data-item-id*="phone"]').first.text_content(timeout=3000)
-                if phone_button:
-                    business_info['phone'] = DataExtractor.clean_phone_number(phone_button)
-            except:
-                pass
-            
-            # Extract website (check main view first, then menu tab)
-            try:
-                # Try main view first
-                website_link = await page.locator('a[data-item-id="authority"]').first.get_attribute('href', timeout=2000)
-                if website_link:
-                    business_info['website'] = website_link.strip()
-                    logger.info(f"Found website: {website_link}")
-            except:
-                # If not found, try clicking "Menu" tab where website might be hidden
-                try:
-                    logger.debug("Website not in main view, checking menu tab...")
-                    # Click on the menu/about tab
-                    menu_button = page.locator('button[aria-label*="Menu"], button:has-text("Menu"), button[role="tab"]:has-text("About")')
-                    await menu_button.first.click(timeout=2000)
-                    await asyncio.sleep(0.5)
+                    # Method 2: Extract from !3d and !4d parameters (e.g., !3d40.7128!4d-74.0060)
+                    if business_info['latitude'] == 'Not given' and '!3d' in current_url and '!4d' in current_url:
+                        try:
+                            lat_part = current_url.split('!3d')[1].split('!')[0]
+                            lng_part = current_url.split('!4d')[1].split('!')[0]
+                            business_info['latitude'] = lat_part
+                            business_info['longitude'] = lng_part
+                            logger.debug(f"Extracted coordinates from !3d/!4d: lat={lat_part}, lng={lng_part}")
+                        except:
+                            pass
                     
-                    # Try to find website again
-                    website_link = await page.locator('a[data-item-id="authority"]').first.get_attribute('href', timeout=2000)
-                    if website_link:
-                        business_info['website'] = website_link.strip()
-                        logger.info(f"Found website in menu tab: {website_link}")
                 except Exception as e:
-                    logger.debug(f"Could not find website in menu tab: {e}")
-                    pass
+                    logger.error(f"Error extracting coordinates: {e}")
             
-            # Extract plus code
-            try:
-                plus_code_button = await page.locator('button[data-item-id="oloc"]').first.text_content(timeout=3000)
-                if plus_code_button:
-                    business_info['plus_code'] = plus_code_button.strip()
-            except:
-                pass
-            
-            # Extract opening hours
-            try:
-                hours_selectors = [
-                    'button[data-item-id*="hours"]',
-                    'div[aria-label*="Hours"]',
-                    'button[aria-label*="Hours"]'
-                ]
+            # Read the page fields from DETAIL_SELECTORS (method 3 for coordinates: data attributes)
+            values = {}
+            for field, spec in DataExtractor.DETAIL_SELECTORS.items():
+                if not want(*spec.get('fields', (field,))):
+                    continue
+                if field in ('latitude', 'longitude') and business_info['latitude'] != 'Not given':
+                    continue
+                values[field] = await DataExtractor._read_field(page, field)
                 
-                for selector in hours_selectors:
+                # The website may only be listed on the menu/about tab
+                if field == 'website' and values[field] is None:
                     try:
-                        hours_elem = await page.locator(selector).first.get_attribute('aria-label', timeout=2000)
-                        if not hours_elem:
-                            hours_elem = await page.locator(selector).first.text_content(timeout=2000)
-                        
-                        if hours_elem and len(hours_elem) > 5:
-                            business_info['opening_hours'] = hours_elem.strip()
-                            break
-                    except:
-                        continue
-            except:
-                pass
+                        logger.debug("Website not in main view, checking menu tab...")
+                        menu_button = page.locator('button[aria-label*="Menu"], button:has-text("Menu"), button[role="tab"]:has-text("About")')
+                        await menu_button.first.click(timeout=DataExtractor._timeout('selector', 2000))
+                        await asyncio.sleep(0.5)
+                        values[field] = await DataExtractor._read_field(page, field)
+                    except Exception as e:
+                        logger.debug(f"Could not find website in menu tab: {e}")
+                if field == 'website' and values[field]:
+                    logger.info(f"Found website: {values[field]}")
             
-            # Extract description/about
-            try:
-                # Look for description in various possible locations
-                desc_selectors = [
-                    'div[class*="description"]',
-                    'div[jsaction*="description"]',
-                    'div[aria-label*="About"]'
-                ]
-                for selector in desc_selectors:
-                    try:
-                        desc_elem = await page.locator(selector).first.text_content(timeout=2000)
-                        if desc_elem and len(desc_elem) > 10:
-                            business_info['description'] = desc_elem.strip()
-                            break
-                    except:
-                        continue
-            except:
-                pass
+            DataExtractor.apply_detail_values(business_info, values)
+            
+            if want('latitude', 'longitude') and business_info['latitude'] == 'Not given':
+                logger.warning(f"Could not extract coordinates from URL: {current_url}")
             
         except Exception as e:
             logger.error(f"Error extracting detailed business info: {e}")
@@ -329,6 +420,55 @@ class DataExtractor:
         
         return business_info
     
+    @staticmethod
+    def parse_result_card(card: Dict) -> Dict:
+        """
+        Parse the raw data read from a result card by RESULT_CARD_JS.
+        
+        Args:
+            card: Dictionary with 'url', 'name', 'rating_label' and 'text'
+            
+        Returns:
+            Dictionary with url, name, rating, review_count and category
+            (None where the card does not show the value)
+        """
+        card_info = {
+            'url': card.get('url', ''),
+            'name': (card.get('name') or '').strip(),
+            'rating': None,
+            'review_count': None,
+            'category': None
+        }
+        
+        rating_label = card.get('rating_label') or ''
+        if rating_label:
+            card_info['rating'] = DataExtractor.clean_rating(rating_label)
+            card_info['review_count'] = DataExtractor.extract_review_count(rating_label)
+        
+        lines = [line.strip() for line in (card.get('text') or '').split('\n') if line.strip()]
+        category_line_index = 1
+        for idx, line in enumerate(lines):
+            # Rating line looks like "4.6(12,345)" or "4.6 (12,345)"
+            rating_match = re.match(r'^(\d(?:[.,]\d)?)\s*\(([\d,.]+)\)', line)
+            if rating_match:
+                if card_info['rating'] is None:
+                    card_info['rating'] = float(rating_match.group(1).replace(',', '.'))
+                if card_info['review_count'] is None:
+                    card_info['review_count'] = int(re.sub(r'[,.]', '', rating_match.group(2)))
+                category_line_index = idx + 1
+                break
+            if line.startswith('No reviews'):
+                category_line_index = idx + 1
+                break
+        
+        # Category is the first segment of the line after the rating ("Pizza · $ · 7 Carmine St")
+        if category_line_index < len(lines):
+            category = lines[category_line_index].split('·')[0].strip()
+            if category and not any(char.isdigit() for char in category):
+                card_info['category'] = category
+        
+        return card_info
+    
     @staticmethod
     def clean_phone_number(phone: str) -> str:
         """
@@ -455,13 +595,16 @@ class DataExtractor:
             logger.info(f"Visiting website for email extraction...")
             
             # Use configurable timeout
-            timeout = Config.EMAIL_EXTRACTION_TIMEOUT * 1000  # Convert to milliseconds
+            timeout = DataExtractor._timeout('email_page', Config.EMAIL_EXTRACTION_TIMEOUT * 1000)
             
             # Try homepage first
             try:
                 logger.info(f"Visiting homepage: {website_url}")
+                started = asyncio.get_running_loop().time()
                 try:
                     await page.goto(website_url, timeout=timeout, wait_until='networkidle')
+                    if DataExtractor.timeouts is not None:
+                        DataExtractor.timeouts.record('email_page', None, asyncio.get_running_loop().time() - started)
                 except:
                     # If networkidle times out, try with domcontentloaded
                     await page.goto(website_url, timeout=timeout, wait_until='domcontentloaded')
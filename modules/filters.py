@@ -0,0 +1,135 @@
+"""
+Filters Module
+Business filter predicates evaluated on result-card data before detail tabs are opened.
+"""
+
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class BusinessFilter:
+    """Predicates on rating, review count and category."""
+
+    def __init__(self, min_rating: Optional[float] = None, min_reviews: Optional[int] = None,
+                 categories: Optional[List[str]] = None):
+        """
+        Initialize the filter.
+
+        Args:
+            min_rating: Minimum star rating (inclusive)
+            min_reviews: Minimum number of reviews (inclusive)
+            categories: Category substrings, any of which must match (case-insensitive)
+        """
+        self.min_rating = min_rating
+        self.min_reviews = min_reviews
+        self.categories = [c.strip().lower() for c in (categories or []) if c and c.strip()]
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_options(cls, source) -> Tuple[Optional['BusinessFilter'], Optional[str]]:
+        """
+        Build a filter from request data (JSON body or form fields).
+
+        Accepts 'min_rating', 'min_reviews' and 'categories'
+        (a list, or a comma-separated string).
+
+        Args:
+            source: Dict-like object with the filter fields
+
+        Returns:
+            Tuple of (filter or None if no predicates given, error message or None)
+        """
+        min_rating = source.get('min_rating')
+        min_reviews = source.get('min_reviews')
+        categories = source.get('categories')
+
+        try:
+            min_rating = float(min_rating) if min_rating not in (None, '') else None
+        except (TypeError, ValueError):
+            return None, 'min_rating must be a number'
+        if min_rating is not None and not 0 <= min_rating <= 5:
+            return None, 'min_rating must be between 0 and 5'
+
+        try:
+            min_reviews = int(min_reviews) if min_reviews not in (None, '') else None
+        except (TypeError, ValueError):
+            return None, 'min_reviews must be an integer'
+        if min_reviews is not None and min_reviews < 0:
+            return None, 'min_reviews must not be negative'
+
+        if isinstance(categories, str):
+            categories = categories.split(',')
+        elif categories is not None and not isinstance(categories, list):
+            return None, 'categories must be a list or comma-separated string'
+
+        business_filter = cls(min_rating, min_reviews, [str(c) for c in categories or []])
+        if business_filter.is_empty():
+            return None, None
+        return business_filter, None
+
+    def required_fields(self) -> Set[str]:
+        """Get the business fields the predicates need."""
+        fields = set()
+        if self.min_rating is not None:
+            fields.add('rating')
+        if self.min_reviews is not None:
+            fields.add('review_count')
+        if self.categories:
+            fields.add('category')
+        return fields
+
+    def is_empty(self) -> bool:
+        """Check whether the filter has no predicates."""
+        return self.min_rating is None and self.min_reviews is None and not self.categories
+
+    def matches(self, data: Dict, partial: bool = False) -> bool:
+        """
+        Evaluate the predicates on business data.
+
+        A place without a rating has no reviews, so it fails rating and review
+        predicates. A missing category only fails when partial is False.
+
+        Args:
+            data: Dictionary with 'rating', 'review_count' and 'category'
+            partial: True for result-card data, where the category may not be visible
+
+        Returns:
+            True if the business passes every predicate
+        """
+        if self.min_rating is not None:
+            rating = _as_number(data.get('rating'))
+            if rating is None or rating < self.min_rating:
+                return False
+
+        if self.min_reviews is not None:
+            review_count = _as_number(data.get('review_count'))
+            if review_count is None or review_count < self.min_reviews:
+                return False
+
+        if self.categories:
+            category = data.get('category')
+            if not category or category == 'Not given':
+                return partial
+            category = str(category).lower()
+            if not any(wanted in category for wanted in self.categories):
+                return False
+
+        return True
+
+    def to_dict(self) -> Dict:
+        """Get the filter as a dictionary for status reporting."""
+        return {
+            'min_rating': self.min_rating,
+            'min_reviews': self.min_reviews,
+            'categories': self.categories
+        }
+
+
+def _as_number(value) -> Optional[float]:
+    """Convert a rating or review count to a number, or None if missing."""
+    if value is None or value == 'Not given' or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,103 @@
+"""
+Hedging Module
+Decides when a slow business tab gets a duplicate (hedged) attempt, with a capped hedge rate.
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+
+class HedgePolicy:
+    """Hedge tabs that run past the running latency percentile, within a hedge-rate budget."""
+
+    def __init__(self, percentile: float = 95, max_hedge_rate: float = 0.1,
+                 min_samples: int = 20, window: int = 200):
+        """
+        Initialize the hedge policy.
+
+        Args:
+            percentile: Tab latency percentile after which a hedge is launched
+            max_hedge_rate: Maximum hedges per primary attempt, bounding extra bandwidth
+            min_samples: Latency samples needed before hedging starts
+            window: Number of recent tab latencies kept
+        """
+        self.percentile = percentile
+        self.max_hedge_rate = max_hedge_rate
+        self.min_samples = min_samples
+        self.logger = logging.getLogger(__name__)
+
+        self.latencies = deque(maxlen=window)
+        self.attempts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.hedges_denied = 0
+        self._lock = threading.Lock()
+
+    def record_attempt(self) -> None:
+        """Count a primary attempt (the base the hedge rate is measured against)."""
+        with self._lock:
+            self.attempts += 1
+
+    def record_latency(self, latency: float) -> None:
+        """
+        Record the latency at which a business result was delivered.
+
+        Args:
+            latency: Seconds from the primary attempt's start to its result
+        """
+        with self._lock:
+            self.latencies.append(latency)
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Get how long to wait on a primary attempt before hedging it.
+
+        Returns:
+            Seconds (the running latency percentile), or None until enough samples exist
+        """
+        with self._lock:
+            if len(self.latencies) < self.min_samples:
+                return None
+            latencies = sorted(self.latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * self.percentile / 100))
+        return latencies[index]
+
+    def try_acquire(self) -> bool:
+        """
+        Claim a hedge if the hedge-rate budget allows it.
+
+        Returns:
+            True if a hedge may be launched
+        """
+        with self._lock:
+            if self.hedges + 1 > self.attempts * self.max_hedge_rate:
+                self.hedges_denied += 1
+                return False
+            self.hedges += 1
+            return True
+
+    def record_win(self, hedge_won: bool) -> None:
+        """
+        Record which attempt of a hedged pair finished first.
+
+        Args:
+            hedge_won: True if the hedge beat the primary attempt
+        """
+        if hedge_won:
+            with self._lock:
+                self.hedge_wins += 1
+
+    def get_stats(self) -> Dict:
+        """Get hedging statistics for status reporting."""
+        delay = self.hedge_delay()
+        with self._lock:
+            return {
+                'attempts': self.attempts,
+                'hedges': self.hedges,
+                'hedge_wins': self.hedge_wins,
+                'hedges_denied': self.hedges_denied,
+                'hedge_rate': round(self.hedges / self.attempts, 3) if self.attempts else 0.0,
+                'hedge_after_seconds': round(delay, 2) if delay is not None else None
+            }
@@ -0,0 +1,349 @@
+"""
+Job Planner Module
+Estimates job duration and proxy traffic cost from recorded per-query throughput,
+and keeps a live ETA that follows the actual throughput while a job runs.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+GB = 1024 ** 3
+
+
+def query_kind(query: Dict) -> str:
+    """Get the kind of a query: 'place' (single business URL) or 'search' (keyword or search URL)."""
+    return 'place' if '/maps/place/' in (query.get('url') or '') else 'search'
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Get an interpolated percentile of a non-empty list."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class ThroughputHistory:
+    """Recorded timings, businesses and proxy bytes of past queries, persisted to a JSON file."""
+
+    def __init__(self, history_file: Optional[str] = None, max_records: int = 500):
+        """
+        Initialize the history.
+
+        Args:
+            history_file: JSON file to persist records to (None keeps them in memory)
+            max_records: Most recent queries kept
+        """
+        self.history_file = history_file
+        self.max_records = max_records
+        self.logger = logging.getLogger(__name__)
+
+        self.records: List[Dict] = []
+        self._lock = threading.Lock()
+        self.load()
+
+    def record_query(self, kind: str, seconds: float, businesses: int, bytes_used: int, tabs: float) -> None:
+        """
+        Record a finished query.
+
+        Args:
+            kind: 'search' or 'place'
+            seconds: Wall-clock seconds the query took
+            businesses: Businesses delivered
+            bytes_used: Proxy bytes the query used
+            tabs: Parallel detail tabs the query ran with (average when the limit adapted)
+        """
+        with self._lock:
+            self.records.append({
+                'at': time.time(),
+                'kind': kind,
+                'seconds': round(seconds, 2),
+                'businesses': businesses,
+                'bytes': bytes_used,
+                'tabs': max(1, tabs)
+            })
+            del self.records[:-self.max_records]
+        self.save()
+
+    def get_records(self, kind: str) -> List[Dict]:
+        """Get the recorded queries of one kind, oldest first."""
+        with self._lock:
+            return [record for record in self.records if record['kind'] == kind]
+
+    def load(self) -> None:
+        """Load persisted records, if any."""
+        if not self.history_file or not os.path.exists(self.history_file):
+            return
+
+        try:
+            with open(self.history_file, 'r') as f:
+                data = json.load(f)
+            with self._lock:
+                self.records = data.get('records', [])[-self.max_records:]
+            self.logger.info(f"Loaded {len(self.records)} query timings from {self.history_file}")
+        except Exception as e:
+            self.logger.warning(f"Could not load job history: {e}")
+
+    def save(self) -> None:
+        """Persist records to disk (atomic replace)."""
+        if not self.history_file:
+            return
+
+        try:
+            with self._lock:
+                data = json.dumps({'records': self.records})
+            tmp_file = self.history_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                f.write(data)
+            os.replace(tmp_file, self.history_file)
+        except Exception as e:
+            self.logger.warning(f"Could not save job history: {e}")
+
+
+class JobPlanner:
+    """
+    Turns throughput history and the current settings into a duration and cost estimate.
+
+    Search queries are modelled as businesses per query times "tab-seconds" per
+    business (seconds x parallel tabs), divided by the tabs the job will run with;
+    queries that found nothing are costed at their own observed duration. Per-proxy
+    rate limits put a floor under each query, and budgets cap the totals.
+    """
+
+    # Used until enough queries of a kind have been recorded
+    DEFAULTS = {
+        'businesses_per_query': 20,
+        'tab_seconds_per_business': 15.0,
+        'bytes_per_business': 1.5 * 1024 * 1024,
+        'empty_query_seconds': 30.0,
+        'place_seconds': 10.0,
+        'place_bytes': 1024 * 1024
+    }
+
+    def __init__(self, history: ThroughputHistory, parallel_tabs: int = 5, cost_per_gb: float = 0.0,
+                 rate_limit: float = 0.0, delay_between_queries: float = 0.0, min_samples: int = 5):
+        """
+        Initialize the planner.
+
+        Args:
+            history: Recorded query throughput
+            parallel_tabs: Detail tabs run at once
+            cost_per_gb: Proxy price per GB
+            rate_limit: Navigations per second per proxy (0 = not rate limited)
+            delay_between_queries: Fixed pause after each query (used when not rate limited)
+            min_samples: Recorded queries of a kind needed before history replaces the defaults
+        """
+        self.history = history
+        self.parallel_tabs = max(1, parallel_tabs)
+        self.cost_per_gb = cost_per_gb
+        self.rate_limit = rate_limit
+        self.delay_between_queries = 0.0 if rate_limit else delay_between_queries
+        self.min_samples = min_samples
+
+    def _search_model(self, pct: float) -> Dict:
+        """Per-query parameters of search queries at a percentile of the history."""
+        records = self.history.get_records('search')
+        model = {
+            'businesses_per_query': self.DEFAULTS['businesses_per_query'],
+            'tab_seconds_per_business': self.DEFAULTS['tab_seconds_per_business'],
+            'bytes_per_business': self.DEFAULTS['bytes_per_business'],
+            'empty_query_seconds': self.DEFAULTS['empty_query_seconds'],
+            'empty_share': 0.0,
+            'samples': len(records)
+        }
+        if len(records) < self.min_samples:
+            return model
+
+        found = [record for record in records if record['businesses'] > 0]
+        empty = [record for record in records if record['businesses'] == 0]
+        model['empty_share'] = len(empty) / len(records)
+        if empty:
+            model['empty_query_seconds'] = _percentile([record['seconds'] for record in empty], pct)
+        if found:
+            model['businesses_per_query'] = sum(record['businesses'] for record in found) / len(found)
+            model['tab_seconds_per_business'] = _percentile(
+                [record['seconds'] * record['tabs'] / record['businesses'] for record in found], pct
+            )
+            model['bytes_per_business'] = _percentile(
+                [record['bytes'] / record['businesses'] for record in found], pct
+            )
+        return model
+
+    def _place_model(self, pct: float) -> Dict:
+        """Per-query parameters of single business URLs at a percentile of the history."""
+        records = self.history.get_records('place')
+        if len(records) < self.min_samples:
+            return {'seconds': self.DEFAULTS['place_seconds'], 'bytes': self.DEFAULTS['place_bytes'], 'samples': len(records)}
+        return {
+            'seconds': _percentile([record['seconds'] for record in records], pct),
+            'bytes': _percentile([record['bytes'] for record in records], pct),
+            'samples': len(records)
+        }
+
+    def _totals(self, counts: Dict[str, int], pct: float, query_budget=None) -> Dict:
+        """Total seconds, businesses and bytes for the query counts at a percentile."""
+        search = self._search_model(pct)
+        place = self._place_model(pct)
+
+        businesses = search['businesses_per_query']
+        if query_budget is not None and query_budget.max_businesses:
+            businesses = min(businesses, query_budget.max_businesses)
+
+        found_seconds = businesses * search['tab_seconds_per_business'] / self.parallel_tabs
+        if self.rate_limit:
+            # One navigation for the search plus one per detail tab, all through the current proxy
+            found_seconds = max(found_seconds, (1 + businesses) / self.rate_limit)
+        search_seconds = (1 - search['empty_share']) * found_seconds + search['empty_share'] * search['empty_query_seconds']
+        search_bytes = (1 - search['empty_share']) * businesses * search['bytes_per_business']
+        place_seconds = max(place['seconds'], 1 / self.rate_limit) if self.rate_limit else place['seconds']
+        place_bytes = place['bytes']
+
+        if query_budget is not None and query_budget.max_seconds:
+            search_seconds = min(search_seconds, query_budget.max_seconds)
+            place_seconds = min(place_seconds, query_budget.max_seconds)
+        if query_budget is not None and query_budget.max_bytes:
+            search_bytes = min(search_bytes, query_budget.max_bytes)
+            place_bytes = min(place_bytes, query_budget.max_bytes)
+
+        queries = counts['search'] + counts['place']
+        return {
+            'seconds': counts['search'] * search_seconds + counts['place'] * place_seconds
+                       + queries * self.delay_between_queries,
+            'businesses': counts['search'] * (1 - search['empty_share']) * businesses + counts['place'],
+            'bytes': counts['search'] * search_bytes + counts['place'] * place_bytes,
+            'samples': {'search': search['samples'], 'place': place['samples']}
+        }
+
+    @staticmethod
+    def _apply_job_budget(totals: Dict, job_budget) -> Dict:
+        """Scale totals down to the first job budget limit they would hit."""
+        if job_budget is None:
+            return totals
+        fraction = 1.0
+        if job_budget.max_businesses and totals['businesses'] > job_budget.max_businesses:
+            fraction = min(fraction, job_budget.max_businesses / totals['businesses'])
+        if job_budget.max_bytes and totals['bytes'] > job_budget.max_bytes:
+            fraction = min(fraction, job_budget.max_bytes / totals['bytes'])
+        if job_budget.max_seconds and totals['seconds'] * fraction > job_budget.max_seconds:
+            fraction = job_budget.max_seconds / totals['seconds']
+        return dict(totals, seconds=totals['seconds'] * fraction, businesses=totals['businesses'] * fraction,
+                    bytes=totals['bytes'] * fraction)
+
+    def estimate(self, queries: List[Dict], options: Optional[Dict] = None) -> Dict:
+        """
+        Estimate a job before it starts.
+
+        Args:
+            queries: Query dictionaries (keyword/zip_code or url)
+            options: Per-job options (query_budget / job_budget are applied)
+
+        Returns:
+            Dictionary with 'queries', 'seconds' (typical), 'seconds_p90' (slow case),
+            'businesses', 'gb', 'cost', 'seconds_per_query', 'bytes_per_query',
+            'parallel_tabs' and 'samples' (recorded queries the estimate is based on)
+        """
+        options = options or {}
+        counts = {'search': 0, 'place': 0}
+        for query in queries:
+            counts[query_kind(query)] += 1
+
+        typical = self._apply_job_budget(self._totals(counts, 50, options.get('query_budget')), options.get('job_budget'))
+        slow = self._apply_job_budget(self._totals(counts, 90, options.get('query_budget')), options.get('job_budget'))
+
+        total = max(len(queries), 1)
+        gb = typical['bytes'] / GB
+        return {
+            'queries': len(queries),
+            'search_queries': counts['search'],
+            'place_queries': counts['place'],
+            'seconds': round(typical['seconds'], 1),
+            'seconds_p90': round(max(slow['seconds'], typical['seconds']), 1),
+            'businesses': int(typical['businesses']),
+            'gb': round(gb, 3),
+            'cost': round(gb * self.cost_per_gb, 2),
+            'seconds_per_query': round(typical['seconds'] / total, 2),
+            'bytes_per_query': int(typical['bytes'] / total),
+            'parallel_tabs': self.parallel_tabs,
+            'samples': typical['samples']
+        }
+
+
+class LiveEta:
+    """
+    ETA of a running job: the planned seconds and bytes per query, blended with the
+    observed ones as queries finish (the plan weighs like prior_weight finished queries).
+    """
+
+    def __init__(self, total_queries: int, planned_seconds_per_query: float, planned_bytes_per_query: float = 0,
+                 cost_per_gb: float = 0.0, prior_weight: float = 3, clock=time.monotonic):
+        """
+        Initialize the ETA.
+
+        Args:
+            total_queries: Queries in the job
+            planned_seconds_per_query: Planner estimate per query
+            planned_bytes_per_query: Planner estimate of proxy bytes per query
+            cost_per_gb: Proxy price per GB
+            prior_weight: Finished queries after which observed throughput outweighs the plan
+            clock: Time source (seconds)
+        """
+        self.total_queries = total_queries
+        self.planned_seconds_per_query = planned_seconds_per_query
+        self.planned_bytes_per_query = planned_bytes_per_query
+        self.cost_per_gb = cost_per_gb
+        self.prior_weight = prior_weight
+        self.clock = clock
+
+        self.started_at = clock()
+        self.processed = 0
+        self.bytes_used = 0
+        self.last_done_at = self.started_at
+        self._lock = threading.Lock()
+
+    def query_done(self, bytes_used: int = 0) -> None:
+        """Count a finished query and the proxy bytes it used."""
+        with self._lock:
+            self.processed += 1
+            self.bytes_used += bytes_used
+            self.last_done_at = self.clock()
+
+    def _blend(self, planned: float, observed_total: float) -> float:
+        """Blend a planned per-query value with the observed average."""
+        return (planned * self.prior_weight + observed_total) / (self.prior_weight + self.processed)
+
+    def get(self) -> Dict:
+        """
+        Get the current ETA.
+
+        Returns:
+            Dictionary with 'processed', 'total', 'elapsed', 'seconds_remaining',
+            'finish_at' (Unix time), 'seconds_per_query', 'queries_per_hour',
+            'projected_gb' and 'projected_cost'
+        """
+        with self._lock:
+            now = self.clock()
+            remaining = max(self.total_queries - self.processed, 0)
+            per_query = self._blend(self.planned_seconds_per_query, self.last_done_at - self.started_at)
+            bytes_per_query = self._blend(self.planned_bytes_per_query, self.bytes_used)
+
+            # Time already spent on the query in flight counts towards it, up to its expected length
+            in_flight = min(now - self.last_done_at, per_query) if remaining else 0.0
+            seconds_remaining = max(remaining * per_query - in_flight, 0.0)
+            projected_gb = (self.bytes_used + remaining * bytes_per_query) / GB
+
+            return {
+                'processed': self.processed,
+                'total': self.total_queries,
+                'elapsed': round(now - self.started_at, 1),
+                'seconds_remaining': round(seconds_remaining, 1),
+                'finish_at': round(time.time() + seconds_remaining),
+                'seconds_per_query': round(per_query, 2),
+                'queries_per_hour': round(3600 / per_query, 1) if per_query > 0 else None,
+                'projected_gb': round(projected_gb, 3),
+                'projected_cost': round(projected_gb * self.cost_per_gb, 2)
+            }
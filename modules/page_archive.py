@@ -0,0 +1,447 @@
+"""
+Page Archive Module
+Append-only archive of compressed business pages keyed by CID and time, and offline
+re-extraction of the archive with a Python HTML parser across a process pool.
+
+Re-extract after fixing a selector:
+    python -m modules.page_archive archive -o output/reextracted.csv --workers 8
+"""
+
+import argparse
+import csv
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, Optional
+
+from modules.data_extractor import DataExtractor
+from modules.place_fetcher import PlaceFetcher
+
+
+INDEX_FILE = 'index.db'
+
+# Elements without an end tag (they do not open a nesting level)
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+}
+
+
+class PageArchive:
+    """
+    Compressed pages appended to segment files, with a SQLite index of
+    (CID, archived_at) -> segment, offset and length.
+
+    Each archive instance writes its own segments (named by start time, pid and a random suffix),
+    so several scraper processes can share one archive directory.
+    """
+
+    def __init__(self, directory: str = 'archive', max_segment_bytes: int = 256 * 1024 * 1024,
+                 compress_level: int = 6):
+        """
+        Initialize the archive, creating the directory and index if needed.
+
+        Args:
+            directory: Archive directory (segments and index.db)
+            max_segment_bytes: Segment size after which a new segment is started
+            compress_level: zlib compression level (1 = fastest, 9 = smallest)
+        """
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.compress_level = compress_level
+        self.logger = logging.getLogger(__name__)
+
+        self.segment: Optional[str] = None
+        self.segment_size = 0
+        self.pages = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS pages ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, cid TEXT NOT NULL, url TEXT, '
+                'archived_at REAL NOT NULL, kind TEXT NOT NULL, segment TEXT NOT NULL, '
+                '"offset" INTEGER NOT NULL, length INTEGER NOT NULL, size INTEGER NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS pages_cid ON pages (cid, archived_at)')
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's index connection (SQLite connections must not be shared between threads)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(os.path.join(self.directory, INDEX_FILE), timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def add(self, cid: Optional[str], url: str, html: str, kind: str = 'rendered',
+            archived_at: Optional[float] = None) -> None:
+        """
+        Append a page to the archive.
+
+        Args:
+            cid: Business CID (the URL is used as the key when unknown)
+            url: URL the page was loaded from
+            html: Rendered DOM ('rendered') or raw response body ('raw')
+            kind: 'rendered' (browser DOM snapshot) or 'raw' (unrendered HTTP response)
+            archived_at: Capture time (default: now)
+        """
+        key = cid if cid and cid != 'Not given' else url
+        data = html.encode('utf-8')
+        blob = zlib.compress(data, self.compress_level)
+        archived_at = archived_at if archived_at is not None else time.time()
+
+        with self._lock:
+            if self.segment is None or self.segment_size + len(blob) > self.max_segment_bytes:
+                self.segment = f'pages-{int(time.time())}-{os.getpid()}-{uuid.uuid4().hex[:8]}.z'
+                self.segment_size = 0
+
+            offset = self.segment_size
+            with open(os.path.join(self.directory, self.segment), 'ab') as f:
+                f.write(blob)
+            self.segment_size += len(blob)
+            segment = self.segment
+
+            self.pages += 1
+            self.bytes_in += len(data)
+            self.bytes_out += len(blob)
+
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO pages (cid, url, archived_at, kind, segment, "offset", length, size) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, url, archived_at, kind, segment, offset, len(blob), len(data))
+            )
+
+    def entries(self, latest_only: bool = True, since: Optional[float] = None) -> List[Dict]:
+        """
+        List archived pages.
+
+        Args:
+            latest_only: Only the newest page of each CID
+            since: Only pages archived at or after this time
+
+        Returns:
+            Index entries (cid, url, archived_at, kind, segment, offset, length, size), oldest first
+        """
+        query = 'SELECT cid, url, archived_at, kind, segment, "offset", length, size FROM pages'
+        conditions, params = [], []
+        if latest_only:
+            conditions.append('id IN (SELECT MAX(id) FROM pages GROUP BY cid)')
+        if since is not None:
+            conditions.append('archived_at >= ?')
+            params.append(since)
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY id'
+
+        columns = ('cid', 'url', 'archived_at', 'kind', 'segment', 'offset', 'length', 'size')
+        return [dict(zip(columns, row)) for row in self._connect().execute(query, params)]
+
+    def get(self, cid: str, at: Optional[float] = None) -> Optional[str]:
+        """
+        Get the page of a CID as it was at a given time.
+
+        Args:
+            cid: Business CID (or URL for pages archived without one)
+            at: Time to look up (default: the newest page)
+
+        Returns:
+            HTML, or None if the CID has no page archived at or before that time
+        """
+        row = self._connect().execute(
+            'SELECT segment, "offset", length FROM pages WHERE cid = ? AND archived_at <= ? '
+            'ORDER BY archived_at DESC, id DESC LIMIT 1',
+            (cid, at if at is not None else float('inf'))
+        ).fetchone()
+        if row is None:
+            return None
+        return read_page(self.directory, {'segment': row[0], 'offset': row[1], 'length': row[2]})
+
+    def get_stats(self) -> Dict:
+        """Get pages and bytes archived by this process for status reporting."""
+        with self._lock:
+            return {
+                'directory': self.directory,
+                'pages': self.pages,
+                'bytes': self.bytes_in,
+                'compressed_bytes': self.bytes_out,
+                'ratio': round(self.bytes_in / self.bytes_out, 1) if self.bytes_out else None
+            }
+
+
+def read_page(directory: str, entry: Dict) -> str:
+    """Read and decompress one archived page given its index entry."""
+    with open(os.path.join(directory, entry['segment']), 'rb') as f:
+        f.seek(entry['offset'])
+        return zlib.decompress(f.read(entry['length'])).decode('utf-8')
+
+
+@lru_cache(maxsize=None)
+def parse_selector(css: str) -> List[tuple]:
+    """
+    Parse a DETAIL_SELECTORS selector into its compound parts, outermost first.
+
+    Each part is (tag or None, classes, attribute conditions); a condition is
+    (name, operator, value) with operator None (present), '=' or '*='.
+    """
+    parts = []
+    for compound in re.findall(r'(?:[^\s\[]|\[[^\]]*\])+', css):
+        tag = re.match(r'[\w-]*', compound).group() or None
+        classes = re.findall(r'\.([\w-]+)', re.sub(r'\[[^\]]*\]', '', compound))
+        conditions = [
+            (name, operator or None, value)
+            for name, operator, value in re.findall(r'\[([\w-]+)(?:(\*?=)"([^"]*)")?\]', compound)
+        ]
+        parts.append((tag, classes, conditions))
+    return parts
+
+
+def _matches_part(part: tuple, tag: str, attrs: Dict[str, str]) -> bool:
+    """Check one element against one compound selector part."""
+    part_tag, classes, conditions = part
+    if part_tag and part_tag != tag:
+        return False
+    element_classes = attrs.get('class', '').split()
+    if any(name not in element_classes for name in classes):
+        return False
+    for name, operator, value in conditions:
+        if name not in attrs:
+            return False
+        if operator == '=' and attrs[name] != value:
+            return False
+        if operator == '*=' and value not in attrs[name]:
+            return False
+    return True
+
+
+def _matches(parts: List[tuple], tag: str, attrs: Dict[str, str], ancestors: List[tuple]) -> bool:
+    """Check an element (with its open ancestors, outermost first) against a parsed selector."""
+    if not _matches_part(parts[-1], tag, attrs):
+        return False
+    remaining = parts[:-1]
+    for ancestor_tag, ancestor_attrs in reversed(ancestors):
+        if not remaining:
+            break
+        if _matches_part(remaining[-1], ancestor_tag, ancestor_attrs):
+            remaining = remaining[:-1]
+    return not remaining
+
+
+class DetailPageParser(HTMLParser):
+    """
+    Reads business fields from a rendered detail page with DataExtractor.DETAIL_SELECTORS,
+    the table the live extractor uses. Like locator().first on the live page, each selector
+    reads the first element it matches in document order.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        # (field, selector, parsed selector, sources) for every DETAIL_SELECTORS entry
+        self.selectors = [
+            (field, css, parse_selector(css), sources.split('|'))
+            for field, spec in DataExtractor.DETAIL_SELECTORS.items()
+            for css, sources in spec['selectors']
+        ]
+        # Source values read from the first element each (field, selector) matched
+        self.matched: Dict[tuple, Dict[str, str]] = {}
+        self._open: List[tuple] = []
+        self._captures: List[list] = []
+
+    def _match(self, tag: str, attrs: Dict[str, str], has_content: bool) -> None:
+        for field, css, parts, sources in self.selectors:
+            key = (field, css)
+            if key in self.matched or not _matches(parts, tag, attrs, self._open):
+                continue
+            self.matched[key] = {source: attrs.get(source, '') for source in sources if source != 'text'}
+            if 'text' in sources:
+                self.matched[key]['text'] = ''
+                if has_content:
+                    self._captures.append([key, len(self._open), []])
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value or '' for name, value in attrs}
+        self._match(tag, attrs, tag not in VOID_ELEMENTS)
+        if tag not in VOID_ELEMENTS:
+            self._open.append((tag, attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        self._match(tag, {name: value or '' for name, value in attrs}, False)
+
+    def handle_endtag(self, tag):
+        if tag in VOID_ELEMENTS:
+            return
+        # Close the innermost open element with this tag (and anything left open inside it)
+        for index in range(len(self._open) - 1, -1, -1):
+            if self._open[index][0] == tag:
+                del self._open[index:]
+                break
+        else:
+            return
+        open_captures = []
+        for capture in self._captures:
+            if capture[1] >= len(self._open):
+                # Text content, as textContent joins it: without separators
+                self.matched[capture[0]]['text'] = ''.join(capture[2])
+            else:
+                open_captures.append(capture)
+        self._captures = open_captures
+
+    def handle_data(self, data):
+        for capture in self._captures:
+            capture[2].append(data)
+
+    def close(self):
+        super().close()
+        # Elements never closed in the snapshot end with the document
+        for capture in self._captures:
+            self.matched[capture[0]]['text'] = ''.join(capture[2])
+        self._captures = []
+
+    def values(self) -> Dict[str, Optional[str]]:
+        """Get each field's value the way the live extractor picks it: the first selector yielding a usable one."""
+        values = {}
+        for field, css, parts, sources in self.selectors:
+            if values.get(field):
+                continue
+            matched = self.matched.get((field, css))
+            raw = next((matched[source] for source in sources if matched and matched.get(source)), None)
+            values[field] = DataExtractor.clean_selector_value(field, raw)
+        return values
+
+
+def parse_detail_html(html: str, url: str = '') -> Optional[Dict]:
+    """
+    Extract business info from an archived rendered detail page.
+
+    Args:
+        html: Rendered DOM of the detail page
+        url: URL the page was loaded from (used for CID and coordinates)
+
+    Returns:
+        Business info dictionary, or None if no business name could be found
+    """
+    parser = DetailPageParser()
+    parser.feed(html)
+    parser.close()
+    values = parser.values()
+
+    business_info = PlaceFetcher.empty_business_info(url)
+    if url and '@' in url:
+        coords = url.split('@')[1].split(',')
+        if len(coords) >= 2:
+            business_info['latitude'], business_info['longitude'] = coords[0], coords[1]
+
+    if not values.get('name'):
+        return None
+    DataExtractor.apply_detail_values(business_info, values)
+    return business_info
+
+
+def parse_archived_page(html: str, entry: Dict) -> Optional[Dict]:
+    """
+    Re-extract one archived page: rendered DOM snapshots with the HTML parser,
+    raw responses (and DOM snapshots the parser finds no name in) from the embedded payload,
+    or its meta tags: offline there is no render to fall back to.
+    """
+    business_info = None
+    if entry['kind'] == 'rendered':
+        business_info = parse_detail_html(html, entry['url'] or '')
+    if business_info is None:
+        business_info = PlaceFetcher.parse_place_html(html, entry['url'] or '', partial=True)
+    return business_info
+
+
+def _reextract_batch(directory: str, entries: List[Dict]) -> List[Dict]:
+    """Re-extract a batch of archived pages (runs in a worker process)."""
+    results = []
+    for entry in entries:
+        try:
+            business_info = parse_archived_page(read_page(directory, entry), entry)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Could not re-extract {entry['cid']}: {e}")
+            business_info = None
+        if business_info is not None:
+            business_info['archived_at'] = entry['archived_at']
+            results.append(business_info)
+    return results
+
+
+def _batches(entries: List[Dict], size: int) -> Iterator[List[Dict]]:
+    for start in range(0, len(entries), size):
+        yield entries[start:start + size]
+
+
+def reextract(directory: str, output_file: str, workers: Optional[int] = None,
+              latest_only: bool = True, since: Optional[float] = None, batch_size: int = 200) -> Dict:
+    """
+    Re-parse archived pages across a process pool and write the businesses to a CSV file.
+
+    Args:
+        directory: Archive directory
+        output_file: CSV file to write
+        workers: Worker processes (default: one per CPU)
+        latest_only: Only the newest page of each CID
+        since: Only pages archived at or after this time
+        batch_size: Pages per task sent to a worker
+
+    Returns:
+        Dictionary with 'pages', 'businesses', 'failed' and 'seconds'
+    """
+    logger = logging.getLogger(__name__)
+    started = time.monotonic()
+    entries = PageArchive(directory).entries(latest_only=latest_only, since=since)
+    logger.info(f"Re-extracting {len(entries)} archived pages from {directory}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    businesses = 0
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(DataExtractor.DETAIL_FIELDS) + ['archived_at'])
+        writer.writeheader()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_reextract_batch, directory, batch) for batch in _batches(entries, batch_size)]
+            for future in as_completed(futures):
+                for business_info in future.result():
+                    writer.writerow(business_info)
+                    businesses += 1
+
+    summary = {
+        'pages': len(entries),
+        'businesses': businesses,
+        'failed': len(entries) - businesses,
+        'seconds': round(time.monotonic() - started, 2)
+    }
+    logger.info(f"Re-extraction finished: {summary}")
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point for offline re-extraction."""
+    parser = argparse.ArgumentParser(description='Re-extract businesses from the page archive.')
+    parser.add_argument('directory', help='Archive directory (PAGE_ARCHIVE_DIR)')
+    parser.add_argument('-o', '--output', default='output/reextracted.csv', help='CSV file to write')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Worker processes (default: CPUs)')
+    parser.add_argument('--all-versions', action='store_true', help='Every archived page, not only the newest per CID')
+    parser.add_argument('--since', type=float, default=None, help='Only pages archived at or after this Unix time')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    summary = reextract(args.directory, args.output, workers=args.workers,
+                        latest_only=not args.all_versions, since=args.since)
+    print(f"{summary['businesses']}/{summary['pages']} pages re-extracted in {summary['seconds']}s -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
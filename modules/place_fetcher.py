@@ -0,0 +1,308 @@
+"""
+Place Fetcher Module
+Lightweight place-detail fetch for known business URLs.
+Downloads the place page HTML without rendering it and parses the embedded place payload.
+"""
+
+import json
+import logging
+import re
+from html import unescape
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from modules.data_extractor import DataExtractor
+
+
+# Prefix Google puts in front of JSON payloads to prevent JSON hijacking
+XSSI_PREFIX = ")]}'"
+
+DEFAULT_HEADERS = {
+    'User-Agent': (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+        '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    ),
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9'
+}
+
+
+class PlaceFetcher:
+    """Fetches and parses Google Maps place pages without a browser."""
+
+    def __init__(self, timeout: float = 10):
+        """
+        Initialize the place fetcher.
+
+        Args:
+            timeout: Request timeout in seconds
+        """
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+
+        # Bytes received by the last fetch (for proxy byte budgets)
+        self.last_response_bytes = 0
+
+        # Body of the last successful response (for the page archive)
+        self.last_html: Optional[str] = None
+
+    def fetch(self, url: str, proxy: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Fetch a place page through the proxy and parse it.
+
+        Args:
+            url: Google Maps place URL
+            proxy: Proxy dictionary (server, username, password) or None for a direct request
+
+        Returns:
+            Business info dictionary, or None if the page could not be fetched or parsed
+        """
+        self.last_response_bytes = 0
+        self.last_html = None
+        try:
+            response = requests.get(
+                url,
+                headers=DEFAULT_HEADERS,
+                cookies={'CONSENT': 'YES+'},
+                proxies=self._build_proxies(proxy),
+                timeout=self.timeout
+            )
+        except Exception as e:
+            self.logger.debug(f"Fast fetch failed for {url}: {e}")
+            return None
+
+        self.last_response_bytes = len(response.content) + sum(
+            len(name) + len(value) + 4 for name, value in response.headers.items()
+        )
+
+        if response.status_code != 200:
+            self.logger.debug(f"Fast fetch got HTTP {response.status_code} for {url}")
+            return None
+
+        if 'consent.google' in response.url or 'sorry/index' in response.url:
+            self.logger.debug(f"Fast fetch was redirected to {response.url}")
+            return None
+
+        self.last_html = response.text
+        return self.parse_place_html(response.text, url)
+
+    @staticmethod
+    def _build_proxies(proxy: Optional[Dict]) -> Optional[Dict]:
+        """Build a requests proxies mapping from a proxy dictionary."""
+        if not proxy:
+            return None
+
+        server = proxy['server']
+        scheme, _, host = server.partition('://')
+        if proxy.get('username'):
+            server = f"{scheme}://{proxy['username']}:{proxy['password']}@{host}"
+        return {'http': server, 'https': server}
+
+    @staticmethod
+    def parse_place_html(html: str, url: str = '', partial: bool = False) -> Optional[Dict]:
+        """
+        Parse an unrendered place page.
+        Uses the embedded APP_INITIALIZATION_STATE payload. Without it, the meta tags
+        only give name, address, rating and category, so the page counts as
+        unparsed unless partial results are accepted.
+
+        Args:
+            html: Raw HTML of the place page
+            url: URL the page was loaded from (used for CID and coordinates)
+            partial: Fall back to the meta tags when the payload is missing
+                (for callers that cannot render the page instead)
+
+        Returns:
+            Business info dictionary, or None if the page could not be fully parsed
+        """
+        logger = logging.getLogger(__name__)
+
+        place = None
+        try:
+            place = PlaceFetcher._extract_place_payload(html)
+        except Exception as e:
+            logger.debug(f"Could not parse place payload: {e}")
+
+        if place is not None:
+            business_info = PlaceFetcher.parse_place_payload(place, url)
+        elif partial:
+            business_info = PlaceFetcher._parse_meta_tags(html, url)
+        else:
+            logger.debug(f"No place payload in {url or 'page'} - phone, website and hours need a full render")
+            return None
+
+        if business_info['name'] == 'Not given':
+            return None
+        return business_info
+
+    @staticmethod
+    def empty_business_info(url: str) -> Dict:
+        """Create a business info dictionary with every field 'Not given'."""
+        business_info = {field: 'Not given' for field in DataExtractor.DETAIL_FIELDS}
+        business_info['url'] = url or 'Not given'
+
+        # Same URL-derived fields DataExtractor uses on rendered pages
+        if url and '!1s' in url:
+            business_info['cid'] = url.split('!1s')[1].split('!')[0]
+        if url and '!3d' in url and '!4d' in url:
+            business_info['latitude'] = url.split('!3d')[1].split('!')[0]
+            business_info['longitude'] = url.split('!4d')[1].split('!')[0]
+
+        return business_info
+
+    @staticmethod
+    def _extract_place_payload(html: str) -> Optional[List]:
+        """
+        Find the place array inside window.APP_INITIALIZATION_STATE.
+
+        Returns:
+            The place array (payload[6]) or None if not present
+        """
+        marker = re.search(r'window\.APP_INITIALIZATION_STATE\s*=\s*', html)
+        if not marker:
+            return None
+
+        state, _ = json.JSONDecoder().raw_decode(html, marker.end())
+
+        # The place payload is an XSSI-prefixed JSON string in state[3]
+        for chunk in state[3] if len(state) > 3 and isinstance(state[3], list) else []:
+            if not isinstance(chunk, str) or not chunk.startswith(XSSI_PREFIX):
+                continue
+            payload = json.loads(chunk[len(XSSI_PREFIX):])
+            place = _dig(payload, 6)
+            if isinstance(place, list) and isinstance(_dig(place, 11), str):
+                return place
+
+        return None
+
+    @staticmethod
+    def parse_place_payload(place: List, url: str = '') -> Dict:
+        """
+        Map the place array onto the business info fields used by DataExtractor.
+
+        Args:
+            place: Place array (payload[6])
+            url: Place URL
+
+        Returns:
+            Business info dictionary ('Not given' for missing fields)
+        """
+        business_info = PlaceFetcher.empty_business_info(url)
+
+        name = _dig(place, 11)
+        if name:
+            business_info['name'] = name.strip()
+
+        address = _dig(place, 39) or _dig(place, 18)
+        if address:
+            address = address.strip()
+            if name and address.startswith(name + ','):
+                address = address[len(name) + 1:].strip()
+            business_info['full_address'] = address
+
+        latitude = _dig(place, 9, 2)
+        longitude = _dig(place, 9, 3)
+        if latitude is not None and longitude is not None:
+            business_info['latitude'] = str(latitude)
+            business_info['longitude'] = str(longitude)
+
+        phone = _dig(place, 178, 0, 0)
+        if phone:
+            business_info['phone'] = phone.strip()
+
+        website = _dig(place, 7, 0)
+        if website:
+            business_info['website'] = website.strip()
+
+        rating = _dig(place, 4, 7)
+        if isinstance(rating, (int, float)) and 0 <= rating <= 5:
+            business_info['rating'] = float(rating)
+
+        review_count = _dig(place, 4, 8)
+        if isinstance(review_count, (int, float)):
+            business_info['review_count'] = int(review_count)
+
+        categories = _dig(place, 13)
+        if isinstance(categories, list) and categories and isinstance(categories[0], str):
+            business_info['category'] = categories[0]
+
+        hours = PlaceFetcher._format_hours(_dig(place, 34, 1))
+        if hours:
+            business_info['opening_hours'] = hours
+
+        plus_code = _dig(place, 183, 2, 2, 0)
+        if plus_code:
+            business_info['plus_code'] = plus_code
+
+        cid = _dig(place, 10)
+        if cid:
+            business_info['cid'] = cid
+
+        description = _dig(place, 32, 1, 1)
+        if description:
+            business_info['description'] = description.strip()
+
+        return business_info
+
+    @staticmethod
+    def _format_hours(days: Any) -> Optional[str]:
+        """Format the weekly hours array as 'Monday: 9 AM–5 PM; Tuesday: ...'."""
+        if not isinstance(days, list):
+            return None
+
+        parts = []
+        for day in days:
+            day_name = _dig(day, 0)
+            ranges = _dig(day, 1)
+            if not isinstance(day_name, str) or not isinstance(ranges, list):
+                continue
+            parts.append(f"{day_name}: {', '.join(str(r) for r in ranges)}")
+
+        return '; '.join(parts) if parts else None
+
+    @staticmethod
+    def _parse_meta_tags(html: str, url: str) -> Dict:
+        """Fallback parser using the og:title / og:description meta tags."""
+        business_info = PlaceFetcher.empty_business_info(url)
+
+        title = _meta_content(html, 'og:title') or _meta_content(html, 'name', attr='itemprop')
+        if title:
+            # og:title looks like "Business Name · 123 Main St, City"
+            name, _, address = title.partition(' · ')
+            if name.strip() and name.strip() != 'Google Maps':
+                business_info['name'] = name.strip()
+            if address.strip():
+                business_info['full_address'] = address.strip()
+
+        description = _meta_content(html, 'og:description')
+        if description:
+            # og:description looks like "★★★★☆ · Pizza restaurant"
+            stars, _, category = description.partition(' · ')
+            if stars and set(stars.strip()) <= set('★☆'):
+                business_info['rating'] = float(stars.count('★'))
+                if category.strip():
+                    business_info['category'] = category.strip()
+
+        return business_info
+
+
+def _dig(data: Any, *path: int) -> Any:
+    """Safely index into nested lists, returning None when any step is missing."""
+    for index in path:
+        if not isinstance(data, list) or index >= len(data):
+            return None
+        data = data[index]
+    return data
+
+
+def _meta_content(html: str, value: str, attr: str = 'property') -> Optional[str]:
+    """Get the content of a <meta> tag matched by property (or another attribute)."""
+    pattern = (
+        rf'<meta[^>]*{attr}="{re.escape(value)}"[^>]*content="([^"]*)"'
+        rf'|<meta[^>]*content="([^"]*)"[^>]*{attr}="{re.escape(value)}"'
+    )
+    match = re.search(pattern, html)
+    if not match:
+        return None
+    return unescape(match.group(1) or match.group(2) or '')
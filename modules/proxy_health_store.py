@@ -0,0 +1,99 @@
+"""
+Proxy Health Store Module
+SQLite persistence for proxy health, so selection starts from recent data after a restart.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from typing import Dict
+
+
+# Persisted per-proxy fields (the latency samples are stored as a JSON list)
+COLUMNS = (
+    'success', 'failure', 'total', 'captchas', 'latency', 'latency_samples',
+    'weighted_success', 'weighted_failure', 'weighted_captcha',
+    'consecutive_failures', 'trips', 'open_until', 'last_failure_at', 'updated_at'
+)
+
+
+class ProxyHealthStore:
+    """One row of health state per proxy in a local SQLite file."""
+
+    def __init__(self, db_path: str = 'proxy_health.db'):
+        """
+        Initialize the store, creating the table if needed.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = db_path
+        self.logger = logging.getLogger(__name__)
+        self._local = threading.local()
+
+        columns = ', '.join(f'{column} {"TEXT" if column == "latency_samples" else "REAL"}' for column in COLUMNS)
+        self._connect().execute(f'CREATE TABLE IF NOT EXISTS proxy_health (proxy TEXT PRIMARY KEY, {columns})')
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection (SQLite connections must not be shared between threads)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    def load(self) -> Dict[str, Dict]:
+        """
+        Load the saved state of every proxy.
+
+        Returns:
+            Dictionary of proxy key -> state (COLUMNS)
+        """
+        try:
+            rows = self._connect().execute(f'SELECT proxy, {", ".join(COLUMNS)} FROM proxy_health').fetchall()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not load proxy health: {e}")
+            return {}
+
+        states = {}
+        for row in rows:
+            state = dict(zip(COLUMNS, row[1:]))
+            state['latency_samples'] = json.loads(state['latency_samples'] or '[]')
+            states[row[0]] = state
+        return states
+
+    def save(self, states: Dict[str, Dict]) -> None:
+        """
+        Upsert the state of the given proxies in one transaction.
+
+        Args:
+            states: Dictionary of proxy key -> state (COLUMNS)
+        """
+        if not states:
+            return
+
+        rows = []
+        for proxy, state in states.items():
+            values = [json.dumps(state[column]) if column == 'latency_samples' else state[column] for column in COLUMNS]
+            rows.append([proxy] + values)
+
+        placeholders = ', '.join('?' for _ in range(len(COLUMNS) + 1))
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    f'INSERT OR REPLACE INTO proxy_health (proxy, {", ".join(COLUMNS)}) VALUES ({placeholders})',
+                    rows
+                )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not save proxy health: {e}")
+
+    def forget(self, proxy: str) -> None:
+        """Delete the saved state of a proxy (e.g. removed from the proxy file)."""
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute('DELETE FROM proxy_health WHERE proxy = ?', (proxy,))
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not delete proxy health: {e}")
@@ -0,0 +1,229 @@
+"""
+Proxy Leases Module
+Lease tables that cap concurrent users per proxy, in-process (threads and asyncio tasks) or shared between processes.
+"""
+
+import itertools
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+def pick_least_loaded(keys: List[str], counts: Dict[str, int], max_users: int) -> Optional[str]:
+    """
+    Pick the candidate with the fewest active leases and a free slot.
+
+    Args:
+        keys: Candidate proxy keys in preference order (ties go to the earlier key)
+        counts: Active leases per proxy key
+        max_users: Maximum concurrent leases per proxy (0 = unlimited)
+
+    Returns:
+        Proxy key, or None if every candidate is full
+    """
+    best = None
+    for key in keys:
+        users = counts.get(key, 0)
+        if max_users and users >= max_users:
+            continue
+        if best is None or users < best[1]:
+            best = (key, users)
+    return best[0] if best else None
+
+
+class ProxyLease:
+    """A proxy handed out to one user until it is released."""
+
+    def __init__(self, lease_id, proxy: Dict, key: str):
+        """
+        Initialize the lease.
+
+        Args:
+            lease_id: Identifier in the lease table
+            proxy: Proxy dictionary
+            key: Proxy identifier ("ip:port")
+        """
+        self.lease_id = lease_id
+        self.proxy = proxy
+        self.key = key
+        self.acquired_at = time.monotonic()
+        self.released = False
+
+    def held_for(self) -> float:
+        """Get the seconds since the lease was acquired."""
+        return time.monotonic() - self.acquired_at
+
+    def __repr__(self) -> str:
+        return f"ProxyLease({self.key}, id={self.lease_id})"
+
+
+class LeaseTable:
+    """In-process lease bookkeeping; one lock makes acquire/release atomic across threads and asyncio tasks."""
+
+    # acquire/release only take an in-memory lock, so they are safe to call on the event loop
+    blocking = False
+
+    def __init__(self):
+        """Initialize an empty lease table."""
+        self._active: Dict[str, set] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def acquire(self, keys: List[str], max_users: int) -> Optional[Tuple[str, int]]:
+        """
+        Lease the least-loaded proxy with a free slot.
+
+        Args:
+            keys: Candidate proxy keys in preference order
+            max_users: Maximum concurrent leases per proxy (0 = unlimited)
+
+        Returns:
+            Tuple of (key, lease_id), or None if every candidate is full
+        """
+        with self._lock:
+            counts = {key: len(holders) for key, holders in self._active.items()}
+            key = pick_least_loaded(keys, counts, max_users)
+            if key is None:
+                return None
+
+            lease_id = next(self._ids)
+            self._active.setdefault(key, set()).add(lease_id)
+            return key, lease_id
+
+    def release(self, key: str, lease_id) -> bool:
+        """
+        Release a lease.
+
+        Returns:
+            True if the lease was active
+        """
+        with self._lock:
+            holders = self._active.get(key)
+            if not holders or lease_id not in holders:
+                return False
+            holders.discard(lease_id)
+            if not holders:
+                del self._active[key]
+            return True
+
+    def active_counts(self) -> Dict[str, int]:
+        """Get the number of active leases per proxy key."""
+        with self._lock:
+            return {key: len(holders) for key, holders in self._active.items()}
+
+
+class SharedLeaseTable:
+    """
+    Lease bookkeeping shared by every process using the same SQLite file.
+
+    Each acquire runs in an immediate (write-locked) transaction, so two
+    processes can never both take a proxy's last slot. Leases record the
+    holder's pid and an expiry; leases of dead processes and expired leases
+    are reclaimed on the next acquire.
+    """
+
+    # acquire/release may wait on another process's write lock; async callers run them in a thread
+    blocking = True
+
+    def __init__(self, db_path: str = 'proxy_leases.db', lease_ttl: float = 3600):
+        """
+        Initialize the shared lease table.
+
+        Args:
+            db_path: SQLite database file shared by the processes
+            lease_ttl: Seconds after which an unreleased lease is reclaimed
+        """
+        self.db_path = db_path
+        self.lease_ttl = lease_ttl
+        self.logger = logging.getLogger(__name__)
+        self._local = threading.local()
+
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS leases ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, proxy TEXT NOT NULL, '
+                'pid INTEGER NOT NULL, expires_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS leases_proxy ON leases (proxy)')
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection (SQLite connections must not be shared between threads)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        """Check whether a process exists."""
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        except OSError:
+            return False
+        return True
+
+    def _reclaim(self, conn: sqlite3.Connection, now: float) -> None:
+        """Delete expired leases and leases held by processes that no longer exist (transaction held)."""
+        conn.execute('DELETE FROM leases WHERE expires_at < ?', (now,))
+        pids = [row[0] for row in conn.execute('SELECT DISTINCT pid FROM leases WHERE pid != ?', (os.getpid(),))]
+        for pid in pids:
+            if not self._pid_alive(pid):
+                deleted = conn.execute('DELETE FROM leases WHERE pid = ?', (pid,)).rowcount
+                self.logger.info(f"Reclaimed {deleted} proxy leases of exited process {pid}")
+
+    def acquire(self, keys: List[str], max_users: int) -> Optional[Tuple[str, int]]:
+        """
+        Lease the least-loaded proxy with a free slot (see LeaseTable.acquire).
+
+        Returns:
+            Tuple of (key, lease_id), or None if every candidate is full
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._reclaim(conn, now)
+            counts = dict(conn.execute('SELECT proxy, COUNT(*) FROM leases GROUP BY proxy').fetchall())
+
+            key = pick_least_loaded(keys, counts, max_users)
+            if key is None:
+                conn.execute('COMMIT')
+                return None
+
+            cursor = conn.execute(
+                'INSERT INTO leases (proxy, pid, expires_at) VALUES (?, ?, ?)',
+                (key, os.getpid(), now + self.lease_ttl)
+            )
+            conn.execute('COMMIT')
+            return key, cursor.lastrowid
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def release(self, key: str, lease_id) -> bool:
+        """
+        Release a lease.
+
+        Returns:
+            True if the lease was active
+        """
+        conn = self._connect()
+        deleted = conn.execute('DELETE FROM leases WHERE id = ? AND proxy = ?', (lease_id, key)).rowcount
+        return deleted > 0
+
+    def active_counts(self) -> Dict[str, int]:
+        """Get the number of active leases per proxy key, across all processes."""
+        conn = self._connect()
+        rows = conn.execute(
+            'SELECT proxy, COUNT(*) FROM leases WHERE expires_at >= ? GROUP BY proxy', (time.time(),)
+        ).fetchall()
+        return dict(rows)
@@ -1,79 +1,257 @@
 """
 Proxy Manager Module
-Handles proxy rotation logic with sequential rotation after 14 requests or on failure.
+Handles proxy rotation after 14 requests or on failure, picking the next proxy
+by health (time-decayed success rate and latency) and skipping circuit-broken proxies.
+Concurrent users lease proxies instead, with a cap on users per proxy.
+The proxy file is hot-reloaded when it changes.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Optional
+import os
+import random
+import threading
+from typing import List, Dict, Optional, Set
+
+from modules.proxy_leases import LeaseTable, ProxyLease
 
 
 class ProxyManager:
     """Manages proxy rotation for the scraper."""
     
-    def __init__(self, proxy_file: str, rotation_threshold: int = 14):
+    def __init__(self, proxy_file: str, rotation_threshold: int = 14, health_monitor=None,
+                 weighted_rotation: bool = True, max_users_per_proxy: int = 0, lease_table=None):
         """
         Initialize the ProxyManager.
         
         Args:
             proxy_file: Path to the proxy file (IP:PORT:USER:PASS format)
             rotation_threshold: Number of requests before rotating (default: 14)
+            health_monitor: Optional ProxyHealthMonitor that receives request outcomes
+            weighted_rotation: Rotate by health and skip circuit-broken proxies
+                (needs health_monitor; otherwise rotation is sequential)
+            max_users_per_proxy: Maximum concurrent leases per proxy (0 = unlimited)
+            lease_table: LeaseTable (default, this process) or SharedLeaseTable (all processes)
         """
         self.proxy_file = proxy_file
         self.rotation_threshold = rotation_threshold
+        self.health_monitor = health_monitor
+        self.weighted_rotation = weighted_rotation and health_monitor is not None
+        self.max_users_per_proxy = max_users_per_proxy
+        self.lease_table = lease_table or LeaseTable()
         self.proxies: List[Dict] = []
         self.current_index = 0
         self.request_counter = 0
         self.logger = logging.getLogger(__name__)
         
+        # Guards current_index and request_counter (the rotation path may be shared by threads)
+        self._lock = threading.RLock()
+        
+        # Hot reload: removed proxies with leases still in flight, and the file's last (mtime, size)
+        self.draining: Dict[str, Dict] = {}
+        self._file_state = None
+        self._stop_watching = threading.Event()
+        
         # Load proxies on initialization
         self.load_proxies()
     
-    def load_proxies(self) -> List[Dict]:
+    def _read_proxy_file(self) -> Optional[List[Dict]]:
         """
-        Load proxies from the proxy file.
+        Parse the proxy file.
         Expected format: IP:PORT:USERNAME:PASSWORD (one per line)
         
         Returns:
-            List of proxy dictionaries
+            List of proxy dictionaries, or None if the file could not be read
         """
-        self.proxies = []
+        proxies = []
         
         try:
             with open(self.proxy_file, 'r') as f:
                 lines = f.readlines()
-            
-            for line in lines:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                
-                parts = line.split(':')
-                if len(parts) == 4:
-                    ip, port, username, password = parts
-                    proxy = {
-                        'server': f'http://{ip}:{port}',
-                        'username': username,
-                        'password': password,
-                        'ip': ip,
-                        'port': port
-                    }
-                    self.proxies.append(proxy)
-                else:
-                    self.logger.warning(f"Invalid proxy format: {line}")
-            
-            self.logger.info(f"Loaded {len(self.proxies)} proxies from {self.proxy_file}")
-            
-            if not self.proxies:
-                self.logger.error("No valid proxies loaded!")
-            
-            return self.proxies
-            
         except FileNotFoundError:
             self.logger.error(f"Proxy file not found: {self.proxy_file}")
-            return []
+            return None
         except Exception as e:
             self.logger.error(f"Error loading proxies: {e}")
+            return None
+        
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            
+            parts = line.split(':')
+            if len(parts) == 4:
+                ip, port, username, password = parts
+                proxy = {
+                    'server': f'http://{ip}:{port}',
+                    'username': username,
+                    'password': password,
+                    'ip': ip,
+                    'port': port
+                }
+                proxies.append(proxy)
+            else:
+                self.logger.warning(f"Invalid proxy format: {line}")
+        
+        return proxies
+    
+    def _file_signature(self) -> Optional[tuple]:
+        """Get the proxy file's (mtime, size), or None if it does not exist."""
+        try:
+            stat = os.stat(self.proxy_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def load_proxies(self) -> List[Dict]:
+        """
+        Load proxies from the proxy file.
+        Expected format: IP:PORT:USERNAME:PASSWORD (one per line)
+        
+        Returns:
+            List of proxy dictionaries
+        """
+        self._file_state = self._file_signature()
+        proxies = self._read_proxy_file()
+        self.proxies = proxies or []
+        if proxies is None:
             return []
+        
+        self.logger.info(f"Loaded {len(self.proxies)} proxies from {self.proxy_file}")
+        
+        if not self.proxies:
+            self.logger.error("No valid proxies loaded!")
+        
+        return self.proxies
+    
+    def reload_if_changed(self, probe=None) -> bool:
+        """
+        Reload the proxy file if its mtime or size changed since it was last read.
+        
+        Args:
+            probe: Optional callable run on the list of new proxies before they join the pool
+            
+        Returns:
+            True if the pool was swapped
+        """
+        signature = self._file_signature()
+        if signature is None or signature == self._file_state:
+            return False
+        self._file_state = signature
+        return self.reload(probe)
+    
+    def reload(self, probe=None) -> bool:
+        """
+        Re-read the proxy file and swap the pool in one step.
+        
+        New proxies are probed (when probe is given) before they join the pool.
+        Removed proxies leave the pool at once, so they get no new work, and are
+        kept as draining until their in-flight leases are released. A file that
+        parses to no proxies (e.g. caught mid-write) is ignored. The saved health
+        of a removed proxy is deleted once it has drained.
+        
+        Args:
+            probe: Optional callable run on the list of new proxies before they join the pool
+            
+        Returns:
+            True if the pool was swapped
+        """
+        new_proxies = self._read_proxy_file()
+        if not new_proxies:
+            self.logger.warning(f"Ignoring reload of {self.proxy_file}: no valid proxies in it")
+            return False
+        
+        # Drop duplicate lines, keeping the first
+        unique = {}
+        for proxy in new_proxies:
+            unique.setdefault(self.proxy_key(proxy), proxy)
+        
+        old = {self.proxy_key(proxy): proxy for proxy in self.proxies}
+        added = [proxy for key, proxy in unique.items() if key not in old]
+        removed = [proxy for key, proxy in old.items() if key not in unique]
+        changed = [key for key, proxy in unique.items() if key in old and proxy != old[key]]
+        if not added and not removed and not changed:
+            return False
+        
+        if added and probe:
+            try:
+                probe(added)
+            except Exception as e:
+                self.logger.warning(f"Could not probe new proxies: {e}")
+        
+        with self._lock:
+            current = self.proxies[self.current_index] if self.proxies else None
+            self.proxies = list(unique.values())
+            
+            current_key = self.proxy_key(current) if current else None
+            keys = [self.proxy_key(proxy) for proxy in self.proxies]
+            if current_key in keys:
+                self.current_index = keys.index(current_key)
+            else:
+                self.current_index = 0
+                if self.weighted_rotation:
+                    self.current_index = self._pick_weighted_index(-1)
+                self.reset_counter()
+            
+            for proxy in removed:
+                self.draining[self.proxy_key(proxy)] = proxy
+            for proxy in added:
+                self.draining.pop(self.proxy_key(proxy), None)
+        
+        self.logger.info(
+            f"Reloaded {self.proxy_file}: {len(self.proxies)} proxies "
+            f"(+{len(added)} added, -{len(removed)} removed, {len(changed)} updated)"
+        )
+        self._drop_drained()
+        return True
+    
+    def _drop_drained(self) -> None:
+        """Forget removed proxies whose in-flight leases have all been released, with their saved health."""
+        if not self.draining:
+            return
+        
+        active = self.lease_table.active_counts()
+        drained = []
+        with self._lock:
+            for key in list(self.draining):
+                if not active.get(key):
+                    del self.draining[key]
+                    drained.append(key)
+                    self.logger.info(f"Removed proxy {key} drained")
+        
+        # Once drained no outcome can arrive for the proxy, so its health is not re-saved
+        if self.health_monitor:
+            for key in drained:
+                self.health_monitor.forget(key)
+    
+    def watch(self, interval: float = 5, probe=None) -> threading.Thread:
+        """
+        Poll the proxy file for changes and hot-reload it in a background thread.
+        
+        Args:
+            interval: Seconds between checks
+            probe: Optional callable run on new proxies before they join the pool
+            
+        Returns:
+            The started daemon thread
+        """
+        def loop():
+            while not self._stop_watching.wait(interval):
+                try:
+                    self.reload_if_changed(probe)
+                    self._drop_drained()
+                except Exception as e:
+                    self.logger.error(f"Error reloading {self.proxy_file}: {e}")
+        
+        thread = threading.Thread(target=loop, name='proxy-file-watcher', daemon=True)
+        thread.start()
+        self.logger.info(f"Watching {self.proxy_file} for changes every {interval}s")
+        return thread
+    
+    def stop_watching(self) -> None:
+        """Stop the proxy file watcher."""
+        self._stop_watching.set()
     
     def get_next_proxy(self) -> Optional[Dict]:
         """
@@ -82,15 +260,84 @@ class ProxyManager:
         Returns:
             Proxy dictionary or None if no proxies available
         """
-        if not self.proxies:
-            self.logger.error("No proxies available")
-            return None
-        
-        proxy = self.proxies[self.current_index]
+        with self._lock:
+            if not self.proxies:
+                self.logger.error("No proxies available")
+                return None
+            
+            # Don't keep using a proxy whose circuit opened since it was picked
+            if self.weighted_rotation and not self.health_monitor.is_available(self.proxy_key(self.proxies[self.current_index])):
+                self._rotate()
+            
+            proxy = self.proxies[self.current_index]
         self.logger.info(f"Using proxy: {proxy['ip']}:{proxy['port']}")
         
         return proxy
     
+    @staticmethod
+    def proxy_key(proxy: Dict) -> str:
+        """Get the identifier of a proxy ("ip:port")."""
+        return f"{proxy['ip']}:{proxy['port']}"
+    
+    def select_proxy(self, proxy_key: str) -> bool:
+        """
+        Make a proxy the current one (e.g. the fastest after a pre-flight probe).
+        
+        Args:
+            proxy_key: Proxy identifier ("ip:port")
+            
+        Returns:
+            True if the proxy was found
+        """
+        with self._lock:
+            for index, proxy in enumerate(self.proxies):
+                if self.proxy_key(proxy) == proxy_key:
+                    self.current_index = index
+                    self.reset_counter()
+                    return True
+        return False
+    
+    def _current_proxy(self) -> Optional[Dict]:
+        """Get the current proxy, reading the list and index together (a reload swaps both)."""
+        with self._lock:
+            if not self.proxies:
+                return None
+            return self.proxies[self.current_index]
+    
+    def record_success(self, proxy: Optional[Dict] = None, latency: Optional[float] = None) -> None:
+        """
+        Record a successful request through a proxy.
+        
+        Args:
+            proxy: The proxy used (optional, uses current if not provided)
+            latency: Seconds the request took, if measured
+        """
+        proxy = proxy or self._current_proxy()
+        if self.health_monitor and proxy:
+            self.health_monitor.record_success(self.proxy_key(proxy), latency)
+    
+    def record_captcha(self, proxy: Optional[Dict] = None) -> None:
+        """
+        Record a CAPTCHA served through a proxy.
+        
+        Args:
+            proxy: The proxy used (optional, uses current if not provided)
+        """
+        proxy = proxy or self._current_proxy()
+        if self.health_monitor and proxy:
+            self.health_monitor.record_captcha(self.proxy_key(proxy))
+    
+    def record_failure(self, proxy: Optional[Dict] = None) -> None:
+        """
+        Record a failed request through a proxy without rotating.
+        
+        Args:
+            proxy: The proxy used (optional, uses current if not provided)
+        """
+        proxy = proxy or self._current_proxy()
+        if self.health_monitor and proxy:
+            self.health_monitor.record_failure(self.proxy_key(proxy))
+    
     def should_rotate(self) -> bool:
         """
         Check if proxy should be rotated based on request counter.
@@ -110,34 +357,41 @@ class ProxyManager:
         if proxy:
             self.logger.warning(f"Proxy failed: {proxy['ip']}:{proxy['port']}")
         else:
-            current_proxy = self.proxies[self.current_index] if self.proxies else None
+            current_proxy = self._current_proxy()
             if current_proxy:
                 self.logger.warning(f"Current proxy failed: {current_proxy['ip']}:{current_proxy['port']}")
         
+        self.record_failure(proxy)
+        
         # Rotate to next proxy immediately
-        self._rotate()
+        with self._lock:
+            self._rotate()
     
     def increment_counter(self) -> None:
         """
         Increment the request counter and rotate if threshold is reached.
         """
-        self.request_counter += 1
-        self.logger.debug(f"Request counter: {self.request_counter}/{self.rotation_threshold}")
-        
-        if self.should_rotate():
-            self.logger.info(f"Rotation threshold ({self.rotation_threshold}) reached")
-            self._rotate()
+        with self._lock:
+            self.request_counter += 1
+            self.logger.debug(f"Request counter: {self.request_counter}/{self.rotation_threshold}")
+            
+            if self.should_rotate():
+                self.logger.info(f"Rotation threshold ({self.rotation_threshold}) reached")
+                self._rotate()
     
     def _rotate(self) -> None:
         """
-        Internal method to rotate to the next proxy in the list.
-        Cycles back to the first proxy after reaching the end.
+        Internal method to rotate to the next proxy.
+        Without a health monitor, cycles through the list in order.
         """
         if not self.proxies:
             return
         
         old_index = self.current_index
-        self.current_index = (self.current_index + 1) % len(self.proxies)
+        if self.weighted_rotation:
+            self.current_index = self._pick_weighted_index(old_index)
+        else:
+            self.current_index = (self.current_index + 1) % len(self.proxies)
         self.reset_counter()
         
         old_proxy = self.proxies[old_index]
@@ -148,6 +402,165 @@ class ProxyManager:
             f"{new_proxy['ip']}:{new_proxy['port']}"
         )
     
+    def _pick_weighted_index(self, exclude_index: int) -> int:
+        """
+        Pick a proxy at random, weighted by health, among proxies whose circuit is not open.
+        
+        Args:
+            exclude_index: Index of the proxy being rotated away from (picked only if nothing else is available)
+            
+        Returns:
+            Index of the next proxy
+        """
+        available = [
+            index for index, proxy in enumerate(self.proxies)
+            if self.health_monitor.is_available(self.proxy_key(proxy))
+        ]
+        candidates = [index for index in available if index != exclude_index] or available
+        
+        if not candidates:
+            # Every circuit is open: use the proxy that comes out of cooldown first
+            index = min(range(len(self.proxies)), key=lambda i: self.health_monitor.retry_at(self.proxy_key(self.proxies[i])))
+            self.logger.warning("All proxies are circuit-broken - using the one closest to the end of its cooldown")
+            return index
+        
+        weights = [self.health_monitor.get_weight(self.proxy_key(self.proxies[index])) for index in candidates]
+        return random.choices(candidates, weights=weights)[0]
+    
+    def _lease_order(self, exclude: Optional[Set[str]] = None) -> List[str]:
+        """
+        Get the proxy keys to lease from, in preference order.
+        
+        Proxies with an open circuit are left out (unless every proxy is open);
+        the rest are shuffled weighted by health, so ties between equally
+        loaded proxies go to healthier ones without starving the others.
+        
+        Args:
+            exclude: Proxy keys not to lease (e.g. the one the caller already uses)
+            
+        Returns:
+            List of proxy keys
+        """
+        keys = [self.proxy_key(proxy) for proxy in self.proxies]
+        keys = [key for key in keys if key not in (exclude or ())]
+        if not self.weighted_rotation:
+            random.shuffle(keys)
+            return keys
+        
+        available = [key for key in keys if self.health_monitor.is_available(key)]
+        if not available:
+            return sorted(keys, key=self.health_monitor.retry_at)
+        
+        # Weighted random order: sort by u^(1/weight)
+        return sorted(
+            available,
+            key=lambda key: random.random() ** (1 / max(self.health_monitor.get_weight(key), 1e-6)),
+            reverse=True
+        )
+    
+    def lease(self, exclude: Optional[Set[str]] = None, proxy: Optional[Dict] = None) -> Optional[ProxyLease]:
+        """
+        Lease the least-loaded proxy that has a free slot.
+        
+        Safe to call from several threads and asyncio tasks (and processes,
+        with a SharedLeaseTable). Every lease must be given back with release().
+        
+        Args:
+            exclude: Proxy keys not to lease
+            proxy: Lease this proxy only (e.g. the one the rotation picked)
+            
+        Returns:
+            ProxyLease, or None if every proxy is at max_users_per_proxy
+        """
+        proxies = {self.proxy_key(p): p for p in self.proxies}
+        keys = [self.proxy_key(proxy)] if proxy else self._lease_order(exclude)
+        if proxy:
+            proxies[keys[0]] = proxy
+        acquired = self.lease_table.acquire(keys, self.max_users_per_proxy)
+        if not acquired:
+            return None
+        
+        key, lease_id = acquired
+        self.logger.debug(f"Leased proxy {key} (lease {lease_id})")
+        return ProxyLease(lease_id, proxies[key], key)
+    
+    async def lease_async(self, exclude: Optional[Set[str]] = None, timeout: Optional[float] = None,
+                          poll_interval: float = 0.1, proxy: Optional[Dict] = None) -> Optional[ProxyLease]:
+        """
+        Lease a proxy, waiting for a free slot.
+        
+        A shared (SQLite) lease table is queried in a worker thread, so waiting
+        on another process's write lock does not stall the event loop.
+        
+        Args:
+            exclude: Proxy keys not to lease
+            timeout: Seconds to wait at most (None = wait indefinitely, 0 = try once)
+            poll_interval: Seconds between attempts
+            proxy: Lease this proxy only
+            
+        Returns:
+            ProxyLease, or None on timeout
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        while True:
+            if self.lease_table.blocking:
+                lease = await asyncio.to_thread(self.lease, exclude, proxy)
+            else:
+                lease = self.lease(exclude, proxy)
+            if lease or not self.proxies:
+                return lease
+            if deadline is not None and loop.time() >= deadline:
+                return None
+            await asyncio.sleep(poll_interval)
+    
+    def release(self, lease: ProxyLease, success: Optional[bool] = None, latency: Optional[float] = None) -> None:
+        """
+        Give a leased proxy back and report how it did.
+        
+        Args:
+            lease: Lease returned by lease() or lease_async()
+            success: True/False records the outcome with the health monitor (None = no outcome)
+            latency: Seconds the work took (successes)
+        """
+        if lease.released:
+            return
+        lease.released = True
+        if not self.lease_table.release(lease.key, lease.lease_id):
+            self.logger.debug(f"Lease {lease.lease_id} on {lease.key} was already reclaimed")
+        
+        if success is True:
+            self.record_success(lease.proxy, latency)
+        elif success is False:
+            self.record_failure(lease.proxy)
+        
+        # After the outcome, so a drained proxy's health is not recorded again once forgotten
+        if lease.key in self.draining:
+            self._drop_drained()
+    
+    async def release_async(self, lease: ProxyLease, success: Optional[bool] = None,
+                            latency: Optional[float] = None) -> None:
+        """
+        Give a leased proxy back from a coroutine (see release), off the event loop for a shared lease table.
+        
+        Args:
+            lease: Lease returned by lease() or lease_async()
+            success: True/False records the outcome with the health monitor (None = no outcome)
+            latency: Seconds the work took (successes)
+        """
+        if self.lease_table.blocking:
+            await asyncio.to_thread(self.release, lease, success, latency)
+        else:
+            self.release(lease, success, latency)
+    
+    def get_lease_stats(self) -> Dict:
+        """Get active leases per proxy for status reporting."""
+        return {
+            'max_users_per_proxy': self.max_users_per_proxy,
+            'active': self.lease_table.active_counts(),
+            'draining': sorted(self.draining)
+        }
+    
     def reset_counter(self) -> None:
         """
         Reset the request counter to 0.
@@ -163,10 +576,10 @@ class ProxyManager:
         Returns:
             String like "IP:PORT" or "No proxy" if none available
         """
-        if not self.proxies:
+        proxy = self._current_proxy()
+        if not proxy:
             return "No proxy"
         
-        proxy = self.proxies[self.current_index]
         return f"{proxy['ip']}:{proxy['port']}"
     
     def get_proxy_count(self) -> int:
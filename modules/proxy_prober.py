@@ -0,0 +1,193 @@
+"""
+Proxy Prober Module
+Concurrent pre-flight checks of every proxy (connect, auth, latency to a target) at startup and on a schedule.
+"""
+
+import asyncio
+import base64
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class ProxyProber:
+    """Probes proxies in parallel with an HTTP CONNECT to a target and reports results to the health monitor."""
+
+    def __init__(self, health_monitor=None, target: str = 'www.google.com:443',
+                 timeout: float = 10, max_concurrent: int = 50, slow_latency: Optional[float] = None):
+        """
+        Initialize the prober.
+
+        Args:
+            health_monitor: Optional ProxyHealthMonitor receiving each result
+                (passing proxies are ranked by latency, failing ones quarantined)
+            target: host:port the proxy must open a tunnel to
+            timeout: Seconds allowed per probe (connect + CONNECT response)
+            max_concurrent: Maximum probes in flight
+            slow_latency: Probes slower than this many seconds count as failed (None = no limit)
+        """
+        self.health_monitor = health_monitor
+        self.target = target
+        self.timeout = timeout
+        self.max_concurrent = max_concurrent
+        self.slow_latency = slow_latency
+        self.logger = logging.getLogger(__name__)
+
+        self.runs = 0
+        self.last_run: Optional[Dict] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    @staticmethod
+    def proxy_key(proxy: Dict) -> str:
+        """Get the identifier of a proxy ("ip:port")."""
+        return f"{proxy['ip']}:{proxy['port']}"
+
+    def _connect_request(self, proxy: Dict) -> bytes:
+        """Build the CONNECT request for the target, with proxy credentials if any."""
+        lines = [f'CONNECT {self.target} HTTP/1.1', f'Host: {self.target}']
+        if proxy.get('username'):
+            credentials = f"{proxy['username']}:{proxy.get('password', '')}".encode('utf-8')
+            lines.append(f"Proxy-Authorization: Basic {base64.b64encode(credentials).decode('ascii')}")
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('ascii')
+
+    async def probe(self, proxy: Dict) -> Dict:
+        """
+        Probe one proxy.
+
+        Opens a TCP connection to the proxy and asks it to tunnel to the target.
+        A 200 means the proxy is reachable, accepted the credentials and could
+        reach the target; 407 means the credentials were rejected.
+
+        Args:
+            proxy: Proxy dictionary (ip, port, username, password)
+
+        Returns:
+            Dictionary with 'proxy' (key), 'ok', 'latency', 'connect_latency' and 'error'
+        """
+        result = {'proxy': self.proxy_key(proxy), 'ok': False, 'latency': None, 'connect_latency': None, 'error': None}
+        started = time.monotonic()
+        writer = None
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(proxy['ip'], int(proxy['port'])), timeout=self.timeout
+            )
+            result['connect_latency'] = round(time.monotonic() - started, 3)
+
+            writer.write(self._connect_request(proxy))
+            await writer.drain()
+            remaining = max(0.1, self.timeout - (time.monotonic() - started))
+            status_line = await asyncio.wait_for(reader.readline(), timeout=remaining)
+            result['latency'] = round(time.monotonic() - started, 3)
+
+            parts = status_line.decode('latin-1').split()
+            status = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+            if status == 200:
+                result['ok'] = True
+            elif status == 407:
+                result['error'] = 'auth_failed'
+            elif status is None:
+                result['error'] = 'bad_response'
+            else:
+                result['error'] = f'http_{status}'
+        except asyncio.TimeoutError:
+            result['error'] = 'timeout'
+        except (OSError, ValueError) as e:
+            result['error'] = 'connect_failed'
+            self.logger.debug(f"Probe of {result['proxy']} failed: {e}")
+        finally:
+            if writer:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except Exception:
+                    pass
+
+        if result['ok'] and self.slow_latency is not None and result['latency'] > self.slow_latency:
+            result['ok'] = False
+            result['error'] = 'slow'
+        return result
+
+    async def probe_all(self, proxies: List[Dict]) -> List[Dict]:
+        """
+        Probe all proxies concurrently and report the results to the health monitor.
+
+        Args:
+            proxies: Proxy dictionaries
+
+        Returns:
+            Results ranked best first: passing proxies by latency, then failing ones
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        started = time.monotonic()
+
+        async def bounded(proxy):
+            async with semaphore:
+                return await self.probe(proxy)
+
+        results = await asyncio.gather(*(bounded(proxy) for proxy in proxies))
+
+        if self.health_monitor:
+            for result in results:
+                self.health_monitor.record_probe(result['proxy'], result['ok'], result['latency'], result['error'] or '')
+
+        ranked = sorted(results, key=lambda r: (not r['ok'], r['latency'] if r['latency'] is not None else float('inf')))
+        healthy = sum(1 for r in results if r['ok'])
+        errors: Dict[str, int] = {}
+        for result in results:
+            if result['error']:
+                errors[result['error']] = errors.get(result['error'], 0) + 1
+
+        with self._lock:
+            self.runs += 1
+            self.last_run = {
+                'at': time.time(),
+                'duration': round(time.monotonic() - started, 2),
+                'probed': len(results),
+                'healthy': healthy,
+                'quarantined': len(results) - healthy,
+                'errors': errors,
+                'fastest': [r['proxy'] for r in ranked[:5] if r['ok']]
+            }
+
+        self.logger.info(
+            f"Proxy probe: {healthy}/{len(results)} healthy in {self.last_run['duration']}s"
+            + (f" (failed: {errors})" if errors else '')
+        )
+        return ranked
+
+    def run_periodic(self, get_proxies, interval: float) -> threading.Thread:
+        """
+        Re-probe all proxies every interval seconds in a background thread.
+
+        Args:
+            get_proxies: Callable returning the current proxy list
+            interval: Seconds between probe runs
+
+        Returns:
+            The started daemon thread
+        """
+        def loop():
+            while not self._stop.wait(interval):
+                try:
+                    asyncio.run(self.probe_all(list(get_proxies())))
+                except Exception as e:
+                    self.logger.error(f"Scheduled proxy probe failed: {e}")
+
+        thread = threading.Thread(target=loop, name='proxy-prober', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        """Stop the periodic probe thread."""
+        self._stop.set()
+
+    def get_stats(self) -> Dict:
+        """Get the summary of the last probe run for status reporting."""
+        with self._lock:
+            return {
+                'target': self.target,
+                'runs': self.runs,
+                'last_run': dict(self.last_run) if self.last_run else None
+            }
@@ -0,0 +1,143 @@
+"""
+Proxy Time Series Module
+Per-proxy, per-minute metrics (success rate, latency percentiles, bytes, CAPTCHAs) in a fixed-size
+ring buffer, read incrementally with a cursor.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Get the nearest-rank percentile of a list of values (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class ProxyTimeSeries:
+    """
+    Aggregates proxy events into one bucket per proxy per interval.
+
+    A bucket is closed into a sample once its interval has passed. Samples get
+    an increasing sequence number (the cursor) and go into one ring buffer
+    shared by all proxies, so memory stays bounded by the buffer capacity plus
+    the currently open buckets, however long the service runs.
+    """
+
+    def __init__(self, interval: float = 60, capacity: int = 10000,
+                 max_latency_samples: int = 500, clock=time.time):
+        """
+        Initialize the time series.
+
+        Args:
+            interval: Bucket length in seconds
+            capacity: Closed samples kept (oldest are dropped first)
+            max_latency_samples: Latencies kept per open bucket for percentiles
+            clock: Time source (wall-clock seconds)
+        """
+        self.interval = interval
+        self.capacity = capacity
+        self.max_latency_samples = max_latency_samples
+        self.clock = clock
+
+        self.samples: deque = deque(maxlen=capacity)
+        self.open_buckets: Dict[str, Dict] = {}
+        self.sequence = 0
+        self._lock = threading.Lock()
+
+    def _bucket_start(self, now: float) -> float:
+        """Get the start of the interval containing a time."""
+        return now - now % self.interval
+
+    def _close_due(self, now: float) -> None:
+        """Close every open bucket whose interval has passed (lock held)."""
+        current = self._bucket_start(now)
+        due = sorted(
+            (bucket['start'], key) for key, bucket in self.open_buckets.items() if bucket['start'] < current
+        )
+        for _, key in due:
+            bucket = self.open_buckets.pop(key)
+            latencies = bucket.pop('_latencies')
+            outcomes = bucket['success'] + bucket['failure']
+            self.sequence += 1
+            self.samples.append(dict(
+                bucket,
+                seq=self.sequence,
+                proxy=key,
+                success_rate=round(bucket['success'] / outcomes * 100, 1) if outcomes else None,
+                latency_p50=percentile(latencies, 50),
+                latency_p95=percentile(latencies, 95)
+            ))
+
+    def _bucket(self, key: str, now: float) -> Dict:
+        """Get a proxy's open bucket for the current interval (lock held)."""
+        self._close_due(now)
+        bucket = self.open_buckets.get(key)
+        if bucket is None:
+            bucket = self.open_buckets[key] = {
+                'start': self._bucket_start(now),
+                'success': 0,
+                'failure': 0,
+                'captchas': 0,
+                'bytes': 0,
+                '_latencies': []
+            }
+        return bucket
+
+    def record_request(self, key: str, ok: bool, latency: Optional[float] = None) -> None:
+        """
+        Record a request outcome.
+
+        Args:
+            key: Proxy identifier ("ip:port")
+            ok: Whether the request succeeded
+            latency: Seconds the request took, if measured
+        """
+        with self._lock:
+            bucket = self._bucket(key, self.clock())
+            bucket['success' if ok else 'failure'] += 1
+            if latency is not None and len(bucket['_latencies']) < self.max_latency_samples:
+                bucket['_latencies'].append(round(latency, 3))
+
+    def record_captcha(self, key: str) -> None:
+        """Record a CAPTCHA served through a proxy."""
+        with self._lock:
+            self._bucket(key, self.clock())['captchas'] += 1
+
+    def record_bytes(self, key: str, count: int) -> None:
+        """Record bytes sent and received through a proxy."""
+        with self._lock:
+            self._bucket(key, self.clock())['bytes'] += count
+
+    def get_samples(self, since: int = 0, proxy: Optional[str] = None) -> Dict:
+        """
+        Get the closed samples newer than a cursor.
+
+        Args:
+            since: Cursor from the previous call (0 = everything still buffered)
+            proxy: Only return samples of this proxy
+
+        Returns:
+            Dictionary with 'samples' (oldest first), 'cursor' for the next call,
+            'interval', and 'truncated' (samples after the cursor were already dropped)
+        """
+        with self._lock:
+            self._close_due(self.clock())
+            newer = []
+            for sample in reversed(self.samples):
+                if sample['seq'] <= since:
+                    break
+                if proxy is None or sample['proxy'] == proxy:
+                    newer.append(sample)
+            oldest = self.samples[0]['seq'] if self.samples else self.sequence + 1
+            return {
+                'samples': newer[::-1],
+                'cursor': self.sequence,
+                'interval': self.interval,
+                'truncated': 0 < since < self.sequence and since + 1 < oldest
+            }
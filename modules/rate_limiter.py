@@ -0,0 +1,158 @@
+"""
+Rate Limiter Module
+Per-proxy token buckets (requests per second plus burst) applied to every navigation,
+in-process or shared between worker processes through SQLite.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict
+
+
+class ProxyRateLimiter:
+    """One token bucket per proxy; callers wait only for their own proxy's bucket."""
+
+    # reserve only takes an in-memory lock, so it is safe to call on the event loop
+    blocking = False
+
+    def __init__(self, rate: float = 0.5, burst: int = 5, clock=time.monotonic):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate: Tokens (navigations) added per second per proxy
+            burst: Bucket size: navigations a rested proxy may make back to back
+            clock: Time source (seconds)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        # proxy key -> [tokens, last refill time]
+        self.buckets: Dict[str, list] = {}
+        self.stats: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key: str) -> float:
+        """
+        Take a token from a proxy's bucket, going into debt if it is empty.
+
+        Reserving instead of polling keeps waiters in arrival order: each caller
+        gets the next free slot and sleeps exactly until then.
+
+        Args:
+            key: Proxy identifier ("ip:port")
+
+        Returns:
+            Seconds to wait before navigating (0 if a token was available)
+        """
+        with self._lock:
+            now = self.clock()
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = [float(self.burst), now]
+
+            bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            bucket[0] -= 1
+            return -bucket[0] / self.rate if bucket[0] < 0 else 0.0
+
+    def _record_wait(self, key: str, wait: float) -> None:
+        """Count a navigation and the time it waited."""
+        with self._lock:
+            stats = self.stats.setdefault(key, {'navigations': 0, 'throttled': 0, 'waited': 0.0})
+            stats['navigations'] += 1
+            if wait > 0:
+                stats['throttled'] += 1
+                stats['waited'] += wait
+
+    async def acquire(self, key: str) -> float:
+        """
+        Wait until the proxy may navigate.
+
+        Args:
+            key: Proxy identifier ("ip:port")
+
+        Returns:
+            Seconds waited
+        """
+        if self.blocking:
+            wait = await asyncio.to_thread(self.reserve, key)
+        else:
+            wait = self.reserve(key)
+        self._record_wait(key, wait)
+        if wait > 0:
+            self.logger.debug(f"Rate limit: waiting {wait:.2f}s for proxy {key}")
+            await asyncio.sleep(wait)
+        return wait
+
+    def get_stats(self) -> Dict:
+        """Get per-proxy navigation and wait counters for status reporting."""
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'burst': self.burst,
+                'proxies': {
+                    key: dict(stats, waited=round(stats['waited'], 2))
+                    for key, stats in self.stats.items()
+                }
+            }
+
+
+class SharedProxyRateLimiter(ProxyRateLimiter):
+    """
+    Token buckets kept in a SQLite file, so every worker process using the same
+    proxy draws from one bucket. Each reservation is one immediate (write-locked)
+    transaction; bucket times are wall-clock so processes agree on them.
+    """
+
+    # reserve may wait on another process's write lock, so acquire runs it in a thread
+    blocking = True
+
+    def __init__(self, db_path: str = 'rate_limits.db', rate: float = 0.5, burst: int = 5):
+        """
+        Initialize the shared rate limiter.
+
+        Args:
+            db_path: SQLite database file shared by the processes
+            rate: Tokens (navigations) added per second per proxy
+            burst: Bucket size
+        """
+        super().__init__(rate=rate, burst=burst, clock=time.time)
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connect().execute(
+            'CREATE TABLE IF NOT EXISTS buckets (proxy TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)'
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection (SQLite connections must not be shared between threads)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def reserve(self, key: str) -> float:
+        """Take a token from the shared bucket (see ProxyRateLimiter.reserve)."""
+        conn = self._connect()
+        now = self.clock()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated_at FROM buckets WHERE proxy = ?', (key,)).fetchone()
+            tokens, updated_at = row if row else (float(self.burst), now)
+            tokens = min(float(self.burst), tokens + max(0.0, now - updated_at) * self.rate) - 1
+            conn.execute(
+                'INSERT OR REPLACE INTO buckets (proxy, tokens, updated_at) VALUES (?, ?, ?)',
+                (key, tokens, max(now, updated_at))
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return -tokens / self.rate if tokens < 0 else 0.0
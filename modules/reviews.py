@@ -0,0 +1,351 @@
+"""
+Reviews Module
+Streams reviews from a place's reviews pane with bounded memory, a per-place cap and resumption.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional
+
+from modules.data_extractor import DataExtractor
+
+
+REVIEWS_TAB_SELECTORS = [
+    'button[role="tab"][aria-label*="Reviews" i]',
+    'button[jsaction*="moreReviews"]',
+    'button[aria-label*="reviews" i]'
+]
+
+# Expands, reads and removes the reviews currently in the DOM.
+# The last review is kept as a layout anchor so the pane keeps loading more on scroll.
+HARVEST_REVIEWS_JS = """() => {
+    const nodes = Array.from(document.querySelectorAll('div[data-review-id][aria-label]'));
+    const reviews = [];
+    nodes.forEach((node, index) => {
+        const more = node.querySelector('button[aria-expanded="false"][jsaction*="review.expandReview"], button.w8nwRe');
+        if (more) more.click();
+        const text = (sel) => {
+            const el = node.querySelector(sel);
+            return el ? el.innerText.trim() : '';
+        };
+        const stars = node.querySelector('[role="img"][aria-label*="star" i]');
+        reviews.push({
+            review_id: node.getAttribute('data-review-id'),
+            author: node.getAttribute('aria-label') || '',
+            rating_label: stars ? stars.getAttribute('aria-label') : text('.fzvQIb'),
+            date: text('.rsqaWe') || text('.xRkPPb'),
+            text: text('.wiI7pd'),
+            owner_response: text('.CDe7pd .wiI7pd')
+        });
+        if (index < nodes.length - 1) node.remove();
+    });
+    return reviews;
+}"""
+
+SCROLL_REVIEWS_JS = """() => {
+    const review = document.querySelector('div[data-review-id]');
+    let el = review ? review.parentElement : null;
+    while (el && el.scrollHeight <= el.clientHeight) {
+        el = el.parentElement;
+    }
+    if (el) el.scrollTop = el.scrollHeight;
+}"""
+
+
+def job_fingerprint(queries: List[Dict], options: Optional[Dict] = None) -> str:
+    """
+    Get an identifier for a reviews job: the same queries and review cap give the same ID,
+    so a job restarted after an interruption resumes from its checkpoints.
+
+    Args:
+        queries: The job's query dictionaries
+        options: The job's options ('max_reviews_per_place' is part of the identity)
+
+    Returns:
+        Hex digest identifying the job
+    """
+    identity = {
+        'queries': [{key: query.get(key, '') for key in ('keyword', 'zip_code', 'url')} for query in queries],
+        'max_reviews_per_place': (options or {}).get('max_reviews_per_place')
+    }
+    return hashlib.sha1(json.dumps(identity, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ReviewCheckpoints:
+    """
+    Per-place progress (last review seen, count) of the current job, persisted so an
+    interrupted job can resume. Progress belongs to one job: other jobs start every
+    place from the top, and a job's progress is dropped when it finishes or expires.
+    """
+
+    def __init__(self, checkpoint_file: Optional[str] = None, save_every: int = 50,
+                 max_age: float = 24 * 3600):
+        """
+        Initialize checkpoints.
+
+        Args:
+            checkpoint_file: JSON file to persist progress to (None keeps it in memory)
+            save_every: Save to disk after this many updates
+            max_age: Seconds after its last update that an unfinished job's progress is dropped
+        """
+        self.checkpoint_file = checkpoint_file
+        self.save_every = save_every
+        self.max_age = max_age
+        self.logger = logging.getLogger(__name__)
+
+        # {job_id: {'updated_at': float, 'places': {place_id: {...}}}}
+        self.jobs: Dict[str, Dict] = {}
+        self.job_id = ''
+        self._unsaved = 0
+        self._lock = threading.Lock()
+
+        self.load()
+
+    def start_job(self, job_id: Optional[str]) -> None:
+        """
+        Make a job current; get and update act on its progress.
+
+        Args:
+            job_id: Job identifier (see job_fingerprint), or None for an unnamed job
+        """
+        with self._lock:
+            self.job_id = job_id or ''
+            self._drop_expired()
+            job = self.jobs.get(self.job_id)
+            resumed = len(job['places']) if job else 0
+        if resumed:
+            self.logger.info(f"Resuming reviews job: {resumed} places have progress")
+
+    def finish_job(self) -> None:
+        """Drop the current job's progress (it completed, so there is nothing to resume)."""
+        with self._lock:
+            finished = self.jobs.pop(self.job_id, None)
+        if finished:
+            self.save()
+
+    def _drop_expired(self) -> None:
+        """Drop the progress of jobs not updated within max_age (lock held)."""
+        if not self.max_age:
+            return
+        cutoff = time.time() - self.max_age
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.get('updated_at', 0) < cutoff]:
+            del self.jobs[job_id]
+
+    def get(self, place_id: str) -> Optional[Dict]:
+        """Get the current job's progress for a place, or None if it was never started."""
+        with self._lock:
+            job = self.jobs.get(self.job_id)
+            checkpoint = job['places'].get(place_id) if job else None
+            return dict(checkpoint) if checkpoint else None
+
+    def update(self, place_id: str, review_id: str, count: int, done: bool = False) -> None:
+        """
+        Record the last review seen for a place in the current job.
+
+        Args:
+            place_id: Place identifier (CID or URL)
+            review_id: ID of the last review delivered
+            count: Reviews delivered for the place so far
+            done: True when the place reached its cap
+        """
+        now = time.time()
+        with self._lock:
+            job = self.jobs.setdefault(self.job_id, {'updated_at': now, 'places': {}})
+            job['updated_at'] = now
+            job['places'][place_id] = {
+                'last_review_id': review_id,
+                'count': count,
+                'done': done,
+                'updated_at': now
+            }
+            self._unsaved += 1
+            autosave = done or self._unsaved >= self.save_every
+
+        if autosave:
+            self.save()
+
+    def load(self) -> None:
+        """Load persisted progress, if any (progress of expired jobs is dropped)."""
+        if not self.checkpoint_file or not os.path.exists(self.checkpoint_file):
+            return
+
+        try:
+            with open(self.checkpoint_file, 'r') as f:
+                jobs = json.load(f).get('jobs', {})
+            with self._lock:
+                self.jobs = jobs
+                self._drop_expired()
+        except Exception as e:
+            self.logger.warning(f"Could not load review checkpoints: {e}")
+
+    def save(self) -> None:
+        """Persist progress to disk (atomic replace)."""
+        if not self.checkpoint_file:
+            return
+
+        try:
+            with self._lock:
+                self._drop_expired()
+                data = json.dumps({'jobs': self.jobs})
+                self._unsaved = 0
+            tmp_file = self.checkpoint_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                f.write(data)
+            os.replace(tmp_file, self.checkpoint_file)
+        except Exception as e:
+            self.logger.warning(f"Could not save review checkpoints: {e}")
+
+
+class ReviewsExtractor:
+    """Opens a place's reviews pane and yields reviews while scrolling, trimming parsed ones from the DOM."""
+
+    def __init__(self, checkpoints: Optional[ReviewCheckpoints] = None, max_per_place: int = 200,
+                 scroll_pause: float = 1.0, idle_rounds: int = 5, seen_window: int = 1000):
+        """
+        Initialize the extractor.
+
+        Args:
+            checkpoints: Optional progress store used for resumption
+            max_per_place: Maximum reviews delivered per place (0 = unlimited)
+            scroll_pause: Seconds to wait for more reviews after each scroll
+            idle_rounds: Consecutive scrolls without new reviews that end the stream
+            seen_window: Recent review IDs remembered to drop duplicates
+        """
+        self.checkpoints = checkpoints
+        self.max_per_place = max_per_place
+        self.scroll_pause = scroll_pause
+        self.idle_rounds = idle_rounds
+        self.seen_window = seen_window
+        self.logger = logging.getLogger(__name__)
+
+    async def open_reviews(self, page) -> bool:
+        """
+        Open the reviews pane of the place shown on the page.
+
+        Args:
+            page: Playwright page on a place detail page
+
+        Returns:
+            True if reviews are showing
+        """
+        for selector in REVIEWS_TAB_SELECTORS:
+            try:
+                await page.locator(selector).first.click(timeout=3000)
+                await page.wait_for_selector('div[data-review-id]', timeout=10000)
+                return True
+            except Exception:
+                continue
+        return False
+
+    @staticmethod
+    def parse_review(raw: Dict, place_id: str) -> Dict:
+        """
+        Parse the raw data read by HARVEST_REVIEWS_JS.
+
+        Args:
+            raw: Dictionary with review_id, author, rating_label, date, text, owner_response
+            place_id: Place identifier the review belongs to
+
+        Returns:
+            Review dictionary
+        """
+        return {
+            'place_id': place_id,
+            'review_id': raw.get('review_id', ''),
+            'author': (raw.get('author') or '').strip(),
+            'rating': DataExtractor.clean_rating(raw.get('rating_label') or ''),
+            'date': raw.get('date') or '',
+            'text': raw.get('text') or '',
+            'owner_response': raw.get('owner_response') or ''
+        }
+
+    async def stream_reviews(self, page, place_id: str,
+                             max_reviews: Optional[int] = None) -> AsyncIterator[Dict]:
+        """
+        Yield the reviews of the place shown on the page, one at a time.
+
+        Only reviews not yet in the DOM-trimmed window are kept in memory, so
+        memory stays flat regardless of the number of reviews. When the current
+        job has a checkpoint for the place, reviews up to and including the last
+        one seen are skipped; places that reached the cap in this job are skipped.
+
+        Args:
+            page: Playwright page on a place detail page
+            place_id: Place identifier (CID or URL) used for checkpoints
+            max_reviews: Per-place cap (defaults to max_per_place, 0 = unlimited)
+
+        Yields:
+            Review dictionaries
+        """
+        cap = self.max_per_place if max_reviews is None else max_reviews
+        checkpoint = self.checkpoints.get(place_id) if self.checkpoints else None
+        if checkpoint and (checkpoint.get('done') or (cap and checkpoint['count'] >= cap)):
+            self.logger.info(f"Reviews for {place_id} already at the cap in this job - skipping")
+            return
+
+        resume_after = checkpoint['last_review_id'] if checkpoint else None
+        skip_budget = checkpoint['count'] if checkpoint else 0
+        delivered = skip_budget
+        skipped = 0
+
+        if not await self.open_reviews(page):
+            self.logger.info(f"No reviews pane for {place_id}")
+            return
+
+        seen_ids = set()
+        seen_order = deque()
+        idle = 0
+        last_id = resume_after
+        done = False
+
+        try:
+            while idle < self.idle_rounds:
+                batch = await page.evaluate(HARVEST_REVIEWS_JS)
+                new_reviews = 0
+
+                for raw in batch:
+                    review_id = raw.get('review_id')
+                    if not review_id or review_id in seen_ids:
+                        continue
+                    seen_ids.add(review_id)
+                    seen_order.append(review_id)
+                    if len(seen_order) > self.seen_window:
+                        seen_ids.discard(seen_order.popleft())
+                    new_reviews += 1
+
+                    # Resuming: skip up to the last review seen. If it has disappeared,
+                    # fall back to skipping as many reviews as were delivered before.
+                    if resume_after:
+                        skipped += 1
+                        if review_id == resume_after or skipped >= skip_budget:
+                            resume_after = None
+                        continue
+
+                    delivered += 1
+                    last_id = review_id
+                    yield self.parse_review(raw, place_id)
+
+                    if cap and delivered >= cap:
+                        done = True
+                        return
+                    if self.checkpoints:
+                        self.checkpoints.update(place_id, last_id, delivered)
+
+                idle = 0 if new_reviews else idle + 1
+                await page.evaluate(SCROLL_REVIEWS_JS)
+                await asyncio.sleep(self.scroll_pause)
+            # An idle pane may be the end of the list or a stall: a resumed job
+            # scrolls past the delivered reviews again rather than trusting it
+        finally:
+            # Runs on completion, on the cap and when the consumer stops early
+            if self.checkpoints and last_id:
+                self.checkpoints.update(place_id, last_id, delivered, done=done)
+                if not done:
+                    self.checkpoints.save()
+            self.logger.info(f"Reviews for {place_id}: {delivered} delivered{' (cap reached)' if done else ''}")
@@ -9,7 +9,19 @@ from typing import Dict, List, Optional
 from playwright.async_api import async_playwright, Browser, Page, TimeoutError as PlaywrightTimeout
 
 from modules.proxy_manager import ProxyManager
-from modules.data_extractor import DataExtractor
+from modules.data_extractor import DataExtractor, RESULT_CARD_JS
+from modules.browser_supervisor import BrowserSupervisor
+from modules.place_fetcher import PlaceFetcher
+from modules.concurrency import AIMDController
+from modules.timeouts import AdaptiveTimeouts, OPERATION_BOUNDS
+from modules.hedging import HedgePolicy
+from modules.budgets import Budget
+from modules.session_store import SessionStore
+from modules.asset_cache import AssetCache
+from modules.bandwidth import BandwidthMeter
+from modules.reviews import ReviewsExtractor, ReviewCheckpoints
+from modules.rate_limiter import ProxyRateLimiter, SharedProxyRateLimiter
+from modules.page_archive import PageArchive
 
 
 class GoogleMapsScraper:
@@ -27,17 +39,341 @@ class GoogleMapsScraper:
         self.headless = headless
         self.playwright = None
         self.browser: Optional[Browser] = None
+        self.context = None
         self.page: Optional[Page] = None
+        self.current_proxy: Optional[Dict] = None
+        self.job_options: Dict = {}
+        self.business_filter = None
+        self.fields: Optional[List[str]] = None
+        self.extract_fields: Optional[List[str]] = None
+        self.filtered_out = 0
+        self.published_count = 0
+        # Tab limit of each wave of detail tabs in the current query
+        self.query_tab_limits: List[int] = []
+        self.query_budget: Optional[Budget] = None
+        self.job_budget: Optional[Budget] = None
+        self.stop_reason: Optional[str] = None
+        self.current_business: Optional[str] = None
+        self.review_callback = None
+        self.reviews_count = 0
         self.logger = logging.getLogger(__name__)
         
-        # Timeouts (Optimized for speed)
-        self.request_timeout = 15000  # 15 seconds (reduced from 30)
-        self.page_load_timeout = 30000  # 30 seconds (reduced from 60)
+        from config import Config
+        
+        # Timeouts derived from observed latency per operation and proxy
+        # (fixed defaults from OPERATION_BOUNDS when disabled)
+        self.timeouts = None
+        if getattr(Config, 'ADAPTIVE_TIMEOUTS', True):
+            self.timeouts = AdaptiveTimeouts(
+                percentile=getattr(Config, 'TIMEOUT_PERCENTILE', 99),
+                factor=getattr(Config, 'TIMEOUT_FACTOR', 2.0),
+                min_samples=getattr(Config, 'TIMEOUT_MIN_SAMPLES', 20)
+            )
+        
+        # Browser recycling and hung-tab watchdog
+        self.supervisor = BrowserSupervisor(
+            max_pages=getattr(Config, 'BROWSER_RECYCLE_PAGES', 150),
+            max_rss_mb=getattr(Config, 'BROWSER_RECYCLE_RSS_MB', 1500),
+            tab_deadline=getattr(Config, 'TAB_HARD_DEADLINE', 60)
+        )
+        
+        # Adaptive (AIMD) number of parallel tabs per proxy
+        self.concurrency = None
+        if getattr(Config, 'ADAPTIVE_CONCURRENCY', True):
+            self.concurrency = AIMDController(
+                initial=getattr(Config, 'PARALLEL_TABS', 5),
+                min_limit=getattr(Config, 'MIN_PARALLEL_TABS', 1),
+                max_limit=getattr(Config, 'MAX_PARALLEL_TABS', 10),
+                latency_target=getattr(Config, 'TAB_LATENCY_TARGET', 15)
+            )
+        
+        # Hedged detail tabs: duplicate a tab that runs past the p95 latency
+        self.hedging = None
+        self.hedge_context = None
+        self.hedge_proxy_key: Optional[str] = None
+        self.hedge_lease = None
+        self.proxy_lease = None
+        if getattr(Config, 'HEDGE_REQUESTS', False):
+            self.hedging = HedgePolicy(
+                percentile=getattr(Config, 'HEDGE_PERCENTILE', 95),
+                max_hedge_rate=getattr(Config, 'MAX_HEDGE_RATE', 0.1)
+            )
+        
+        # Per-proxy cookies/localStorage, so new browsers skip consent and warm-up pages
+        self.session_store = None
+        if getattr(Config, 'PERSIST_SESSIONS', True):
+            self.session_store = SessionStore(
+                directory=getattr(Config, 'SESSION_STATE_DIR', 'sessions'),
+                max_age=getattr(Config, 'SESSION_STATE_MAX_AGE', 6 * 3600)
+            )
+        
+        # Proxy bandwidth metering per proxy, query, job and business
+        self.bandwidth = None
+        if getattr(Config, 'BANDWIDTH_METERING', True):
+            self.bandwidth = BandwidthMeter(
+                cost_per_gb=getattr(Config, 'PROXY_COST_PER_GB', 0.0),
+                timeseries=getattr(getattr(proxy_manager, 'health_monitor', None), 'timeseries', None)
+            )
+        
+        # Static Maps assets served from a shared on-disk cache instead of the proxy
+        self.asset_cache = None
+        if getattr(Config, 'ASSET_CACHE', True):
+            try:
+                self.asset_cache = AssetCache(
+                    directory=getattr(Config, 'ASSET_CACHE_DIR', 'asset_cache'),
+                    max_bytes=getattr(Config, 'ASSET_CACHE_MAX_MB', 300) * 1024 * 1024
+                )
+            except Exception as e:
+                self.logger.warning(f"Asset cache disabled: {e}")
+        
+        # Per-proxy token buckets applied to every navigation (shared between worker processes if enabled)
+        self.rate_limiter = None
+        rate = getattr(Config, 'PROXY_RATE_LIMIT', 0)
+        if rate:
+            burst = getattr(Config, 'PROXY_RATE_BURST', 5)
+            if getattr(Config, 'SHARED_RATE_LIMITS', False):
+                self.rate_limiter = SharedProxyRateLimiter(
+                    db_path=getattr(Config, 'RATE_LIMIT_DB', 'rate_limits.db'), rate=rate, burst=burst
+                )
+            else:
+                self.rate_limiter = ProxyRateLimiter(rate=rate, burst=burst)
+        
+        # Archive mode: every business page is kept compressed for offline re-extraction
+        self.page_archive = None
+        if getattr(Config, 'ARCHIVE_PAGES', False):
+            self.page_archive = PageArchive(
+                directory=getattr(Config, 'PAGE_ARCHIVE_DIR', 'archive'),
+                max_segment_bytes=getattr(Config, 'PAGE_ARCHIVE_SEGMENT_MB', 256) * 1024 * 1024
+            )
+        
+        # Reviews mode: streamed per place with a cap and resumable checkpoints
+        self.reviews = ReviewsExtractor(
+            checkpoints=ReviewCheckpoints(
+                getattr(Config, 'REVIEWS_CHECKPOINT_FILE', None),
+                max_age=getattr(Config, 'REVIEWS_CHECKPOINT_MAX_AGE', 24 * 3600)
+            ),
+            max_per_place=getattr(Config, 'MAX_REVIEWS_PER_PLACE', 200),
+            scroll_pause=getattr(Config, 'REVIEWS_SCROLL_PAUSE', 1.0)
+        )
+        
+        # Lightweight fetch path for known business URLs
+        self.fast_place_fetch = getattr(Config, 'FAST_PLACE_FETCH', True)
+        self.place_fetcher = PlaceFetcher(timeout=getattr(Config, 'FAST_FETCH_TIMEOUT', 10))
+    
+    def set_job_options(self, options: Optional[Dict] = None, review_callback=None) -> None:
+        """
+        Set per-job options used by every query of the next job.
+        
+        Args:
+            options: Dictionary of job options (e.g. 'extraction_mode', 'filter')
+            review_callback: Optional callback receiving each review when the 'reviews' option is set
+        """
+        self.job_options = dict(options or {})
+        self.review_callback = review_callback
+        self.reviews_count = 0
+        self.business_filter = self.job_options.get('filter')
+        self.filtered_out = 0
+        
+        # Field projection: extract what the job asked for plus what the filter needs
+        self.fields = self.job_options.get('fields')
+        self.extract_fields = None
+        if self.fields is not None:
+            extract_fields = set(self.fields)
+            if self.business_filter:
+                extract_fields |= self.business_filter.required_fields()
+            self.extract_fields = sorted(extract_fields)
+        
+        # Budgets: the query budget restarts with every query, the job budget runs from here
+        self.query_budget = self.job_options.get('query_budget')
+        self.job_budget = self.job_options.get('job_budget')
+        if self.job_budget:
+            self.job_budget.start()
+        self.stop_reason = None
+        if self.bandwidth:
+            self.bandwidth.start_job()
+        if self.job_options.get('reviews') and self.reviews.checkpoints:
+            self.reviews.checkpoints.start_job(self.job_options.get('reviews_job'))
+    
+    def finish_job(self) -> None:
+        """Drop the review checkpoints of a job that ran to the end (they only resume interrupted jobs)."""
+        if self.job_options.get('reviews') and self.reviews.checkpoints:
+            self.reviews.checkpoints.finish_job()
+    
+    def _start_query(self, label: str) -> None:
+        """
+        Restart the per-query budget and bandwidth attribution at the beginning of a query.
+        
+        Args:
+            label: Query label used in reports
+        """
+        self.stop_reason = None
+        self.current_business = None
+        self.query_tab_limits = []
+        if self.query_budget:
+            self.query_budget.start()
+        if self.bandwidth:
+            self.bandwidth.start_query(label)
+    
+    def get_query_tabs(self) -> float:
+        """
+        Get the detail tab limit the current query ran with: the average over its waves of tabs
+        (it follows the adaptive controller), or 1 when it opened pages one at a time.
+        
+        Returns:
+            Average parallel tabs
+        """
+        if not self.query_tab_limits:
+            return 1
+        return round(sum(self.query_tab_limits) / len(self.query_tab_limits), 2)
+    
+    def _budgets(self) -> List[Budget]:
+        """Get the active budgets (query first)."""
+        return [budget for budget in (self.query_budget, self.job_budget) if budget]
+    
+    def _budget_exhausted(self) -> Optional[str]:
+        """
+        Check the query and job budgets.
+        
+        Returns:
+            The budget that ran out (e.g. 'query max_seconds'), or None
+        """
+        for budget in self._budgets():
+            reason = budget.check()
+            if reason:
+                if not self.stop_reason:
+                    self.stop_reason = reason
+                return reason
+        return None
+    
+    def _remaining_businesses(self) -> Optional[int]:
+        """Get how many more businesses the budgets allow, or None if unlimited."""
+        remaining = [budget.remaining_businesses() for budget in self._budgets()]
+        remaining = [count for count in remaining if count is not None]
+        return min(remaining) if remaining else None
+    
+    def _add_proxy_bytes(self, count: int) -> None:
+        """Count bytes transferred through the proxy against the budgets."""
+        for budget in self._budgets():
+            budget.add_bytes(count)
+    
+    def _meter_page(self, page, business: Optional[str] = None, proxy_key: Optional[str] = None) -> None:
+        """
+        Meter every finished request of a page (bandwidth accounting and byte budgets).
+        
+        Args:
+            page: Playwright page
+            business: Business the page's traffic belongs to; pages shared between
+                businesses (main page, email page) use current_business instead
+            proxy_key: Proxy the page's context uses (defaults to the current proxy)
+        """
+        if self.bandwidth is None and not any(budget.max_bytes for budget in self._budgets()):
+            return
+        proxy_key = proxy_key or self._proxy_key()
+        
+        async def on_request_finished(request):
+            await self._on_request_finished(request, proxy_key, business or self.current_business)
+        
+        page.on('requestfinished', on_request_finished)
+    
+    async def _on_request_finished(self, request, proxy_key: str, business: Optional[str]) -> None:
+        """Account a finished request's header and body sizes."""
+        if self.asset_cache and self.asset_cache.was_served(request):
+            return
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        sent = sizes.get('requestHeadersSize', 0) + sizes.get('requestBodySize', 0)
+        received = sizes.get('responseHeadersSize', 0) + sizes.get('responseBodySize', 0)
+        self._add_proxy_bytes(sent + received)
+        if self.bandwidth:
+            self.bandwidth.record(proxy_key, sent, received, url=request.url, business=business)
+    
+    def _budget_callback(self, csv_callback=None):
+        """
+        Wrap a results callback so every delivered business is counted against the budgets.
+        
+        Args:
+            csv_callback: Optional callback function to save each business incrementally
+            
+        Returns:
+            Callback to pass down the scraping path
+        """
+        def deliver(business_info):
+            for budget in self._budgets():
+                budget.add_business()
+            if csv_callback:
+                csv_callback(business_info)
+        return deliver
+    
+    def _needs_email(self, business_info: Dict) -> bool:
+        """Check whether the job wants an email and it must be harvested from the website."""
+        if self.fields is not None and 'email' not in self.fields:
+            return False
+        return (business_info.get('email') == 'Not given'
+                and business_info.get('website') not in (None, 'Not given'))
+    
+    def _project_fields(self, business_info: Dict) -> Dict:
+        """Keep only the fields requested by the job (plus the always-present ones)."""
+        if self.fields is None:
+            return business_info
+        
+        keep = set(self.fields) | set(DataExtractor.ALWAYS_FIELDS)
+        return {
+            field: business_info[field]
+            for field in DataExtractor.DETAIL_FIELDS
+            if field in keep and field in business_info
+        }
+    
+    def _passes_filter(self, data: Dict, partial: bool = False) -> bool:
+        """
+        Check business or result-card data against the job's filter predicates.
+        
+        Args:
+            data: Business info or parsed result card
+            partial: True for result-card data
+            
+        Returns:
+            True if the business should be kept
+        """
+        if not self.business_filter or self.business_filter.matches(data, partial=partial):
+            return True
+        
+        self.filtered_out += 1
+        self.logger.info(f"⏭️ Filtered out: {data.get('name') or data.get('url')}")
+        return False
+    
+    async def _collect_result_cards(self) -> List[Dict]:
+        """
+        Read every result card currently in the list in one round trip.
+        
+        Returns:
+            List of parsed card dictionaries (url, name, rating, review_count, category)
+        """
+        try:
+            raw_cards = await self.page.eval_on_selector_all(
+                'a[href*="/maps/place/"]', f"links => links.map({RESULT_CARD_JS})"
+            )
+        except Exception as e:
+            self.logger.debug(f"Could not read result cards: {e}")
+            return []
+        
+        return [DataExtractor.parse_result_card(card) for card in raw_cards]
+    
+    def _get_extraction_mode(self) -> str:
+        """Get the extraction mode for the current job ('tab' or 'panel')."""
+        from config import Config
+        mode = self.job_options.get('extraction_mode') or getattr(Config, 'EXTRACTION_MODE', 'tab')
+        return mode if mode in ('tab', 'panel') else 'tab'
     
     async def initialize_browser(self, proxy: Dict) -> bool:
         """
         Initialize Playwright browser with proxy configuration.
         
+        The browser runs under a lease on its proxy: the one taken by
+        _lease_browser_proxy() (kept when recycling on the same proxy), or a new
+        one. A proxy at its lease limit is not used.
+        
         Args:
             proxy: Proxy dictionary with server, username, password
             
@@ -48,10 +384,23 @@ class GoogleMapsScraper:
             if not self.playwright:
                 self.playwright = await async_playwright().start()
             
+            # Keep the lease on this proxy while the old browser closes
+            lease, self.proxy_lease = self.proxy_lease, None
+            if lease and lease.key != self._proxy_key(proxy):
+                await self.proxy_manager.release_async(lease)
+                lease = None
+            
             # Close existing browser if any
             if self.browser:
                 await self.close_browser()
             
+            if lease is None:
+                lease = await self.proxy_manager.lease_async(proxy=proxy, timeout=0)
+                if lease is None:
+                    self.logger.error(f"Proxy {self._proxy_key(proxy)} is at its lease limit - not launching a browser on it")
+                    return False
+            self.proxy_lease = lease
+            
             self.logger.info(f"Launching browser with proxy: {proxy.get('ip', 'unknown')}")
             
             # Launch browser with proxy
@@ -64,21 +413,77 @@ class GoogleMapsScraper:
                 }
             )
             
+            # One context per browser, shared by the main page and the detail tabs,
+            # starting from the proxy's saved session when there is a fresh one
+            storage_state = None
+            if self.session_store:
+                storage_state = self.session_store.load(self._proxy_key(proxy))
+            try:
+                self.context = await self.browser.new_context(
+                    viewport={'width': 1920, 'height': 1080},
+                    storage_state=storage_state
+                )
+            except Exception as e:
+                if storage_state is None:
+                    raise
+                self.logger.warning(f"Could not load saved session, starting cold: {e}")
+                self.session_store.invalidate(self._proxy_key(proxy))
+                self.context = await self.browser.new_context(
+                    viewport={'width': 1920, 'height': 1080}
+                )
+            
+            if self.asset_cache:
+                await self.asset_cache.attach(self.context)
+            
             # Create new page with viewport settings
-            self.page = await self.browser.new_page(
-                viewport={'width': 1920, 'height': 1080}
-            )
+            self.page = await self.context.new_page()
             
             # Set default timeout
-            self.page.set_default_timeout(self.page_load_timeout)
+            self.page.set_default_timeout(self._timeout('page_load'))
+            self._meter_page(self.page)
+            
+            self.current_proxy = proxy
+            self.supervisor.record_launch()
             
             self.logger.info("Browser initialized successfully")
             return True
             
         except Exception as e:
             self.logger.error(f"Failed to initialize browser: {e}")
+            await self._release_leases()
             return False
     
+    async def _lease_browser_proxy(self) -> Optional[Dict]:
+        """
+        Lease the proxy for the next browser.
+        
+        The rotation's current proxy is leased when it has a free slot; otherwise
+        the least-loaded other proxy, waiting up to PROXY_LEASE_WAIT seconds while
+        every proxy is at its lease limit. The lease is held until the browser closes.
+        
+        Returns:
+            The leased proxy, or None if there is none or no slot freed up in time
+        """
+        from config import Config
+        
+        # The browser being replaced gives its slot back first
+        await self.close_browser()
+        
+        proxy = self.proxy_manager.get_next_proxy()
+        if not proxy:
+            return None
+        
+        lease = await self.proxy_manager.lease_async(proxy=proxy, timeout=0)
+        if lease is None:
+            self.logger.info(f"Proxy {self._proxy_key(proxy)} is at its lease limit - leasing another one")
+            lease = await self.proxy_manager.lease_async(timeout=getattr(Config, 'PROXY_LEASE_WAIT', 300))
+            if lease is None:
+                self.logger.error("Every proxy is at its lease limit")
+                return None
+        
+        self.proxy_lease = lease
+        return lease.proxy
+    
     async def search_google_maps(self, keyword: str, zip_code: str) -> bool:
         """
         Navigate to Google Maps and perform a search.
@@ -100,7 +505,10 @@ class GoogleMapsScraper:
             
             # Navigate to Google Maps
             try:
-                await self.page.goto('https://www.google.com/maps', timeout=self.page_load_timeout)
+                await self._before_navigation(self.page)
+                await self._timed('page_load', self.page.goto(
+                    'https://www.google.com/maps', timeout=self._timeout('page_load')
+                ))
             except PlaywrightTimeout:
                 self.logger.error("Timeout loading Google Maps - possible network issue")
                 raise
@@ -115,7 +523,7 @@ class GoogleMapsScraper:
             
             # Wait for search box to be visible
             search_box = self.page.locator('input[id="searchboxinput"]')
-            await search_box.wait_for(state='visible', timeout=self.request_timeout)
+            await self._timed('request', search_box.wait_for(state='visible', timeout=self._timeout('request')))
             
             # Enter search query
             await search_box.fill(search_query)
@@ -134,7 +542,9 @@ class GoogleMapsScraper:
             
             # Wait for results container
             try:
-                await self.page.wait_for_selector('[role="feed"]', timeout=self.request_timeout)
+                await self._timed('request', self.page.wait_for_selector(
+                    '[role="feed"]', timeout=self._timeout('request')
+                ))
                 self.logger.info("Search results loaded")
                 return True
             except PlaywrightTimeout:
@@ -148,13 +558,17 @@ class GoogleMapsScraper:
             self.logger.error(f"Error during search: {e}")
             return False
     
-    async def _detect_captcha(self) -> bool:
+    async def _detect_captcha(self, page: Optional[Page] = None) -> bool:
         """
         Detect if a CAPTCHA is present on the page.
         
+        Args:
+            page: Page to check (defaults to the main page)
+        
         Returns:
             True if CAPTCHA detected, False otherwise
         """
+        page = page or self.page
         try:
             # Check for common CAPTCHA indicators
             captcha_selectors = [
@@ -165,9 +579,17 @@ class GoogleMapsScraper:
             ]
             
             for selector in captcha_selectors:
-                captcha_element = await self.page.query_selector(selector)
+                captcha_element = await page.query_selector(selector)
                 if captcha_element:
                     self.logger.warning(f"CAPTCHA detected with selector: {selector}")
+                    # Attribute the CAPTCHA to the proxy that served the page
+                    hedged = self.hedge_context is not None and page.context is self.hedge_context
+                    # A challenged session is worth nothing to the next browser on that proxy
+                    if self.session_store:
+                        self.session_store.invalidate(self.hedge_proxy_key if hedged else self._proxy_key())
+                    self.proxy_manager.record_captcha(
+                        self.hedge_lease.proxy if hedged and self.hedge_lease else self.current_proxy
+                    )
                     return True
             
             return False
@@ -200,25 +622,24 @@ class GoogleMapsScraper:
             # Scroll to load more results
             await self._scroll_results()
             
-            # Find all business links in the results
-            # Google Maps shows results as clickable links
-            result_links = await self.page.locator('a[href*="/maps/place/"]').all()
+            # Read all result cards and apply filter predicates before opening anything
+            cards = await self._collect_result_cards()
             
-            self.logger.info(f"Found {len(result_links)} business results")
+            self.logger.info(f"Found {len(cards)} business results")
             
-            # Limit to 100 results (increased for broader coverage)
-            max_results = 100
-            result_links = result_links[:max_results]
+            max_results = self._max_results()
             
             # Extract URLs first to avoid stale references
             business_urls = []
-            for link in result_links:
-                try:
-                    href = await link.get_attribute('href')
-                    if href and href.startswith('http'):
-                        business_urls.append(href)
-                except:
+            seen_urls = set()
+            for card in cards:
+                href = card['url']
+                if not href or not href.startswith('http') or href in seen_urls:
                     continue
+                seen_urls.add(href)
+                if self._passes_filter(card, partial=True):
+                    business_urls.append(href)
+            business_urls = business_urls[:max_results]
             
             self.logger.info(f"Collected {len(business_urls)} business URLs to scrape")
             
@@ -227,19 +648,32 @@ class GoogleMapsScraper:
             
             # Extract data from each business URL
             for idx, business_url in enumerate(business_urls, start=1):
+                if self._budget_exhausted():
+                    self.logger.info(f"⏹️ Budget exhausted ({self.stop_reason}) - stopping")
+                    break
                 try:
                     self.logger.info(f"Extracting business {idx}/{len(business_urls)}...")
+                    self.current_business = business_url
+                    
+                    # Replace a bloated browser before the next page
+                    if self.supervisor.should_recycle():
+                        await self._recycle_browser()
+                    self.supervisor.record_page()
                     
                     # Navigate to business page
-                    await self.page.goto(business_url, timeout=self.page_load_timeout, wait_until='domcontentloaded')
+                    await self._before_navigation(self.page)
+                    await self._timed('detail_load', self.page.goto(
+                        business_url, timeout=self._timeout('detail_load'), wait_until='domcontentloaded'
+                    ))
                     await asyncio.sleep(1)  # Wait for details to load (optimized)
                     
                     # Extract comprehensive business info
-                    business_info = await DataExtractor.extract_detailed_business_info(self.page)
+                    business_info = await DataExtractor.extract_detailed_business_info(self.page, self.extract_fields)
+                    await self._archive_page(self.page, business_info)
                     
-                    if business_info.get('name'):
+                    if business_info.get('name') and self._passes_filter(business_info):
                         # Try to extract email from website if not found on Maps
-                        if business_info.get('email') == 'Not given' and business_info.get('website') != 'Not given':
+                        if self._needs_email(business_info):
                             try:
                                 email = await DataExtractor.extract_email_from_website(self.page, business_info['website'])
                                 if email:
@@ -247,6 +681,7 @@ class GoogleMapsScraper:
                             except Exception as e:
                                 self.logger.debug(f"Could not extract email from website: {e}")
                         
+                        business_info = self._project_fields(business_info)
                         businesses.append(business_info)
                         self.logger.info(f"Extracted: {business_info.get('name')}")
                         
@@ -258,14 +693,16 @@ class GoogleMapsScraper:
                                 self.logger.warning(f"Error in callback: {e}")
                     
                     # Navigate back to results page
-                    await self.page.goto(results_url, timeout=self.page_load_timeout, wait_until='domcontentloaded')
+                    await self._before_navigation(self.page)
+                    await self.page.goto(results_url, timeout=self._timeout('page_load'), wait_until='domcontentloaded')
                     await asyncio.sleep(0.5)  # Optimized from 1 second
                     
                 except Exception as e:
                     self.logger.warning(f"Error extracting business {idx}: {e}")
                     # Try to go back to results page
                     try:
-                        await self.page.goto(results_url, timeout=self.page_load_timeout, wait_until='domcontentloaded')
+                        await self._before_navigation(self.page)
+                        await self.page.goto(results_url, timeout=self._timeout('page_load'), wait_until='domcontentloaded')
                         await asyncio.sleep(0.5)  # Optimized from 1 second
                     except:
                         pass
@@ -278,22 +715,204 @@ class GoogleMapsScraper:
         
         return businesses
     
-    async def _scroll_results(self):
-        """Scroll the results panel to load more businesses - OPTIMIZED."""
+    def _max_results(self) -> int:
+        """Get the maximum number of results to collect for a query."""
+        from config import Config
+        max_results = getattr(Config, 'MAX_RESULTS_PER_QUERY', 100)
+        remaining = self._remaining_businesses()
+        if remaining is not None:
+            # Leave headroom for tabs that fail or are filtered out on the detail page
+            max_results = min(max_results, remaining * 2)
+        return max_results
+    
+    async def _scroll_results(self, url_queue: Optional[asyncio.Queue] = None, max_results: int = 100):
+        """
+        Scroll the results panel to load more businesses - OPTIMIZED.
+        
+        Args:
+            url_queue: Optional queue that receives each newly discovered business
+                URL while scrolling continues, followed by a None sentinel
+            max_results: Stop publishing (and scrolling) once this many URLs are found
+        """
+        seen_urls = set()
+        self.published_count = 0
         try:
             # Find the scrollable results container
             results_panel = self.page.locator('[role="feed"]').first
             
+            if url_queue is not None:
+                await self._publish_result_urls(url_queue, seen_urls, max_results)
+            
             # Scroll down 8 times to load up to 100+ results
             for i in range(8):
+                if self.published_count >= max_results or self._budget_exhausted():
+                    break
                 await results_panel.evaluate('el => el.scrollTop = el.scrollHeight')
                 await asyncio.sleep(1)  # Wait for results to load
                 self.logger.debug(f"Scroll {i+1}/8 completed")
                 
+                if url_queue is not None:
+                    await self._publish_result_urls(url_queue, seen_urls, max_results)
+                
         except Exception as e:
             self.logger.debug(f"Could not scroll results: {e}")
+        finally:
+            if url_queue is not None:
+                url_queue.put_nowait(None)
+    
+    async def _publish_result_urls(self, url_queue: asyncio.Queue, seen_urls: set, max_results: int) -> None:
+        """
+        Put business URLs that appeared in the results list since the last call into the queue.
+        Cards failing the job's filter predicates are never published.
+        
+        Args:
+            url_queue: Queue consumed by the detail tabs
+            seen_urls: URLs already evaluated for this query (updated in place)
+            max_results: Maximum number of URLs to publish in total
+        """
+        new_count = 0
+        for card in await self._collect_result_cards():
+            if self.published_count >= max_results:
+                break
+            href = card['url']
+            if href and href.startswith('http') and href not in seen_urls:
+                seen_urls.add(href)
+                if not self._passes_filter(card, partial=True):
+                    continue
+                url_queue.put_nowait(href)
+                self.published_count += 1
+                new_count += 1
+        
+        if new_count:
+            self.logger.info(f"🔗 Discovered {new_count} new business URLs ({self.published_count} total)")
+    
+    async def _recycle_browser(self) -> bool:
+        """
+        Close the current browser and relaunch it with the same proxy.
+        Only call this when no tabs are in flight.
+        
+        Returns:
+            True if the new browser is ready, False otherwise
+        """
+        if not self.current_proxy:
+            return False
+        
+        self.logger.info("♻️ Recycling browser")
+        self.supervisor.record_recycle()
+        return await self.initialize_browser(self.current_proxy)
+    
+    async def _archive_page(self, page, business_info: Dict) -> None:
+        """
+        Store the rendered detail page in the page archive (archive mode).
+        Pages without an extracted name are kept too: they are the ones a selector fix recovers.
+        
+        Args:
+            page: Page on the business detail view
+            business_info: What was extracted from it (for the CID)
+        """
+        if not self.page_archive:
+            return
+        try:
+            html = await page.content()
+            await asyncio.to_thread(self.page_archive.add, business_info.get('cid'), page.url, html)
+        except Exception as e:
+            self.logger.debug(f"Could not archive page: {e}")
     
-    async def _scrape_single_business(self, business_url: str, index: int, total: int) -> Optional[Dict]:
+    async def _before_navigation(self, page=None, context=None) -> None:
+        """
+        Wait for a token from the rate limiter of the proxy a navigation goes through.
+        
+        Args:
+            page: Page about to navigate (hedge context pages use the hedge proxy)
+            context: Browser context the navigation runs in, when there is no page yet
+        """
+        if not self.rate_limiter:
+            return
+        context = context if context is not None else getattr(page, 'context', None)
+        hedged = self.hedge_context is not None and context is self.hedge_context
+        await self.rate_limiter.acquire(self.hedge_proxy_key if hedged else self._proxy_key())
+    
+    def _proxy_key(self, proxy: Optional[Dict] = None) -> str:
+        """Get an identifier for a proxy (defaults to the one the current browser uses)."""
+        proxy = proxy or self.current_proxy
+        if not proxy:
+            return 'direct'
+        return f"{proxy.get('ip', 'unknown')}:{proxy.get('port', '')}"
+    
+    async def _save_session(self) -> None:
+        """Save the current context's cookies and localStorage for the current proxy."""
+        if self.session_store and self.context:
+            await self.session_store.save(self.context, self._proxy_key())
+    
+    def _timeout(self, operation: str, key: Optional[str] = None) -> int:
+        """
+        Get the timeout for an operation on a proxy.
+        
+        Args:
+            operation: Operation type (see modules.timeouts.OPERATION_BOUNDS)
+            key: Proxy the operation goes through (defaults to the current proxy)
+            
+        Returns:
+            Timeout in milliseconds
+        """
+        if self.timeouts is None:
+            return OPERATION_BOUNDS[operation][0]
+        return self.timeouts.get(operation, key or self._proxy_key())
+    
+    async def _timed(self, operation: str, awaitable, key: Optional[str] = None):
+        """
+        Await a Playwright call and record its latency (or timeout) for the operation.
+        
+        Args:
+            operation: Operation type (see modules.timeouts.OPERATION_BOUNDS)
+            awaitable: The pending Playwright call
+            key: Proxy that does the work (defaults to the current proxy;
+                hedge attempts pass the hedge context's proxy)
+            
+        Returns:
+            The call's result
+        """
+        if self.timeouts is None:
+            return await awaitable
+        
+        key = key or self._proxy_key()
+        started = asyncio.get_running_loop().time()
+        try:
+            result = await awaitable
+        except PlaywrightTimeout:
+            self.timeouts.record_timeout(operation, key)
+            raise
+        self.timeouts.record(operation, key, asyncio.get_running_loop().time() - started)
+        return result
+    
+    def _record_tab_outcome(self, latency: Optional[float] = None, timeout: bool = False,
+                            captcha: bool = False, error: bool = False,
+                            page_ref: Optional[Dict] = None) -> None:
+        """
+        Record the outcome of one detail tab for the adaptive controllers.
+        
+        Args:
+            latency: Seconds the tab took (successful tabs)
+            timeout: The tab timed out or was killed by the watchdog
+            captcha: The tab hit a CAPTCHA
+            error: The tab failed for another reason
+            page_ref: The tab's page_ref; hedge attempts and tabs cancelled
+                because the other attempt of a hedged pair won are not recorded
+        """
+        if page_ref and (page_ref.get('hedge') or page_ref.get('hedge_cancelled')):
+            return
+        if self.concurrency:
+            self.concurrency.record(self._proxy_key(), latency, timeout=timeout, captcha=captcha, error=error)
+        
+        # Proxy health: page errors are not the proxy's fault, timeouts and CAPTCHAs are
+        if self.current_proxy:
+            if latency is not None:
+                self.proxy_manager.record_success(self.current_proxy, latency)
+            elif timeout or captcha:
+                self.proxy_manager.record_failure(self.current_proxy)
+    
+    async def _scrape_single_business(self, business_url: str, index: int, total: int,
+                                      page_ref: Optional[Dict] = None, context=None) -> Optional[Dict]:
         """
         Scrape a single business in a new tab/page - OPTIMIZED for speed and reliability.
         
@@ -301,35 +920,56 @@ class GoogleMapsScraper:
             business_url: URL of the business to scrape
             index: Current business index
             total: Total number of businesses
+            page_ref: Optional dict that receives the opened page under 'page',
+                so the watchdog can force-close it if the task hangs
+            context: Optional browser context to open the tab in (hedge attempts)
             
         Returns:
             Business info dictionary or None if failed
         """
         page = None
+        if page_ref is None:
+            page_ref = {}
+        # Hedge attempts run through the hedge context's proxy
+        proxy_key = self.hedge_proxy_key if context is not None else None
+        started = asyncio.get_running_loop().time()
         try:
             self.logger.info(f"[Tab {index}/{total}] Opening tab...")
             
             # Create new page (tab) in the same browser
-            page = await self.browser.new_page(viewport={'width': 1920, 'height': 1080})
-            page.set_default_timeout(20000)  # Reduced from 30s to 20s
+            page = await (context or self.context or self.browser).new_page(viewport={'width': 1920, 'height': 1080})
+            page.set_default_timeout(self._timeout('detail_load', proxy_key))
+            page_ref['page'] = page
+            self._meter_page(page, business_url, proxy_key)
+            self.supervisor.record_page()
             
             # Navigate to business page - use domcontentloaded for speed
-            await page.goto(business_url, timeout=20000, wait_until='domcontentloaded')
+            await self._timed('detail_load', page.goto(
+                business_url, timeout=self._timeout('detail_load', proxy_key), wait_until='domcontentloaded'
+            ), proxy_key)
             
             # Smart wait: Wait for business name OR timeout quickly
             try:
-                await page.wait_for_selector('h1.DUwDvf, h1', timeout=3000, state='visible')
+                await self._timed('detail_ready', page.wait_for_selector(
+                    'h1.DUwDvf, h1', timeout=self._timeout('detail_ready', proxy_key), state='visible'
+                ), proxy_key)
             except:
-                # If name not found in 3s, wait a bit more for slow pages
+                # If name not found in time, wait a bit more for slow pages
                 await asyncio.sleep(1)
             
             # Extract business info
-            business_info = await DataExtractor.extract_detailed_business_info(page)
+            business_info = await DataExtractor.extract_detailed_business_info(page, self.extract_fields)
+            await self._archive_page(page, business_info)
             
             # Validate we got actual data
             if business_info.get('name') and business_info.get('name') != 'Not given':
+                # Detail data is the final word on the filter predicates
+                if not self._passes_filter(business_info):
+                    self._record_tab_outcome(latency=asyncio.get_running_loop().time() - started, page_ref=page_ref)
+                    return None
+                
                 # Extract email from website if not found on Maps
-                if business_info.get('email') == 'Not given' and business_info.get('website') != 'Not given':
+                if self._needs_email(business_info):
                     try:
                         email = await DataExtractor.extract_email_from_website(page, business_info['website'])
                         if email:
@@ -339,13 +979,24 @@ class GoogleMapsScraper:
                         self.logger.debug(f"Could not extract email: {e}")
                 
                 self.logger.info(f"[Tab {index}/{total}] ✓ {business_info.get('name')}")
-                return business_info
+                self._record_tab_outcome(latency=asyncio.get_running_loop().time() - started, page_ref=page_ref)
+                return self._project_fields(business_info)
             else:
                 self.logger.warning(f"[Tab {index}/{total}] ✗ No name extracted")
+                self._record_tab_outcome(captcha=await self._detect_captcha(page), error=True, page_ref=page_ref)
                 return None
-                
+        
+        except asyncio.CancelledError:
+            # Killed by the hard-deadline watchdog
+            self._record_tab_outcome(timeout=True, page_ref=page_ref)
+            raise
+        except PlaywrightTimeout as e:
+            self.logger.warning(f"[Tab {index}/{total}] ✗ {str(e)[:50]}")
+            self._record_tab_outcome(timeout=True, page_ref=page_ref)
+            return None
         except Exception as e:
             self.logger.warning(f"[Tab {index}/{total}] ✗ {str(e)[:50]}")
+            self._record_tab_outcome(error=True, page_ref=page_ref)
             return None
         finally:
             # Always close the tab quickly
@@ -355,9 +1006,152 @@ class GoogleMapsScraper:
                 except:
                     pass
     
+    async def _get_hedge_context(self):
+        """
+        Get the browser context hedge attempts run in, creating it on first use.
+        The context uses a leased proxy other than the browser's when one is free.
+        
+        Returns:
+            Browser context, or None if it could not be created
+        """
+        if self.hedge_context is not None:
+            return self.hedge_context
+        
+        # Lease the least-loaded other proxy
+        self.hedge_lease = await self.proxy_manager.lease_async(exclude={self._proxy_key()}, timeout=0)
+        hedge_proxy = self.hedge_lease.proxy if self.hedge_lease else None
+        try:
+            if hedge_proxy:
+                storage_state = None
+                if self.session_store:
+                    storage_state = self.session_store.load(self._proxy_key(hedge_proxy))
+                self.hedge_context = await self.browser.new_context(
+                    proxy={
+                        'server': hedge_proxy['server'],
+                        'username': hedge_proxy['username'],
+                        'password': hedge_proxy['password']
+                    },
+                    storage_state=storage_state
+                )
+                self.hedge_proxy_key = self._proxy_key(hedge_proxy)
+                self.logger.info(f"Hedge context uses proxy {hedge_proxy.get('ip', 'unknown')}")
+            else:
+                # Single proxy: a separate context still gets its own connections
+                self.hedge_context = await self.browser.new_context()
+                self.hedge_proxy_key = self._proxy_key()
+            if self.asset_cache:
+                await self.asset_cache.attach(self.hedge_context)
+        except Exception as e:
+            self.logger.warning(f"Could not create hedge context: {e}")
+            await self._release_leases(hedge_only=True)
+            return None
+        return self.hedge_context
+    
+    async def _release_leases(self, hedge_only: bool = False) -> None:
+        """
+        Give back the proxy leases held by the browser and the hedge context.
+        
+        Args:
+            hedge_only: Release only the hedge context's lease
+        """
+        if self.hedge_lease:
+            lease, self.hedge_lease = self.hedge_lease, None
+            await self.proxy_manager.release_async(lease)
+        if self.proxy_lease and not hedge_only:
+            lease, self.proxy_lease = self.proxy_lease, None
+            await self.proxy_manager.release_async(lease)
+    
+    async def _scrape_with_hedge(self, business_url: str, index: int, total: int) -> Optional[Dict]:
+        """
+        Scrape a business tab under the watchdog, hedging it if it runs past the p95 latency.
+        
+        The hedge opens the same business in another context/proxy; whichever
+        attempt returns a business first wins and the other is cancelled.
+        
+        Args:
+            business_url: URL of the business to scrape
+            index: Current business index
+            total: Total number of businesses
+            
+        Returns:
+            Business info dictionary or None if failed
+        """
+        label = f"[Tab {index}/{total}]"
+        # Wait for the rate limit token before the tab deadline and the hedge timer start
+        await self._before_navigation()
+        primary_ref = {}
+        primary = asyncio.ensure_future(self.supervisor.run_tab(
+            self._scrape_single_business(business_url, index, total, primary_ref),
+            primary_ref,
+            label=label
+        ))
+        if self.hedging is None:
+            return await primary
+        
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        self.hedging.record_attempt()
+        
+        delay = self.hedging.hedge_delay()
+        if delay is not None:
+            await asyncio.wait({primary}, timeout=delay)
+        if primary.done() or delay is None or not self.hedging.try_acquire():
+            result = await primary
+            if result:
+                self.hedging.record_latency(loop.time() - started)
+            return result
+        
+        context = await self._get_hedge_context()
+        if context is None:
+            result = await primary
+            if result:
+                self.hedging.record_latency(loop.time() - started)
+            return result
+        
+        self.logger.info(f"{label} Slower than p95 ({delay:.1f}s) - hedging")
+        await self._before_navigation(context=context)
+        hedge_ref = {'hedge': True}
+        hedge = asyncio.ensure_future(self.supervisor.run_tab(
+            self._scrape_single_business(business_url, index, total, hedge_ref, context=context),
+            hedge_ref,
+            label=f"{label} [hedge]"
+        ))
+        
+        attempts = {primary: primary_ref, hedge: hedge_ref}
+        pending = set(attempts)
+        winner = None
+        result = None
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is None and task.result():
+                    winner = task
+                    result = task.result()
+                    break
+        
+        # Cancel the loser and close its page (bare excepts in the tab may swallow the cancel)
+        for task in pending:
+            attempts[task]['hedge_cancelled'] = True
+            task.cancel()
+            page = attempts[task].get('page')
+            if page:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+        if pending:
+            await asyncio.wait(pending, timeout=self.supervisor.close_timeout)
+        
+        if winner is not None:
+            self.hedging.record_win(winner is hedge)
+            self.hedging.record_latency(loop.time() - started)
+        return result
+    
     async def extract_business_data_parallel(self, csv_callback=None, max_concurrent=5) -> List[Dict]:
         """
         Extract business data using parallel tabs for faster scraping.
+        Scrolling and detail extraction are pipelined: the scroller publishes
+        URLs into a queue while detail tabs start on the first results.
         
         Args:
             csv_callback: Optional callback function to save each business incrementally
@@ -371,55 +1165,82 @@ class GoogleMapsScraper:
             return []
         
         businesses = []
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        url_queue: asyncio.Queue = asyncio.Queue()
+        scroller = None
         
         try:
             # Quick wait for results to load
             await asyncio.sleep(1)
             
-            # Scroll to load more results (optimized)
-            await self._scroll_results()
-            
-            # Find all business links
-            result_links = await self.page.locator('a[href*="/maps/place/"]').all()
-            self.logger.info(f"Found {len(result_links)} business results")
-            
-            # Limit to 100 results (increased for broader coverage)
-            max_results = 100
-            result_links = result_links[:max_results]
+            max_results = self._max_results()
             
-            # Extract URLs
-            business_urls = []
-            for link in result_links:
-                try:
-                    href = await link.get_attribute('href')
-                    if href and href.startswith('http'):
-                        business_urls.append(href)
-                except:
-                    continue
+            # Scroll in the background, publishing URLs as they appear
+            scroller = asyncio.ensure_future(self._scroll_results(url_queue, max_results))
             
-            self.logger.info(f"Collected {len(business_urls)} business URLs")
-            self.logger.info(f"🚀 PARALLEL scraping: {max_concurrent} tabs at once")
+            self.logger.info(f"🚀 PARALLEL scraping: {max_concurrent} tabs at once (pipelined with scrolling)")
             
-            # Process businesses in batches
-            for i in range(0, len(business_urls), max_concurrent):
-                batch = business_urls[i:i + max_concurrent]
-                batch_num = (i // max_concurrent) + 1
-                total_batches = (len(business_urls) + max_concurrent - 1) // max_concurrent
+            position = 0
+            batch_num = 0
+            scrolling_done = False
+            while not scrolling_done:
+                # Tabs per wave follow the adaptive controller when enabled
+                proxy_key = self._proxy_key()
+                wave_size = self.concurrency.get_limit(proxy_key) if self.concurrency else max_concurrent
+                self.query_tab_limits.append(wave_size)
+                
+                # Stop scheduling tabs once a budget is exhausted, and never open
+                # more tabs than businesses the budget still allows
+                if self._budget_exhausted():
+                    self.logger.info(f"⏹️ Budget exhausted ({self.stop_reason}) - stopping")
+                    break
+                remaining = self._remaining_businesses()
+                if remaining is not None:
+                    wave_size = max(1, min(wave_size, remaining))
+                
+                # Wait for at least one URL, then take whatever else is ready
+                url = await url_queue.get()
+                if url is None:
+                    break
+                batch = [url]
+                while len(batch) < wave_size and not url_queue.empty():
+                    url = url_queue.get_nowait()
+                    if url is None:
+                        scrolling_done = True
+                        break
+                    batch.append(url)
                 
-                self.logger.info(f"📦 Batch {batch_num}/{total_batches} ({len(batch)} tabs)")
+                batch_num += 1
+                self.logger.info(f"📦 Batch {batch_num} ({len(batch)} tabs)")
                 
-                # Create tasks for parallel scraping
-                tasks = [
-                    self._scrape_single_business(url, i + idx + 1, len(business_urls))
-                    for idx, url in enumerate(batch)
-                ]
+                # Recycling replaces the results page, so only do it once scrolling has finished.
+                # Batch boundaries have no tabs in flight.
+                if scroller.done() and self.supervisor.should_recycle():
+                    if not await self._recycle_browser():
+                        self.logger.error("Browser recycle failed - stopping extraction")
+                        break
+                
+                # Create tasks for parallel scraping, each under the hard deadline
+                tasks = []
+                discovered = position + len(batch) + url_queue.qsize()
+                for url in batch:
+                    position += 1
+                    tasks.append(self._scrape_with_hedge(url, position, discovered))
                 
                 # Run all tasks in parallel
                 results = await asyncio.gather(*tasks, return_exceptions=True)
                 
+                if self.concurrency:
+                    self.concurrency.adjust(proxy_key)
+                
                 # Process results immediately
                 for result in results:
                     if isinstance(result, dict) and result.get('name'):
+                        if self._remaining_businesses() == 0:
+                            break
+                        if not businesses:
+                            self.logger.info(f"⏱️ First result after {loop.time() - started_at:.1f}s")
                         businesses.append(result)
                         
                         # Call callback for real-time updates
@@ -431,16 +1252,206 @@ class GoogleMapsScraper:
                 
                 # No delay between batches - go straight to next batch for speed!
             
-            self.logger.info(f"✅ Parallel scraping complete! Extracted {len(businesses)} businesses")
+            self.logger.info(
+                f"✅ Parallel scraping complete! Extracted {len(businesses)} businesses "
+                f"in {loop.time() - started_at:.1f}s"
+            )
             
         except Exception as e:
             self.logger.error(f"Error in parallel scraping: {e}")
+        finally:
+            if scroller and not scroller.done():
+                scroller.cancel()
+        
+        return businesses
+    
+    async def extract_business_data_panel(self, csv_callback=None) -> List[Dict]:
+        """
+        Extract business data by clicking each card in the loaded results list
+        and reading the detail side panel, all within the current page.
+        Avoids a full Maps app load per business.
+        
+        Args:
+            csv_callback: Optional callback function to save each business incrementally
+        
+        Returns:
+            List of business information dictionaries
+        """
+        if not self.page:
+            self.logger.error("Browser not initialized")
+            return []
+        
+        businesses = []
+        email_page = None
+        
+        try:
+            # Quick wait for results to load
+            await asyncio.sleep(1)
+            
+            # Scroll to load more results
+            await self._scroll_results()
+            
+            results_url = self.page.url
+            cards = self.page.locator('[role="feed"] a[href*="/maps/place/"]')
+            
+            total = min(await cards.count(), self._max_results())
+            self.logger.info(f"🖱️ PANEL scraping: {total} result cards")
+            
+            seen_urls = set()
+            for idx in range(total):
+                if self._budget_exhausted():
+                    self.logger.info(f"⏹️ Budget exhausted ({self.stop_reason}) - stopping")
+                    break
+                label = f"[Card {idx + 1}/{total}]"
+                business_info = await self.supervisor.run_tab(
+                    self._scrape_panel_card(cards.nth(idx), label, seen_urls),
+                    {},
+                    label=label
+                )
+                
+                if business_info:
+                    # Email harvesting navigates away, so it gets its own tab
+                    if self._needs_email(business_info):
+                        try:
+                            if not email_page:
+                                email_page = await (self.context or self.browser).new_page()
+                                self._meter_page(email_page)
+                            email = await DataExtractor.extract_email_from_website(email_page, business_info['website'])
+                            if email:
+                                business_info['email'] = email
+                                self.logger.info(f"{label} Found email: {email}")
+                        except Exception as e:
+                            self.logger.debug(f"Could not extract email: {e}")
+                    
+                    business_info = self._project_fields(business_info)
+                    businesses.append(business_info)
+                    
+                    # Call callback for real-time updates
+                    if csv_callback:
+                        try:
+                            csv_callback(business_info)
+                        except Exception as e:
+                            self.logger.warning(f"Error in callback: {e}")
+                
+                # Make sure the list is showing before clicking the next card
+                if not await self._return_to_results_list():
+                    self.logger.warning("Results list lost - reloading results page")
+                    try:
+                        await self._before_navigation(self.page)
+                        await self.page.goto(results_url, timeout=self._timeout('page_load'), wait_until='domcontentloaded')
+                        await self.page.wait_for_selector('[role="feed"]', timeout=self._timeout('request'))
+                        await self._scroll_results()
+                        cards = self.page.locator('[role="feed"] a[href*="/maps/place/"]')
+                    except Exception as e:
+                        self.logger.error(f"Could not restore results list: {e}")
+                        break
+            
+            self.logger.info(f"✅ Panel scraping complete! Extracted {len(businesses)} businesses")
+            
+        except Exception as e:
+            self.logger.error(f"Error in panel scraping: {e}")
+        finally:
+            if email_page:
+                try:
+                    await email_page.close()
+                except:
+                    pass
         
         return businesses
     
+    async def _scrape_panel_card(self, card, label: str, seen_urls: set) -> Optional[Dict]:
+        """
+        Click a single result card and extract the detail side panel.
+        
+        Args:
+            card: Locator for the result card link
+            label: Label used in log messages
+            seen_urls: Card URLs already processed in this list
+            
+        Returns:
+            Business info dictionary or None if failed
+        """
+        try:
+            card_info = DataExtractor.parse_result_card(
+                await card.evaluate(RESULT_CARD_JS, timeout=self._timeout('request'))
+            )
+            href = card_info['url']
+            if not href or href in seen_urls:
+                return None
+            seen_urls.add(href)
+            self.current_business = href
+            
+            # Skip cards failing the filter without opening the panel
+            if not self._passes_filter(card_info, partial=True):
+                return None
+            
+            await card.scroll_into_view_if_needed(timeout=self._timeout('request'))
+            await card.click(timeout=self._timeout('request'))
+            self.supervisor.record_page()
+            
+            # Wait for the side panel to show this business
+            await self.page.wait_for_url('**/maps/place/**', timeout=self._timeout('request'))
+            try:
+                await self._timed('detail_ready', self.page.wait_for_selector(
+                    'h1.DUwDvf, h1', timeout=self._timeout('detail_ready'), state='visible'
+                ))
+            except:
+                await asyncio.sleep(1)
+            
+            business_info = await DataExtractor.extract_detailed_business_info(self.page, self.extract_fields)
+            await self._archive_page(self.page, business_info)
+            
+            if business_info.get('name') and business_info.get('name') != 'Not given':
+                if not self._passes_filter(business_info):
+                    return None
+                self.logger.info(f"{label} ✓ {business_info.get('name')}")
+                return business_info
+            
+            self.logger.warning(f"{label} ✗ No name extracted")
+            return None
+            
+        except Exception as e:
+            self.logger.warning(f"{label} ✗ {str(e)[:50]}")
+            return None
+    
+    async def _return_to_results_list(self) -> bool:
+        """
+        Close the detail side panel and go back to the results list.
+        
+        Returns:
+            True if the results list is visible again, False otherwise
+        """
+        feed = self.page.locator('[role="feed"]').first
+        try:
+            if await feed.is_visible():
+                return True
+        except:
+            pass
+        
+        try:
+            back_button = self.page.locator('button[aria-label="Back"]').first
+            await back_button.click(timeout=2000)
+        except:
+            try:
+                await self.page.go_back(timeout=self._timeout('request'), wait_until='domcontentloaded')
+            except:
+                pass
+        
+        try:
+            await feed.wait_for(state='visible', timeout=self._timeout('request'))
+            return True
+        except:
+            return False
+    
     async def close_browser(self) -> None:
         """Close the browser and cleanup resources."""
         try:
+            # Closed together with the browser
+            self.hedge_context = None
+            self.hedge_proxy_key = None
+            self.context = None
+            await self._release_leases()
+            
             if self.page:
                 # Don't navigate anywhere, just close
                 try:
@@ -483,14 +1494,21 @@ class GoogleMapsScraper:
         if url:
             return await self.scrape_url(url, csv_callback, retry_count, max_retries)
         
+        if retry_count == 0:
+            self._start_query(f"{keyword} - {zip_code}")
+            csv_callback = self._budget_callback(csv_callback)
+        if self._budget_exhausted():
+            self.logger.info(f"Budget exhausted ({self.stop_reason}) - not starting query")
+            return []
+        
         if not keyword or not zip_code:
             self.logger.error("Missing keyword or zip_code in query")
             return []
         
         self.logger.info(f"Starting scrape for: {keyword} in {zip_code} (attempt {retry_count + 1}/{max_retries + 1})")
         
-        # Get current proxy
-        proxy = self.proxy_manager.get_next_proxy()
+        # Lease the proxy the browser will use
+        proxy = await self._lease_browser_proxy()
         if not proxy:
             self.logger.error("No proxy available")
             return []
@@ -512,6 +1530,7 @@ class GoogleMapsScraper:
             self.proxy_manager.increment_counter()
             
             # Perform search
+            search_started = asyncio.get_running_loop().time()
             search_success = await self.search_google_maps(keyword, zip_code)
             if not search_success:
                 self.logger.error("Search failed - CAPTCHA or network error")
@@ -524,10 +1543,18 @@ class GoogleMapsScraper:
                     return await self.scrape_query(query, csv_callback, retry_count + 1, max_retries)
                 return []
             
-            # Extract business data with incremental saving (PARALLEL MODE)
-            from config import Config
-            max_concurrent = getattr(Config, 'PARALLEL_TABS', 5)
-            businesses = await self.extract_business_data_parallel(csv_callback, max_concurrent)
+            self.proxy_manager.record_success(proxy, asyncio.get_running_loop().time() - search_started)
+            
+            # Consent passed and no CAPTCHA: keep the session for the next browser on this proxy
+            await self._save_session()
+            
+            # Extract business data with incremental saving (PANEL or PARALLEL TAB MODE)
+            if self._get_extraction_mode() == 'panel':
+                businesses = await self.extract_business_data_panel(csv_callback)
+            else:
+                from config import Config
+                max_concurrent = getattr(Config, 'PARALLEL_TABS', 5)
+                businesses = await self.extract_business_data_parallel(csv_callback, max_concurrent)
             
             # Add query context to each business
             for business in businesses:
@@ -536,6 +1563,7 @@ class GoogleMapsScraper:
             
             self.logger.info(f"Scrape completed: {len(businesses)} businesses found")
             
+            await self.scrape_reviews(businesses)
             return businesses
             
         except Exception as e:
@@ -555,6 +1583,64 @@ class GoogleMapsScraper:
             
             return []
     
+    async def _fast_fetch_place(self, url: str, proxy: Dict, csv_callback=None) -> List[Dict]:
+        """
+        Fetch a business URL without rendering it and parse the embedded place payload.
+        
+        Args:
+            url: Google Maps business URL
+            proxy: Proxy to fetch through
+            csv_callback: Optional callback to save the business incrementally
+            
+        Returns:
+            List with the business dictionary (empty if filtered out),
+            or None to fall back to a full render
+        """
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(self._proxy_key(proxy))
+        fetch_started = asyncio.get_running_loop().time()
+        business_info = await asyncio.to_thread(self.place_fetcher.fetch, url, proxy)
+        self._add_proxy_bytes(self.place_fetcher.last_response_bytes)
+        if self.bandwidth and self.place_fetcher.last_response_bytes:
+            self.bandwidth.record(
+                self._proxy_key(proxy), 0, self.place_fetcher.last_response_bytes,
+                business=url, kind='maps'
+            )
+        if self.page_archive and self.place_fetcher.last_html:
+            await asyncio.to_thread(
+                self.page_archive.add, (business_info or {}).get('cid'), url, self.place_fetcher.last_html, 'raw'
+            )
+        if not business_info:
+            self.logger.info("Fast fetch unavailable - falling back to full page render")
+            return None
+        
+        self.proxy_manager.record_success(proxy, asyncio.get_running_loop().time() - fetch_started)
+        self.proxy_manager.increment_counter()
+        self.logger.info(f"⚡ Fast fetch: {business_info.get('name')}")
+        
+        if not self._passes_filter(business_info):
+            return []
+        
+        # Email harvesting still needs a browser, but not a rendered Maps page
+        self.current_business = url
+        if self._needs_email(business_info):
+            try:
+                if self.page or await self.initialize_browser(proxy):
+                    email = await DataExtractor.extract_email_from_website(self.page, business_info['website'])
+                    if email:
+                        business_info['email'] = email
+            except Exception as e:
+                self.logger.debug(f"Could not extract email from website: {e}")
+        
+        business_info = self._project_fields(business_info)
+        if csv_callback:
+            try:
+                csv_callback(business_info)
+            except Exception as e:
+                self.logger.warning(f"Error in CSV callback: {e}")
+        
+        return [business_info]
+    
     async def scrape_url(self, url: str, csv_callback=None, retry_count: int = 0, max_retries: int = 3) -> List[Dict]:
         """
         Scrape from a Google Maps URL (search URL or business URL).
@@ -570,12 +1656,26 @@ class GoogleMapsScraper:
         """
         self.logger.info(f"Starting scrape from URL: {url} (attempt {retry_count + 1}/{max_retries + 1})")
         
-        # Get current proxy
-        proxy = self.proxy_manager.get_next_proxy()
+        if retry_count == 0:
+            self._start_query(url)
+            csv_callback = self._budget_callback(csv_callback)
+        if self._budget_exhausted():
+            self.logger.info(f"Budget exhausted ({self.stop_reason}) - not starting query")
+            return []
+        
+        # Lease the proxy the browser will use
+        proxy = await self._lease_browser_proxy()
         if not proxy:
             self.logger.error("No proxy available")
             return []
         
+        # Known business URL: try the lightweight fetch before rendering the page
+        if retry_count == 0 and self.fast_place_fetch and '/maps/place/' in url:
+            businesses = await self._fast_fetch_place(url, proxy, csv_callback)
+            if businesses is not None:
+                await self.scrape_reviews(businesses)
+                return businesses
+        
         try:
             # Initialize browser with proxy
             success = await self.initialize_browser(proxy)
@@ -592,8 +1692,10 @@ class GoogleMapsScraper:
             self.proxy_manager.increment_counter()
             
             # Navigate to URL
+            await self._before_navigation(self.page)
+            load_started = asyncio.get_running_loop().time()
             try:
-                await self.page.goto(url, timeout=self.page_load_timeout)
+                await self.page.goto(url, timeout=self._timeout('page_load'))
                 await asyncio.sleep(1.5)  # Optimized from 3 seconds
             except Exception as e:
                 self.logger.error(f"Failed to load URL: {e}")
@@ -616,15 +1718,23 @@ class GoogleMapsScraper:
                     return await self.scrape_url(url, csv_callback, retry_count + 1, max_retries)
                 return []
             
+            self.proxy_manager.record_success(proxy, asyncio.get_running_loop().time() - load_started)
+            await self._save_session()
+            
             # Determine if it's a search URL or business URL
             if '/maps/place/' in url:
                 # Single business URL
                 self.logger.info("Detected business URL - extracting single business")
-                business_info = await DataExtractor.extract_detailed_business_info(self.page)
+                self.current_business = url
+                business_info = await DataExtractor.extract_detailed_business_info(self.page, self.extract_fields)
+                await self._archive_page(self.page, business_info)
+                
+                if business_info.get('name') and not self._passes_filter(business_info):
+                    return []
                 
                 if business_info.get('name'):
                     # Try to extract email from website
-                    if business_info.get('email') == 'Not given' and business_info.get('website') != 'Not given':
+                    if self._needs_email(business_info):
                         try:
                             email = await DataExtractor.extract_email_from_website(self.page, business_info['website'])
                             if email:
@@ -632,6 +1742,8 @@ class GoogleMapsScraper:
                         except Exception as e:
                             self.logger.debug(f"Could not extract email from website: {e}")
                     
+                    business_info = self._project_fields(business_info)
+                    
                     # Save incrementally if callback provided
                     if csv_callback:
                         try:
@@ -640,6 +1752,7 @@ class GoogleMapsScraper:
                             self.logger.warning(f"Error in CSV callback: {e}")
                     
                     self.logger.info(f"Scrape completed: 1 business found")
+                    await self.scrape_reviews([business_info])
                     return [business_info]
                 else:
                     self.logger.warning("Could not extract business information")
@@ -647,8 +1760,12 @@ class GoogleMapsScraper:
             else:
                 # Search URL - extract multiple businesses
                 self.logger.info("Detected search URL - extracting multiple businesses")
-                businesses = await self.extract_business_data(csv_callback)
+                if self._get_extraction_mode() == 'panel':
+                    businesses = await self.extract_business_data_panel(csv_callback)
+                else:
+                    businesses = await self.extract_business_data(csv_callback)
                 self.logger.info(f"Scrape completed: {len(businesses)} businesses found")
+                await self.scrape_reviews(businesses)
                 return businesses
             
         except Exception as e:
@@ -666,6 +1783,94 @@ class GoogleMapsScraper:
             
             return []
     
+    async def scrape_reviews(self, businesses: List[Dict]) -> int:
+        """
+        Stream the reviews of scraped businesses to the review callback (reviews mode only).
+        
+        Each place is opened in its own page of the current context; reviews are
+        handed to the callback as they are parsed and never collected in memory.
+        
+        Args:
+            businesses: Business dictionaries with 'url' and 'cid'
+            
+        Returns:
+            Number of reviews delivered
+        """
+        if not self.job_options.get('reviews') or not businesses:
+            return 0
+        if not self.context:
+            proxy = self.current_proxy or await self._lease_browser_proxy()
+            if not proxy or not await self.initialize_browser(proxy):
+                self.logger.warning("No browser available for reviews")
+                return 0
+        
+        max_reviews = self.job_options.get('max_reviews_per_place')
+        delivered = 0
+        for business in businesses:
+            url = business.get('url')
+            if not url or url == 'Not given':
+                continue
+            if self._budget_exhausted():
+                self.logger.info(f"Budget exhausted ({self.stop_reason}) - stopping reviews")
+                break
+            
+            cid = business.get('cid')
+            place_id = cid if cid and cid != 'Not given' else url
+            self.current_business = url
+            page = None
+            try:
+                page = await self.context.new_page()
+                self._meter_page(page, business=url)
+                await self._before_navigation(page)
+                await page.goto(url, timeout=self._timeout('detail_load'), wait_until='domcontentloaded')
+                async for review in self.reviews.stream_reviews(page, place_id, max_reviews):
+                    review['business_name'] = business.get('name', '')
+                    delivered += 1
+                    self.reviews_count += 1
+                    if self.review_callback:
+                        try:
+                            self.review_callback(review)
+                        except Exception as e:
+                            self.logger.warning(f"Error in review callback: {e}")
+            except Exception as e:
+                self.logger.warning(f"Could not scrape reviews for {business.get('name', url)}: {e}")
+            finally:
+                if page:
+                    try:
+                        await page.close()
+                    except:
+                        pass
+        
+        self.logger.info(f"Reviews completed: {delivered} reviews from {len(businesses)} businesses")
+        return delivered
+    
+    def get_stats(self) -> Dict:
+        """
+        Get runtime statistics for status reporting.
+        
+        Returns:
+            Dictionary of scraper statistics
+        """
+        return {
+            'browser': self.supervisor.get_stats(),
+            'concurrency': self.concurrency.get_stats() if self.concurrency else None,
+            'timeouts': self.timeouts.get_stats() if self.timeouts else None,
+            'hedging': self.hedging.get_stats() if self.hedging else None,
+            'sessions': self.session_store.get_stats() if self.session_store else None,
+            'asset_cache': self.asset_cache.get_stats() if self.asset_cache else None,
+            'bandwidth': self.bandwidth.get_job_summary() if self.bandwidth else None,
+            'rate_limits': self.rate_limiter.get_stats() if self.rate_limiter else None,
+            'archive': self.page_archive.get_stats() if self.page_archive else None,
+            'budgets': {
+                'query': self.query_budget.to_dict() if self.query_budget else None,
+                'job': self.job_budget.to_dict() if self.job_budget else None,
+                'stop_reason': self.stop_reason
+            },
+            'filter': self.business_filter.to_dict() if self.business_filter else None,
+            'filtered_out': self.filtered_out,
+            'reviews': self.reviews_count
+        }
+    
     async def cleanup(self) -> None:
         """Cleanup all resources."""
         try:
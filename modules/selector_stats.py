@@ -0,0 +1,177 @@
+"""
+Selector Stats Module
+Records per-field, per-selector hit/miss statistics and orders selectors by observed hit rate.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class SelectorStats:
+    """Self-tuning selector ordering backed by persisted hit/miss statistics."""
+
+    def __init__(self, stats_file: Optional[str] = None, skip_after: int = 50,
+                 explore_every: int = 100, autosave_every: int = 200):
+        """
+        Initialize selector statistics.
+
+        Args:
+            stats_file: JSON file to persist statistics to (None keeps them in memory)
+            skip_after: Skip a selector that missed on each of the last N pages it was tried on
+            explore_every: Try every selector again once per N pages, so a selector
+                that starts matching after a markup change is rediscovered
+            autosave_every: Save to disk after this many recorded attempts
+        """
+        self.stats_file = stats_file
+        self.skip_after = skip_after
+        self.explore_every = explore_every
+        self.autosave_every = autosave_every
+        self.logger = logging.getLogger(__name__)
+
+        # {field: {'pages': int, 'selectors': {selector: {...}}}}
+        self.fields: Dict[str, Dict] = {}
+        self._unsaved = 0
+        self._lock = threading.Lock()
+
+        self.load()
+
+    def _selector_entry(self, field: str, selector: str) -> Dict:
+        """Get (or create) the statistics entry for a selector."""
+        field_entry = self.fields.setdefault(field, {'pages': 0, 'selectors': {}})
+        return field_entry['selectors'].setdefault(selector, {
+            'attempts': 0,
+            'hits': 0,
+            'total_ms': 0.0,
+            'hit_ms': 0.0,
+            'misses_since_hit': 0,
+            'last_hit_at': None
+        })
+
+    def order(self, field: str, selectors: List[str]) -> List[str]:
+        """
+        Order selectors for one page by observed hit rate and skip stale ones.
+        Call once per page and field.
+
+        Args:
+            field: Business field the selectors extract
+            selectors: Candidate selectors in their default order
+
+        Returns:
+            Selectors to try, best first
+        """
+        with self._lock:
+            field_entry = self.fields.setdefault(field, {'pages': 0, 'selectors': {}})
+            field_entry['pages'] += 1
+
+            def score(indexed):
+                index, selector = indexed
+                entry = self._selector_entry(field, selector)
+                # Laplace-smoothed hit rate; unseen selectors keep their default position
+                hit_rate = (entry['hits'] + 1) / (entry['attempts'] + 2)
+                avg_ms = entry['hit_ms'] / entry['hits'] if entry['hits'] else float('inf')
+                return (-hit_rate, avg_ms, index)
+
+            ordered = [selector for _, selector in sorted(enumerate(selectors), key=score)]
+
+            if self.explore_every and field_entry['pages'] % self.explore_every == 0:
+                return ordered
+
+            active = [
+                selector for selector in ordered
+                if not self._is_stale(self._selector_entry(field, selector))
+            ]
+            # Never skip every selector
+            return active or ordered
+
+    def _is_stale(self, entry: Dict) -> bool:
+        """Check whether a selector missed on each of its last skip_after attempts."""
+        return bool(self.skip_after) and entry['misses_since_hit'] >= self.skip_after
+
+    def record(self, field: str, selector: str, hit: bool, elapsed: float) -> None:
+        """
+        Record one selector attempt.
+
+        Args:
+            field: Business field the selector extracts
+            selector: The selector that was tried
+            hit: Whether it produced a value
+            elapsed: Seconds the attempt took
+        """
+        elapsed_ms = elapsed * 1000
+        with self._lock:
+            entry = self._selector_entry(field, selector)
+            entry['attempts'] += 1
+            entry['total_ms'] += elapsed_ms
+            if hit:
+                entry['hits'] += 1
+                entry['hit_ms'] += elapsed_ms
+                entry['misses_since_hit'] = 0
+                entry['last_hit_at'] = time.time()
+            else:
+                entry['misses_since_hit'] += 1
+            self._unsaved += 1
+            autosave = self.autosave_every and self._unsaved >= self.autosave_every
+
+        if autosave:
+            self.save()
+
+    def get_stats(self) -> Dict:
+        """
+        Get statistics per field and selector for reporting.
+
+        Returns:
+            Dictionary {field: {'pages': int, 'selectors': [...]}} with selectors best first
+        """
+        with self._lock:
+            report = {}
+            for field, field_entry in self.fields.items():
+                selectors = []
+                for selector, entry in field_entry['selectors'].items():
+                    attempts = entry['attempts']
+                    selectors.append({
+                        'selector': selector,
+                        'attempts': attempts,
+                        'hits': entry['hits'],
+                        'hit_rate': round(entry['hits'] / attempts * 100, 1) if attempts else None,
+                        'avg_ms': round(entry['total_ms'] / attempts, 1) if attempts else None,
+                        'misses_since_hit': entry['misses_since_hit'],
+                        'last_hit_at': entry['last_hit_at'],
+                        'skipped': self._is_stale(entry)
+                    })
+                selectors.sort(key=lambda s: (-(s['hit_rate'] or 0), s['avg_ms'] or 0))
+                report[field] = {'pages': field_entry['pages'], 'selectors': selectors}
+            return report
+
+    def load(self) -> None:
+        """Load persisted statistics, if any."""
+        if not self.stats_file or not os.path.exists(self.stats_file):
+            return
+
+        try:
+            with open(self.stats_file, 'r') as f:
+                data = json.load(f)
+            with self._lock:
+                self.fields = data.get('fields', {})
+            self.logger.info(f"Loaded selector stats for {len(self.fields)} fields from {self.stats_file}")
+        except Exception as e:
+            self.logger.warning(f"Could not load selector stats: {e}")
+
+    def save(self) -> None:
+        """Persist statistics to disk (atomic replace)."""
+        if not self.stats_file:
+            return
+
+        try:
+            with self._lock:
+                data = json.dumps({'fields': self.fields})
+                self._unsaved = 0
+            tmp_file = self.stats_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                f.write(data)
+            os.replace(tmp_file, self.stats_file)
+        except Exception as e:
+            self.logger.warning(f"Could not save selector stats: {e}")
@@ -0,0 +1,127 @@
+"""
+Session Store Module
+Persists Playwright storage state (cookies and localStorage) per proxy so new browsers start warm.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+
+class SessionStore:
+    """Per-proxy storage_state files with expiry and CAPTCHA invalidation."""
+
+    def __init__(self, directory: str = 'sessions', max_age: float = 6 * 3600):
+        """
+        Initialize the session store.
+
+        Args:
+            directory: Directory holding one storage_state JSON file per proxy
+            max_age: Seconds after the last save before a session is considered stale
+        """
+        self.directory = directory
+        self.max_age = max_age
+        self.logger = logging.getLogger(__name__)
+
+        self.loaded = 0
+        self.saved = 0
+        self.expired = 0
+        self.invalidated = 0
+        self._lock = threading.Lock()
+
+    def path_for(self, proxy_key: str) -> str:
+        """Get the storage_state file path for a proxy."""
+        safe_key = re.sub(r'[^A-Za-z0-9._-]', '_', proxy_key)
+        return os.path.join(self.directory, f'{safe_key}.json')
+
+    def load(self, proxy_key: str) -> Optional[str]:
+        """
+        Get the saved session for a proxy, if it is still fresh.
+
+        Args:
+            proxy_key: Proxy identifier ("ip:port")
+
+        Returns:
+            Path to pass as storage_state to new_context, or None to start cold
+        """
+        path = self.path_for(proxy_key)
+        try:
+            age = time.time() - os.path.getmtime(path)
+        except OSError:
+            return None
+
+        if age > self.max_age:
+            self.logger.info(f"Session for {proxy_key} expired ({age / 3600:.1f}h old)")
+            self._remove(path)
+            with self._lock:
+                self.expired += 1
+            return None
+
+        with self._lock:
+            self.loaded += 1
+        self.logger.info(f"Reusing saved session for {proxy_key}")
+        return path
+
+    async def save(self, context, proxy_key: str) -> bool:
+        """
+        Save a browser context's storage state for a proxy (atomic replace).
+
+        Args:
+            context: Playwright browser context
+            proxy_key: Proxy identifier ("ip:port")
+
+        Returns:
+            True if saved, False otherwise
+        """
+        path = self.path_for(proxy_key)
+        tmp_path = path + '.tmp'
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            await context.storage_state(path=tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.warning(f"Could not save session for {proxy_key}: {e}")
+            return False
+
+        with self._lock:
+            self.saved += 1
+        return True
+
+    def invalidate(self, proxy_key: str) -> None:
+        """
+        Drop the saved session for a proxy (e.g. after a CAPTCHA).
+
+        Args:
+            proxy_key: Proxy identifier ("ip:port")
+        """
+        if self._remove(self.path_for(proxy_key)):
+            self.logger.info(f"Invalidated saved session for {proxy_key}")
+            with self._lock:
+                self.invalidated += 1
+
+    def _remove(self, path: str) -> bool:
+        """Remove a session file, returning True if it existed."""
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def get_stats(self) -> Dict:
+        """Get session reuse statistics for status reporting."""
+        try:
+            stored = len([name for name in os.listdir(self.directory) if name.endswith('.json')])
+        except OSError:
+            stored = 0
+
+        with self._lock:
+            return {
+                'stored': stored,
+                'loaded': self.loaded,
+                'saved': self.saved,
+                'expired': self.expired,
+                'invalidated': self.invalidated
+            }
@@ -0,0 +1,631 @@
+"""
+Simulator Module
+Discrete-event simulation of scraping jobs: the real scraper, proxy rotation, health,
+retry, concurrency and hedging code runs against a fake browser layer with configurable
+latency, failure and CAPTCHA distributions, on an event loop with a virtual clock.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import selectors
+import tempfile
+import time
+import zlib
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from playwright.async_api import TimeoutError as PlaywrightTimeout
+
+# Default world: mostly good proxies, a few slow ones and one that is being blocked
+DEFAULT_SCENARIO = {
+    'proxies': [
+        {'count': 6, 'latency': 2.5, 'sigma': 0.5, 'failure_rate': 0.02, 'error_rate': 0.01, 'captcha_rate': 0.005},
+        {'count': 3, 'latency': 6.0, 'sigma': 0.8, 'failure_rate': 0.08, 'error_rate': 0.02, 'captcha_rate': 0.02},
+        {'count': 1, 'latency': 4.0, 'sigma': 1.0, 'failure_rate': 0.4, 'error_rate': 0.1, 'captcha_rate': 0.15}
+    ],
+    'results_per_query': [20, 60],  # Businesses in a result list (min, max)
+    'page_size': 20,  # Result cards loaded per scroll
+    'launch_latency': 1.5,  # Seconds to launch a browser
+    'tab_open_latency': 0.2,  # Seconds to open a tab
+    'element_latency': 0.05,  # Seconds for a selector that is on the page
+    'captcha_safe_rate': 30,  # Navigations per minute a proxy can make without extra CAPTCHAs
+    'captcha_pressure': 0.01  # Extra CAPTCHA probability per navigation/minute above the safe rate
+}
+
+# Policies compared by default: Config overrides, plus MAX_RETRIES for scrape_query
+DEFAULT_POLICIES = {
+    'fixed': {'ADAPTIVE_CONCURRENCY': False, 'HEDGE_REQUESTS': False, 'HEALTH_WEIGHTED_PROXIES': False},
+    'adaptive': {'ADAPTIVE_CONCURRENCY': True, 'HEDGE_REQUESTS': False, 'HEALTH_WEIGHTED_PROXIES': True},
+    'adaptive-hedged': {'ADAPTIVE_CONCURRENCY': True, 'HEDGE_REQUESTS': True, 'HEALTH_WEIGHTED_PROXIES': True}
+}
+
+# Features that touch the disk, the network or worker threads are off in simulations
+SIMULATION_CONFIG = {
+    'ASSET_CACHE': False,
+    'PERSIST_SESSIONS': False,
+    'ARCHIVE_PAGES': False,
+    'FAST_PLACE_FETCH': False,
+    'BANDWIDTH_METERING': False,
+    'SHARED_RATE_LIMITS': False,
+    'BROWSER_RECYCLE_RSS_MB': 0,
+    'EXTRACTION_MODE': 'tab'
+}
+
+# Fields extracted by simulated jobs (no website, so no email site visits)
+DEFAULT_FIELDS = ('name', 'full_address', 'phone', 'rating', 'review_count', 'category')
+
+SEARCH_SELECTORS = ('[role="feed"]', 'input[id="searchboxinput"]', 'button[id="searchbox-searchbutton"]')
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    """Get the nearest-rank percentile of a list of values (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)], 3)
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """Selector that skips idle waits by advancing the loop's virtual clock."""
+
+    loop = None
+
+    def select(self, timeout=None):
+        events = super().select(0)
+        if events or timeout == 0:
+            return events
+        if timeout is None:
+            # Nothing scheduled: only another thread can wake the loop
+            return super().select(None)
+        self.loop.advance(timeout)
+        return []
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop whose clock only moves when every task is waiting.
+
+    Sleeps, wait timeouts and deadlines complete in order without taking real
+    time, so hours of scraping run in the CPU time the code itself needs.
+    """
+
+    def __init__(self):
+        self._virtual_now = 0.0
+        selector = _VirtualSelector()
+        selector.loop = self
+        super().__init__(selector)
+
+    def time(self) -> float:
+        return self._virtual_now
+
+    def advance(self, seconds: float) -> None:
+        """Move the virtual clock forward."""
+        self._virtual_now += max(0.0, seconds)
+
+
+class SimulatedMaps:
+    """
+    The simulated side of the proxies: navigation latency, failures and CAPTCHAs per proxy,
+    result lists per query, and counters for everything the scraper asked for.
+    """
+
+    def __init__(self, scenario: Optional[Dict] = None, seed: int = 0):
+        """
+        Initialize the world.
+
+        Args:
+            scenario: Overrides of DEFAULT_SCENARIO
+            seed: Random seed (same seed, same world)
+        """
+        self.scenario = dict(DEFAULT_SCENARIO, **(scenario or {}))
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        self.profiles: Dict[str, Dict] = {}
+        for profile in self.scenario['proxies']:
+            for _ in range(profile.get('count', 1)):
+                index = len(self.profiles)
+                self.profiles[f"10.0.{index // 250}.{index % 250 + 1}:8000"] = profile
+
+        self.recent: Dict[str, deque] = {}
+        self.outcomes: Counter = Counter()
+        self.per_proxy: Dict[str, Counter] = {}
+        self.navigations = 0
+        self.launches = 0
+        self.tab_latencies: List[float] = []
+
+    def write_proxy_file(self, path: str) -> None:
+        """Write the simulated proxies in the proxy file format (IP:PORT:USERNAME:PASSWORD)."""
+        with open(path, 'w') as f:
+            for key in self.profiles:
+                f.write(f"{key}:sim:sim\n")
+
+    def result_count(self, query: str) -> int:
+        """Get the number of businesses in a query's result list (the same for every run with this seed)."""
+        low, high = self.scenario['results_per_query']
+        return random.Random(f"{self.seed}:{query}").randint(low, high)
+
+    @staticmethod
+    def business_url(query: str, index: int) -> str:
+        """Get the detail URL of a business in a query's result list."""
+        query_id = zlib.crc32(query.encode())
+        return (f"https://www.google.com/maps/place/Business+{query_id % 10000}-{index}"
+                f"/data=!4m2!3m1!1s0x{query_id:x}:0x{index:x}")
+
+    def _captcha_rate(self, key: str, now: float) -> float:
+        """Get the CAPTCHA probability of a navigation, rising with the proxy's recent request rate."""
+        recent = self.recent.setdefault(key, deque())
+        recent.append(now)
+        while recent and recent[0] <= now - 60:
+            recent.popleft()
+        excess = max(0, len(recent) - self.scenario['captcha_safe_rate'])
+        return min(1.0, self.profiles[key]['captcha_rate'] + excess * self.scenario['captcha_pressure'])
+
+    def _record(self, key: str, outcome: str) -> None:
+        self.outcomes[outcome] += 1
+        self.per_proxy.setdefault(key, Counter())[outcome] += 1
+
+    async def navigate(self, key: str, timeout_ms: Optional[float]) -> bool:
+        """
+        Simulate a navigation through a proxy.
+
+        Args:
+            key: Proxy identifier ("ip:port")
+            timeout_ms: Navigation timeout in milliseconds
+
+        Returns:
+            True if Google answered with a CAPTCHA
+
+        Raises:
+            PlaywrightTimeout: The page did not load within the timeout
+            Exception: The connection failed
+        """
+        profile = self.profiles[key]
+        timeout = (timeout_ms or 30000) / 1000
+        self.navigations += 1
+        captcha_rate = self._captcha_rate(key, asyncio.get_running_loop().time())
+        draw = self.rng.random()
+        latency = self.rng.lognormvariate(math.log(profile['latency']), profile.get('sigma', 0.5))
+        try:
+            if draw < profile['failure_rate'] or latency > timeout:
+                await asyncio.sleep(timeout)
+                self._record(key, 'timeout')
+                raise PlaywrightTimeout(f"Timeout {timeout_ms}ms exceeded.")
+            if draw < profile['failure_rate'] + profile.get('error_rate', 0):
+                await asyncio.sleep(min(latency, 1.0))
+                self._record(key, 'error')
+                raise Exception('net::ERR_TUNNEL_CONNECTION_FAILED')
+            await asyncio.sleep(latency)
+        except asyncio.CancelledError:
+            self._record(key, 'cancelled')
+            raise
+        captcha = self.rng.random() < captcha_rate
+        self._record(key, 'captcha' if captcha else 'ok')
+        return captcha
+
+
+class FakeLocator:
+    """Playwright locator stand-in (only the calls the scraper makes)."""
+
+    def __init__(self, page: 'FakePage', selector: str):
+        self.page = page
+        self.selector = selector
+
+    @property
+    def first(self) -> 'FakeLocator':
+        return self
+
+    async def wait_for(self, state: Optional[str] = None, timeout: Optional[float] = None) -> None:
+        await self.page._find(self.selector, timeout)
+
+    async def fill(self, value: str, timeout: Optional[float] = None) -> None:
+        await self.page._find(self.selector, timeout)
+        self.page.typed = value
+
+    async def click(self, timeout: Optional[float] = None) -> None:
+        await self.page._find(self.selector, timeout)
+        if self.selector == 'button[id="searchbox-searchbutton"]':
+            self.page.show_results(self.page.typed)
+
+    async def evaluate(self, script: str):
+        await self.page._find(self.selector, None)
+        if self.selector == '[role="feed"]':
+            self.page.scroll()
+
+    async def text_content(self, timeout: Optional[float] = None) -> str:
+        return await self.page._find(self.selector, timeout)
+
+    async def get_attribute(self, name: str, timeout: Optional[float] = None) -> str:
+        return await self.page._find(self.selector, timeout)
+
+
+class FakePage:
+    """Playwright page stand-in serving simulated search results and business detail pages."""
+
+    # Detail page elements the extractor reads, with a value template
+    DETAIL_ELEMENTS = {
+        'h1.DUwDvf': '{name}',
+        'h1': '{name}',
+        'h1[class*="fontHeadline"]': '{name}',
+        'div[role="main"] h1': '{name}',
+        'button[jsaction*="category"]': 'Restaurant',
+        'div.F7nice': '4.{digit}({reviews})',
+        'button[data-item-id="address"]': '{reviews} Main St, Springfield',
+        'button[data-item-id*="phone"]': '(555) 010-{reviews:04d}',
+        'a[data-item-id="authority"]': 'https://example.com/{reviews}'
+    }
+
+    def __init__(self, world: SimulatedMaps, context: 'FakeContext'):
+        self.world = world
+        self.context = context
+        self.url = 'about:blank'
+        self.kind = None
+        self.captcha = False
+        self.closed = False
+        self.typed = ''
+        self.query = None
+        self.loaded = 0
+        self.total = 0
+        self.default_timeout = 30000
+        self.opened_at = asyncio.get_running_loop().time()
+
+    def on(self, event: str, handler) -> None:
+        pass
+
+    def set_default_timeout(self, timeout: float) -> None:
+        self.default_timeout = timeout
+
+    async def goto(self, url: str, timeout: Optional[float] = None, wait_until: Optional[str] = None) -> None:
+        self.kind = 'detail' if '/maps/place/' in url else 'search'
+        self.captcha = False
+        self.loaded = 0
+        self.captcha = await self.world.navigate(self.context.proxy_key, timeout or self.default_timeout)
+        self.url = url
+
+    def show_results(self, query: str) -> None:
+        """Show the result list of a search (after the search button is clicked)."""
+        self.query = query
+        self.total = self.world.result_count(query)
+        self.url = f"https://www.google.com/maps/search/{query.replace(' ', '+')}"
+        self.scroll()
+
+    def scroll(self) -> None:
+        """Load the next page of result cards."""
+        self.loaded = min(self.total, self.loaded + self.world.scenario['page_size'])
+
+    def _element(self, selector: str) -> Optional[str]:
+        """Get the text of an element on the current page, or None if it is not there."""
+        if self.captcha:
+            return 'captcha' if 'captcha' in selector else None
+        if self.kind == 'search':
+            return '' if selector in SEARCH_SELECTORS else None
+        if self.kind == 'detail':
+            template = None
+            for part in selector.split(','):
+                template = template or self.DETAIL_ELEMENTS.get(part.strip())
+            if template is None:
+                return None
+            slug = self.url.split('/maps/place/')[1].split('/')[0]
+            reviews = zlib.crc32(slug.encode()) % 5000
+            return template.format(name=slug.replace('+', ' '), digit=reviews % 10, reviews=reviews)
+        return None
+
+    async def _find(self, selector: str, timeout: Optional[float]) -> str:
+        """Wait for an element like Playwright does: quickly if it is there, the whole timeout if not."""
+        element_latency = self.world.scenario['element_latency']
+        await asyncio.sleep(element_latency)
+        text = self._element(selector)
+        if text is None:
+            await asyncio.sleep(max(0.0, (timeout or self.default_timeout) / 1000 - element_latency))
+            raise PlaywrightTimeout(f"Timeout {timeout}ms exceeded waiting for {selector}")
+        return text
+
+    def locator(self, selector: str) -> FakeLocator:
+        return FakeLocator(self, selector)
+
+    async def wait_for_selector(self, selector: str, timeout: Optional[float] = None, state: Optional[str] = None):
+        return await self._find(selector, timeout)
+
+    async def query_selector(self, selector: str):
+        return self._element(selector) if self.captcha else None
+
+    async def eval_on_selector_all(self, selector: str, script: str) -> List[Dict]:
+        await asyncio.sleep(self.world.scenario['element_latency'])
+        if self.captcha or self.query is None:
+            return []
+        cards = []
+        for index in range(self.loaded):
+            url = self.world.business_url(self.query, index)
+            cards.append({
+                'url': url,
+                'name': url.split('/maps/place/')[1].split('/')[0].replace('+', ' '),
+                'rating_label': '4.5 stars 120 Reviews',
+                'text': ''
+            })
+        return cards
+
+    async def content(self) -> str:
+        return '<html></html>'
+
+    async def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        if self.kind == 'detail':
+            self.world.tab_latencies.append(asyncio.get_running_loop().time() - self.opened_at)
+
+
+class FakeContext:
+    """Browser context stand-in; its pages navigate through one proxy."""
+
+    def __init__(self, world: SimulatedMaps, proxy_key: str):
+        self.world = world
+        self.proxy_key = proxy_key
+
+    async def new_page(self, **kwargs) -> FakePage:
+        await asyncio.sleep(self.world.scenario['tab_open_latency'])
+        return FakePage(self.world, self)
+
+    async def close(self) -> None:
+        pass
+
+
+class FakeBrowser:
+    """Browser stand-in launched with a proxy."""
+
+    def __init__(self, world: SimulatedMaps, proxy_key: str):
+        self.world = world
+        self.proxy_key = proxy_key
+
+    async def new_context(self, viewport: Optional[Dict] = None, storage_state=None,
+                          proxy: Optional[Dict] = None) -> FakeContext:
+        return FakeContext(self.world, _proxy_key(proxy) if proxy else self.proxy_key)
+
+    async def new_page(self, **kwargs) -> FakePage:
+        return await FakeContext(self.world, self.proxy_key).new_page()
+
+    async def close(self) -> None:
+        pass
+
+
+class FakePlaywright:
+    """Playwright stand-in assigned to GoogleMapsScraper.playwright."""
+
+    def __init__(self, world: SimulatedMaps):
+        self.world = world
+        self.chromium = self
+
+    async def launch(self, headless: bool = True, proxy: Optional[Dict] = None) -> FakeBrowser:
+        await asyncio.sleep(self.world.scenario['launch_latency'])
+        self.world.launches += 1
+        return FakeBrowser(self.world, _proxy_key(proxy))
+
+    async def stop(self) -> None:
+        pass
+
+
+def _proxy_key(proxy: Dict) -> str:
+    """Get "ip:port" from a Playwright proxy setting."""
+    return proxy['server'].split('://')[-1]
+
+
+@contextmanager
+def _config_overrides(overrides: Dict):
+    """Temporarily set Config attributes (the scraper reads them at construction and per query)."""
+    from config import Config
+    missing = object()
+    saved = {name: getattr(Config, name, missing) for name in overrides}
+    for name, value in overrides.items():
+        setattr(Config, name, value)
+    try:
+        yield Config
+    finally:
+        for name, value in saved.items():
+            if value is missing:
+                delattr(Config, name)
+            else:
+                setattr(Config, name, value)
+
+
+async def _run_job(world: SimulatedMaps, queries: List[Dict], proxy_file: str,
+                   max_retries: int, fields) -> Dict:
+    """Run a job through the real scraper on the simulated world."""
+    from config import Config
+    from modules.data_extractor import DataExtractor
+    from modules.proxy_manager import ProxyManager
+    from modules.scraper import GoogleMapsScraper
+    from modules.utils import ProxyHealthMonitor
+
+    loop = asyncio.get_running_loop()
+    health_monitor = ProxyHealthMonitor(
+        half_life=Config.PROXY_HEALTH_HALF_LIFE,
+        failure_threshold=Config.PROXY_FAILURE_THRESHOLD,
+        cooldown=Config.PROXY_COOLDOWN,
+        max_cooldown=Config.PROXY_MAX_COOLDOWN,
+        clock=loop.time
+    )
+    proxy_manager = ProxyManager(
+        proxy_file=proxy_file,
+        rotation_threshold=Config.ROTATION_THRESHOLD,
+        health_monitor=health_monitor,
+        weighted_rotation=Config.HEALTH_WEIGHTED_PROXIES,
+        max_users_per_proxy=Config.MAX_USERS_PER_PROXY
+    )
+    scraper = GoogleMapsScraper(proxy_manager=proxy_manager, headless=True)
+    scraper.playwright = FakePlaywright(world)
+    if scraper.rate_limiter:
+        scraper.rate_limiter.clock = loop.time
+    if scraper.concurrency:
+        # Simulated browsers put no load on this host
+        scraper.concurrency.cpu_limit = scraper.concurrency.memory_limit = float('inf')
+    scraper.set_job_options({'fields': list(fields)})
+
+    delivered = set()
+    query_latencies = []
+    failed_queries = 0
+    saved_timeouts = DataExtractor.timeouts
+    DataExtractor.timeouts = scraper.timeouts
+    try:
+        for query in queries:
+            started = loop.time()
+            businesses = await scraper.scrape_query(
+                query, csv_callback=lambda business: delivered.add(business.get('url')), max_retries=max_retries
+            )
+            query_latencies.append(loop.time() - started)
+            if not businesses:
+                failed_queries += 1
+            # Same pacing as the job loop in app.py
+            if not scraper.rate_limiter:
+                await asyncio.sleep(Config.DELAY_BETWEEN_QUERIES)
+        await scraper.cleanup()
+    finally:
+        DataExtractor.timeouts = saved_timeouts
+
+    return {
+        'virtual_seconds': loop.time(),
+        'businesses': len(delivered),
+        'failed_queries': failed_queries,
+        'query_latencies': query_latencies,
+        'hedging': scraper.hedging.get_stats() if scraper.hedging else None,
+        'concurrency': scraper.concurrency.get_stats()['current'] if scraper.concurrency else None,
+        'tabs_killed': scraper.supervisor.tabs_killed
+    }
+
+
+def simulate(policy: Optional[Dict] = None, scenario: Optional[Dict] = None, queries: int = 20,
+             seed: int = 0, fields=DEFAULT_FIELDS, quiet: bool = True) -> Dict:
+    """
+    Simulate a job under a scheduling/proxy policy.
+
+    The real GoogleMapsScraper, ProxyManager and ProxyHealthMonitor run on a
+    VirtualClockLoop against FakePlaywright. Config is patched while the
+    simulation runs, so do not run it inside a process that is scraping.
+
+    Args:
+        policy: Config overrides (e.g. {'PARALLEL_TABS': 8, 'HEDGE_REQUESTS': True}),
+            plus 'MAX_RETRIES' for the retries of each query
+        scenario: Overrides of DEFAULT_SCENARIO
+        queries: Number of search queries in the job
+        seed: Random seed for the world and for proxy selection
+        fields: Fields the simulated job extracts
+        quiet: Silence scraper logging during the run
+
+    Returns:
+        Report with businesses, throughput (businesses per virtual hour), tab and
+        query latency percentiles, navigations, wasted requests, outcome counts
+        and the real CPU seconds the simulation took
+    """
+    policy = dict(policy or {})
+    max_retries = policy.pop('MAX_RETRIES', 3)
+    world = SimulatedMaps(scenario, seed)
+    job = [{'keyword': 'restaurants', 'zip_code': str(10001 + index)} for index in range(queries)]
+
+    random_state = random.getstate()
+    random.seed(seed)
+    logging_disabled = logging.root.manager.disable
+    if quiet:
+        logging.disable(logging.CRITICAL)
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    loop = VirtualClockLoop()
+    try:
+        with _config_overrides(dict(SIMULATION_CONFIG, **policy)), tempfile.TemporaryDirectory() as directory:
+            proxy_file = os.path.join(directory, 'proxies.txt')
+            world.write_proxy_file(proxy_file)
+            result = loop.run_until_complete(_run_job(world, job, proxy_file, max_retries, fields))
+    finally:
+        loop.close()
+        logging.disable(logging_disabled)
+        random.setstate(random_state)
+
+    # One search per successful query and one detail page per business were needed; the rest was waste
+    useful = result['businesses'] + queries - result['failed_queries']
+    hours = result['virtual_seconds'] / 3600
+    return {
+        'queries': queries,
+        'failed_queries': result['failed_queries'],
+        'businesses': result['businesses'],
+        'virtual_seconds': round(result['virtual_seconds'], 1),
+        'businesses_per_hour': round(result['businesses'] / hours, 1) if hours else 0.0,
+        'tab_latency': {f"p{pct}": _percentile(world.tab_latencies, pct) for pct in (50, 95, 99)},
+        'query_latency': {f"p{pct}": _percentile(result['query_latencies'], pct) for pct in (50, 95, 100)},
+        'navigations': world.navigations,
+        'wasted_requests': max(0, world.navigations - useful),
+        'outcomes': dict(world.outcomes),
+        'browser_launches': world.launches,
+        'tabs_killed': result['tabs_killed'],
+        'hedging': result['hedging'],
+        'concurrency': result['concurrency'],
+        'proxies': {key: dict(counts) for key, counts in sorted(world.per_proxy.items())},
+        'cpu_seconds': round(time.process_time() - cpu_started, 3),
+        'wall_seconds': round(time.perf_counter() - wall_started, 3)
+    }
+
+
+def compare(policies: Optional[Dict[str, Dict]] = None, scenario: Optional[Dict] = None,
+            queries: int = 20, seed: int = 0) -> Dict[str, Dict]:
+    """
+    Simulate the same job and world under several policies.
+
+    Args:
+        policies: Policy name -> policy (see simulate); defaults to DEFAULT_POLICIES
+        scenario: Overrides of DEFAULT_SCENARIO
+        queries: Number of search queries in the job
+        seed: Random seed shared by every policy
+
+    Returns:
+        Policy name -> report
+    """
+    return {
+        name: simulate(policy, scenario, queries=queries, seed=seed)
+        for name, policy in (policies or DEFAULT_POLICIES).items()
+    }
+
+
+def format_reports(reports: Dict[str, Dict]) -> str:
+    """Format simulation reports as a table, one policy per row."""
+    header = (f"{'policy':<18}{'biz':>6}{'biz/h':>9}{'tab p50':>9}{'tab p95':>9}{'tab p99':>9}"
+              f"{'navs':>7}{'wasted':>8}{'captcha':>8}{'cpu s':>8}")
+    lines = [header]
+    for name, report in reports.items():
+        latency = report['tab_latency']
+        lines.append(
+            f"{name:<18}{report['businesses']:>6}{report['businesses_per_hour']:>9.0f}"
+            f"{latency['p50'] or 0:>9.1f}{latency['p95'] or 0:>9.1f}{latency['p99'] or 0:>9.1f}"
+            f"{report['navigations']:>7}{report['wasted_requests']:>8}"
+            f"{report['outcomes'].get('captcha', 0):>8}{report['cpu_seconds']:>8.2f}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point for policy simulations."""
+    parser = argparse.ArgumentParser(description='Compare scraping policies on a simulated Google Maps.')
+    parser.add_argument('-q', '--queries', type=int, default=20, help='Search queries per simulated job')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--policies', help='JSON file: {"name": {"CONFIG_NAME": value, ...}, ...}')
+    parser.add_argument('--scenario', help='JSON file overriding the default latency/failure/CAPTCHA scenario')
+    parser.add_argument('--json', action='store_true', help='Print full reports as JSON')
+    args = parser.parse_args(argv)
+
+    policies = None
+    if args.policies:
+        with open(args.policies, 'r') as f:
+            policies = json.load(f)
+    scenario = None
+    if args.scenario:
+        with open(args.scenario, 'r') as f:
+            scenario = json.load(f)
+
+    reports = compare(policies, scenario, queries=args.queries, seed=args.seed)
+    print(json.dumps(reports, indent=2) if args.json else format_reports(reports))
+
+
+if __name__ == '__main__':
+    main()
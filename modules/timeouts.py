@@ -0,0 +1,150 @@
+"""
+Timeouts Module
+Derives operation timeouts at runtime from rolling latency histograms per operation and proxy.
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+
+# Default, minimum and maximum timeout in milliseconds per operation type.
+# The default is used until enough latency samples have been recorded.
+OPERATION_BOUNDS: Dict[str, Tuple[int, int, int]] = {
+    'page_load': (30000, 5000, 60000),      # Maps home / results page navigation
+    'request': (15000, 2000, 30000),        # Waiting for search box, results feed, card clicks
+    'detail_load': (20000, 4000, 45000),    # Business detail page navigation
+    'detail_ready': (3000, 500, 10000),     # Business name heading on a loaded detail page
+    'selector': (3000, 1000, 5000),         # One detail field selector (floor keeps fields of slower pages)
+    'email_page': (3000, 1000, 10000),      # Business website page during email harvesting
+}
+
+
+class AdaptiveTimeouts:
+    """Rolling latency histograms per (operation, proxy) that turn p99 latency into timeouts."""
+
+    def __init__(self, percentile: float = 99, factor: float = 2.0, min_samples: int = 20,
+                 window: int = 200, timeout_tolerance: float = 0.05, timeout_backoff: float = 1.5,
+                 bounds: Optional[Dict[str, Tuple[int, int, int]]] = None):
+        """
+        Initialize adaptive timeouts.
+
+        Args:
+            percentile: Latency percentile the timeout is derived from
+            factor: Multiplier applied to the percentile
+            min_samples: Samples needed before the default timeout is replaced
+            window: Number of recent outcomes kept per operation and proxy
+            timeout_tolerance: Timeout rate above which the derived timeout is widened
+            timeout_backoff: Multiplier applied when the timeout rate is above tolerance
+            bounds: Per-operation (default, min, max) milliseconds (defaults to OPERATION_BOUNDS)
+        """
+        self.percentile = percentile
+        self.factor = factor
+        self.min_samples = min_samples
+        self.window = window
+        self.timeout_tolerance = timeout_tolerance
+        self.timeout_backoff = timeout_backoff
+        self.bounds = dict(OPERATION_BOUNDS)
+        self.bounds.update(bounds or {})
+        self.logger = logging.getLogger(__name__)
+
+        # {(operation, key): deque of latency seconds, or None for a timeout}
+        self.samples: Dict[Tuple[str, Optional[str]], deque] = {}
+        self._lock = threading.Lock()
+
+    def _window(self, operation: str, key: Optional[str]) -> deque:
+        """Get (or create) the outcome window for an operation and proxy."""
+        return self.samples.setdefault((operation, key), deque(maxlen=self.window))
+
+    def record(self, operation: str, key: Optional[str], elapsed: float) -> None:
+        """
+        Record a successful operation.
+
+        Samples are pooled per operation as well, so operations that have no
+        proxy context (selectors, email pages) still get a histogram.
+
+        Args:
+            operation: Operation type (see OPERATION_BOUNDS)
+            key: Proxy identifier, or None
+            elapsed: Seconds the operation took
+        """
+        with self._lock:
+            self._window(operation, None).append(elapsed)
+            if key is not None:
+                self._window(operation, key).append(elapsed)
+
+    def record_timeout(self, operation: str, key: Optional[str]) -> None:
+        """
+        Record an operation that timed out.
+
+        Args:
+            operation: Operation type (see OPERATION_BOUNDS)
+            key: Proxy identifier, or None
+        """
+        with self._lock:
+            self._window(operation, None).append(None)
+            if key is not None:
+                self._window(operation, key).append(None)
+
+    def get(self, operation: str, key: Optional[str] = None, default: Optional[int] = None) -> int:
+        """
+        Get the timeout for an operation in milliseconds.
+
+        Uses the proxy's own histogram when it has enough samples, then the
+        pooled histogram for the operation, then the default.
+
+        Args:
+            operation: Operation type (see OPERATION_BOUNDS)
+            key: Proxy identifier, or None
+            default: Timeout in milliseconds to use until enough samples exist
+                (defaults to the operation's bound)
+
+        Returns:
+            Timeout in milliseconds
+        """
+        op_default, min_ms, max_ms = self.bounds.get(operation, (default or 30000, 0, float('inf')))
+        if default is None:
+            default = op_default
+
+        with self._lock:
+            for window_key in ((operation, key), (operation, None)):
+                outcomes = self.samples.get(window_key)
+                timeout = self._derive(outcomes) if outcomes else None
+                if timeout is not None:
+                    return int(min(max(timeout, min_ms), max_ms))
+        return int(default)
+
+    def _derive(self, outcomes: deque) -> Optional[float]:
+        """Derive a timeout in milliseconds from an outcome window, or None if too few samples."""
+        latencies = sorted(elapsed for elapsed in outcomes if elapsed is not None)
+        if len(latencies) < self.min_samples:
+            return None
+
+        index = min(len(latencies) - 1, int(len(latencies) * self.percentile / 100))
+        timeout = latencies[index] * 1000 * self.factor
+
+        # Latencies of operations that timed out are unknown; widen instead of guessing
+        timeout_rate = (len(outcomes) - len(latencies)) / len(outcomes)
+        if timeout_rate > self.timeout_tolerance:
+            timeout *= self.timeout_backoff
+        return timeout
+
+    def get_stats(self) -> Dict:
+        """Get current timeouts and sample counts per operation and proxy for status reporting."""
+        with self._lock:
+            keys = list(self.samples.keys())
+            counts = {
+                window_key: (len(outcomes), sum(1 for elapsed in outcomes if elapsed is None))
+                for window_key, outcomes in self.samples.items()
+            }
+
+        stats = {}
+        for operation, key in keys:
+            samples, timeouts = counts[(operation, key)]
+            stats.setdefault(operation, {})[key or 'all'] = {
+                'timeout_ms': self.get(operation, key),
+                'samples': samples,
+                'timeouts': timeouts
+            }
+        return stats
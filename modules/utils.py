@@ -6,6 +6,9 @@ Helper functions for deduplication, notifications, and data processing.
 import hashlib
 import logging
 import smtplib
+import threading
+import time
+from collections import deque
 import requests
 from typing import List, Dict, Optional
 from email.mime.text import MIMEText
@@ -187,10 +190,18 @@ Statistics:
 - Failed: {stats.get('failure_count', 0)}
 - Businesses Found: {stats.get('total_businesses', 0)}
 - Unique Businesses: {stats.get('unique_businesses', 0)}
-
+{self._format_bandwidth(stats.get('bandwidth'))}
 Results are ready for download.
         """.strip()
     
+    @staticmethod
+    def _format_bandwidth(bandwidth: Optional[Dict]) -> str:
+        """Format proxy traffic totals as a statistics line (empty if not metered)."""
+        if not bandwidth:
+            return ''
+        megabytes = bandwidth['total_bytes'] / (1024 * 1024)
+        return f"- Proxy Traffic: {megabytes:.1f} MB (cost: {bandwidth['cost']:.2f})\n"
+    
     def _send_email(self, subject: str, body: str) -> None:
         """Send email notification (requires SMTP configuration)."""
         try:
@@ -222,59 +233,363 @@ Results are ready for download.
 
 
 class ProxyHealthMonitor:
-    """Monitor proxy health and performance."""
+    """Monitor proxy health and performance, with time-decayed scores and a per-proxy circuit breaker."""
+    
+    # Latency samples kept per proxy for percentiles
+    LATENCY_WINDOW = 100
     
-    def __init__(self):
-        """Initialize proxy health monitor."""
+    def __init__(self, half_life: float = 600, failure_threshold: int = 3,
+                 cooldown: float = 60, max_cooldown: float = 900,
+                 latency_scale: float = 10.0, clock=time.time,
+                 store=None, flush_interval: float = 30, timeseries=None):
+        """
+        Initialize proxy health monitor.
+        
+        Args:
+            half_life: Seconds after which an outcome counts half as much in the score
+            failure_threshold: Consecutive failures that open a proxy's circuit
+            cooldown: Seconds a proxy is skipped after its circuit opens (doubles on each re-trip)
+            max_cooldown: Upper bound on the cooldown
+            latency_scale: Latency in seconds that halves a proxy's selection weight
+            clock: Time source (wall-clock seconds, so saved state decays across restarts)
+            store: Optional ProxyHealthStore; saved state is loaded now and changes are written back
+            flush_interval: Minimum seconds between automatic writes to the store
+            timeseries: Optional ProxyTimeSeries that also receives every outcome (per-minute trends)
+        """
+        self.half_life = half_life
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.latency_scale = latency_scale
+        self.clock = clock
+        self.store = store
+        self.flush_interval = flush_interval
+        self.timeseries = timeseries
         self.proxy_stats = {}
+        self._dirty = set()
+        self._last_flush = clock()
+        self._lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
+        
+        if self.store:
+            self._load()
     
-    def record_success(self, proxy_id: str) -> None:
-        """Record a successful request for a proxy."""
-        if proxy_id not in self.proxy_stats:
-            self.proxy_stats[proxy_id] = {
+    def _get_entry(self, proxy_id: str, now: float) -> Dict:
+        """Get a proxy's stats entry, decaying its weighted outcomes to now (lock held)."""
+        stats = self.proxy_stats.get(proxy_id)
+        if stats is None:
+            stats = self.proxy_stats[proxy_id] = {
                 'success': 0,
                 'failure': 0,
                 'total': 0,
-                'success_rate': 0.0
+                'success_rate': 0.0,
+                'latency': None,
+                'consecutive_failures': 0,
+                'trips': 0,
+                'open_until': 0.0,
+                'captchas': 0,
+                'last_failure_at': None,
+                'probe': None,
+                '_weighted_success': 0.0,
+                '_weighted_failure': 0.0,
+                '_weighted_captcha': 0.0,
+                '_latency_samples': deque(maxlen=self.LATENCY_WINDOW),
+                '_updated_at': now
             }
         
-        self.proxy_stats[proxy_id]['success'] += 1
-        self.proxy_stats[proxy_id]['total'] += 1
-        self._update_success_rate(proxy_id)
+        decay = self._decay(stats, now)
+        stats['_weighted_success'] *= decay
+        stats['_weighted_failure'] *= decay
+        stats['_weighted_captcha'] *= decay
+        stats['_updated_at'] = now
+        self._dirty.add(proxy_id)
+        return stats
+    
+    def _decay(self, stats: Dict, now: float) -> float:
+        """Get the factor a stats entry's weighted outcomes have decayed by since its last update."""
+        elapsed = now - stats['_updated_at']
+        if elapsed > 0 and self.half_life:
+            return 0.5 ** (elapsed / self.half_life)
+        return 1.0
+    
+    def _load(self) -> None:
+        """Restore saved proxy state from the store."""
+        states = self.store.load()
+        with self._lock:
+            for proxy_id, state in states.items():
+                self.proxy_stats[proxy_id] = {
+                    'success': int(state['success'] or 0),
+                    'failure': int(state['failure'] or 0),
+                    'total': int(state['total'] or 0),
+                    'success_rate': 0.0,
+                    'latency': state['latency'],
+                    'consecutive_failures': int(state['consecutive_failures'] or 0),
+                    'trips': int(state['trips'] or 0),
+                    'open_until': state['open_until'] or 0.0,
+                    'captchas': int(state['captchas'] or 0),
+                    'last_failure_at': state['last_failure_at'],
+                    'probe': None,
+                    '_weighted_success': state['weighted_success'] or 0.0,
+                    '_weighted_failure': state['weighted_failure'] or 0.0,
+                    '_weighted_captcha': state['weighted_captcha'] or 0.0,
+                    '_latency_samples': deque(state['latency_samples'], maxlen=self.LATENCY_WINDOW),
+                    '_updated_at': state['updated_at'] or self.clock()
+                }
+                self._update_success_rate(proxy_id)
+        if states:
+            self.logger.info(f"Loaded saved health for {len(states)} proxies")
+    
+    def flush(self) -> None:
+        """Write the proxies changed since the last flush to the store."""
+        if not self.store:
+            return
+        
+        with self._lock:
+            states = {}
+            for proxy_id in self._dirty:
+                stats = self.proxy_stats.get(proxy_id)
+                if stats is None:
+                    continue
+                states[proxy_id] = {
+                    'success': stats['success'],
+                    'failure': stats['failure'],
+                    'total': stats['total'],
+                    'captchas': stats['captchas'],
+                    'latency': stats['latency'],
+                    'latency_samples': list(stats['_latency_samples']),
+                    'weighted_success': stats['_weighted_success'],
+                    'weighted_failure': stats['_weighted_failure'],
+                    'weighted_captcha': stats['_weighted_captcha'],
+                    'consecutive_failures': stats['consecutive_failures'],
+                    'trips': stats['trips'],
+                    'open_until': stats['open_until'],
+                    'last_failure_at': stats['last_failure_at'],
+                    'updated_at': stats['_updated_at']
+                }
+            self._dirty.clear()
+            self._last_flush = self.clock()
+        
+        self.store.save(states)
+    
+    def _maybe_flush(self) -> None:
+        """Flush to the store when flush_interval has passed since the last write."""
+        if self.store and self.clock() - self._last_flush >= self.flush_interval:
+            self.flush()
+    
+    def record_success(self, proxy_id: str, latency: Optional[float] = None) -> None:
+        """
+        Record a successful request for a proxy.
+        
+        Args:
+            proxy_id: Proxy identifier ("ip:port")
+            latency: Seconds the request took, if measured
+        """
+        with self._lock:
+            stats = self._get_entry(proxy_id, self.clock())
+            stats['success'] += 1
+            stats['total'] += 1
+            stats['_weighted_success'] += 1
+            if latency is not None:
+                # Exponentially weighted moving average
+                stats['latency'] = latency if stats['latency'] is None else 0.8 * stats['latency'] + 0.2 * latency
+                stats['_latency_samples'].append(round(latency, 3))
+            
+            # A success closes the circuit
+            if stats['trips']:
+                self.logger.info(f"Proxy {proxy_id} recovered - circuit closed")
+            stats['consecutive_failures'] = 0
+            stats['trips'] = 0
+            stats['open_until'] = 0.0
+            self._update_success_rate(proxy_id)
+        if self.timeseries:
+            self.timeseries.record_request(proxy_id, True, latency)
+        self._maybe_flush()
     
     def record_failure(self, proxy_id: str) -> None:
-        """Record a failed request for a proxy."""
-        if proxy_id not in self.proxy_stats:
-            self.proxy_stats[proxy_id] = {
-                'success': 0,
-                'failure': 0,
-                'total': 0,
-                'success_rate': 0.0
-            }
+        """
+        Record a failed request for a proxy, opening its circuit after repeated failures.
+        
+        Args:
+            proxy_id: Proxy identifier ("ip:port")
+        """
+        with self._lock:
+            now = self.clock()
+            stats = self._get_entry(proxy_id, now)
+            self._count_failure(proxy_id, stats, now)
+            stats['consecutive_failures'] += 1
+            
+            # Half-open: the first request after a cooldown failed, so re-open at once
+            half_open = stats['trips'] and now >= stats['open_until']
+            if half_open or stats['consecutive_failures'] >= self.failure_threshold:
+                self._open_circuit(proxy_id, stats, now)
+        if self.timeseries:
+            self.timeseries.record_request(proxy_id, False)
+        self._maybe_flush()
+    
+    def record_captcha(self, proxy_id: str) -> None:
+        """
+        Record a CAPTCHA served through a proxy (the failed request is recorded separately).
         
-        self.proxy_stats[proxy_id]['failure'] += 1
-        self.proxy_stats[proxy_id]['total'] += 1
+        Args:
+            proxy_id: Proxy identifier ("ip:port")
+        """
+        with self._lock:
+            stats = self._get_entry(proxy_id, self.clock())
+            stats['captchas'] += 1
+            stats['_weighted_captcha'] += 1
+        if self.timeseries:
+            self.timeseries.record_captcha(proxy_id)
+    
+    def _count_failure(self, proxy_id: str, stats: Dict, now: float) -> None:
+        """Count a failure in the lifetime and decayed counters (lock held)."""
+        stats['failure'] += 1
+        stats['total'] += 1
+        stats['_weighted_failure'] += 1
+        stats['last_failure_at'] = now
         self._update_success_rate(proxy_id)
     
+    def _open_circuit(self, proxy_id: str, stats: Dict, now: float, reason: str = '') -> None:
+        """Open a proxy's circuit for a cooldown that doubles with each trip (lock held)."""
+        stats['trips'] += 1
+        cooldown = min(self.cooldown * 2 ** (stats['trips'] - 1), self.max_cooldown)
+        stats['open_until'] = now + cooldown
+        stats['consecutive_failures'] = 0
+        self.logger.warning(
+            f"Proxy {proxy_id} circuit opened for {cooldown:.0f}s (trip {stats['trips']})"
+            + (f": {reason}" if reason else '')
+        )
+    
+    def record_probe(self, proxy_id: str, ok: bool, latency: Optional[float] = None, error: str = '') -> None:
+        """
+        Record a pre-flight probe result.
+        
+        A passing probe only shows the proxy is reachable, not that Google serves
+        it, so it is kept with the probe result and leaves the counters and the
+        circuit alone; an open circuit still waits out its cooldown. A failing
+        probe quarantines the proxy at once instead of waiting for
+        failure_threshold failed requests.
+        
+        Args:
+            proxy_id: Proxy identifier ("ip:port")
+            ok: Whether the probe passed
+            latency: Seconds the probe took
+            error: Failure reason (e.g. 'timeout', 'auth_failed')
+        """
+        with self._lock:
+            now = self.clock()
+            stats = self._get_entry(proxy_id, now)
+            stats['probe'] = {
+                'ok': ok,
+                'latency': round(latency, 3) if latency is not None else None,
+                'error': error or None,
+                'at': now
+            }
+            if not ok:
+                self._count_failure(proxy_id, stats, now)
+                if now >= stats['open_until']:
+                    self._open_circuit(proxy_id, stats, now, reason=f"probe {error or 'failed'}")
+        self._maybe_flush()
+    
     def _update_success_rate(self, proxy_id: str) -> None:
         """Update success rate for a proxy."""
         stats = self.proxy_stats[proxy_id]
         if stats['total'] > 0:
             stats['success_rate'] = (stats['success'] / stats['total']) * 100
     
+    def is_available(self, proxy_id: str) -> bool:
+        """Check whether a proxy's circuit allows requests (closed, or cooldown over)."""
+        with self._lock:
+            stats = self.proxy_stats.get(proxy_id)
+            return not stats or self.clock() >= stats['open_until']
+    
+    def retry_at(self, proxy_id: str) -> float:
+        """Get the time a proxy's circuit allows requests again (0 if it is not open)."""
+        with self._lock:
+            stats = self.proxy_stats.get(proxy_id)
+            return stats['open_until'] if stats else 0.0
+    
+    def get_weight(self, proxy_id: str) -> float:
+        """
+        Get a proxy's selection weight.
+        
+        The weight is the time-decayed success rate (smoothed, so unknown proxies
+        start at 0.5) divided by a latency penalty.
+        
+        Args:
+            proxy_id: Proxy identifier ("ip:port")
+            
+        Returns:
+            Weight in (0, 1]
+        """
+        with self._lock:
+            stats = self.proxy_stats.get(proxy_id)
+            if stats is None:
+                return 0.5
+            # Decay a copy: reading a weight is not a change worth writing back
+            decay = self._decay(stats, self.clock())
+            weighted_success = stats['_weighted_success'] * decay
+            weighted_failure = stats['_weighted_failure'] * decay
+            rate = (weighted_success + 1) / (weighted_success + weighted_failure + 2)
+            latency = stats['latency'] or 0.0
+            return rate / (1 + latency / self.latency_scale)
+    
+    def forget(self, proxy_id: str) -> None:
+        """
+        Drop a proxy's state, in memory and in the store (e.g. removed from the proxy file).
+        
+        Args:
+            proxy_id: Proxy identifier ("ip:port")
+        """
+        with self._lock:
+            self.proxy_stats.pop(proxy_id, None)
+            self._dirty.discard(proxy_id)
+        if self.store:
+            self.store.forget(proxy_id)
+    
     def get_proxy_stats(self) -> Dict:
         """Get statistics for all proxies."""
-        return self.proxy_stats
+        now = self.clock()
+        with self._lock:
+            proxy_ids = list(self.proxy_stats)
+        
+        report = {}
+        for proxy_id in proxy_ids:
+            weight = self.get_weight(proxy_id)
+            with self._lock:
+                # Forgotten since the list was copied (removed from the proxy file and drained)
+                stats = self.proxy_stats.get(proxy_id)
+                if stats is None:
+                    continue
+                entry = {key: value for key, value in stats.items() if not key.startswith('_')}
+                weighted_success = stats['_weighted_success']
+                weighted_captcha = stats['_weighted_captcha']
+                weighted_total = weighted_success + stats['_weighted_failure']
+                latencies = sorted(stats['_latency_samples'])
+            
+            # Recent rates from the time-decayed counters; lifetime rate in success_rate
+            entry['recent_success_rate'] = round(weighted_success / weighted_total * 100, 1) if weighted_total else None
+            entry['captcha_rate'] = round(min(1.0, weighted_captcha / weighted_total) * 100, 1) if weighted_total else None
+            for percentile in (50, 95):
+                entry[f'latency_p{percentile}'] = (
+                    latencies[min(len(latencies) - 1, int(len(latencies) * percentile / 100))] if latencies else None
+                )
+            entry['latency'] = round(entry['latency'], 2) if entry['latency'] is not None else None
+            entry['score'] = round(weight, 3)
+            if not entry['trips']:
+                entry['circuit'] = 'closed'
+            else:
+                entry['circuit'] = 'open' if now < entry['open_until'] else 'half_open'
+            entry['cooldown_remaining'] = round(max(0.0, entry.pop('open_until') - now), 1)
+            report[proxy_id] = entry
+        return report
     
     def get_best_proxy(self) -> Optional[str]:
-        """Get the proxy with the highest success rate."""
-        if not self.proxy_stats:
-            return None
+        """Get the available proxy with the highest score."""
+        with self._lock:
+            proxy_ids = list(self.proxy_stats)
         
-        best_proxy = max(
-            self.proxy_stats.items(),
-            key=lambda x: (x[1]['success_rate'], x[1]['total'])
-        )
+        candidates = [proxy_id for proxy_id in proxy_ids if self.is_available(proxy_id)]
+        if not candidates:
+            return None
         
-        return best_proxy[0]
+        return max(candidates, key=self.get_weight)
@@ -0,0 +1,254 @@
+"""
+Adaptive Control Tests
+Checks the AIMD tab concurrency controller, latency-derived timeouts and hedged tabs.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from modules import concurrency
+from modules.concurrency import AIMDController
+from modules.data_extractor import DataExtractor
+from modules.hedging import HedgePolicy
+from modules.scraper import GoogleMapsScraper
+from modules.timeouts import AdaptiveTimeouts
+
+
+@pytest.fixture(autouse=True)
+def no_host_load(monkeypatch):
+    # Keep host load out of the decision so results do not depend on the test machine
+    monkeypatch.setattr(concurrency, 'psutil', None)
+
+
+def make_controller(**kwargs):
+    return AIMDController(initial=4, min_limit=1, max_limit=6, **kwargs)
+
+
+def test_aimd_increases_additively_when_healthy():
+    controller = make_controller(latency_target=10)
+
+    for _ in range(3):
+        for _ in range(controller.get_limit('proxy-a')):
+            controller.record('proxy-a', latency=2.0)
+        controller.adjust('proxy-a')
+
+    # 4 -> 5 -> 6 -> capped at 6
+    assert controller.get_limit('proxy-a') == 6
+
+
+def test_aimd_decreases_multiplicatively_on_errors():
+    controller = make_controller(error_threshold=0.2)
+
+    controller.record('proxy-a', latency=2.0)
+    controller.record('proxy-a', timeout=True)
+    controller.record('proxy-a', timeout=True)
+    assert controller.adjust('proxy-a') == 2
+
+    controller.record('proxy-a', captcha=True)
+    assert controller.adjust('proxy-a') == 1
+
+    controller.record('proxy-a', captcha=True)
+    assert controller.adjust('proxy-a') == 1
+
+
+def test_aimd_cuts_on_slow_median_latency_and_keeps_keys_separate():
+    controller = make_controller(latency_target=5)
+
+    for latency in (8.0, 9.0, 1.0):
+        controller.record('slow', latency=latency)
+    controller.record('fast', latency=1.0)
+
+    assert controller.adjust('slow') == 2
+    assert controller.adjust('fast') == 5
+
+    stats = controller.get_stats()
+    assert stats['current'] == {'slow': 2, 'fast': 5}
+    assert [entry['key'] for entry in stats['history']] == ['slow', 'fast']
+
+
+def test_aimd_adjust_without_outcomes_keeps_limit():
+    controller = make_controller()
+    assert controller.adjust('proxy-a') == 4
+    assert controller.get_stats()['history'] == []
+
+
+def test_timeouts_use_default_until_enough_samples():
+    timeouts = AdaptiveTimeouts(min_samples=5)
+    for _ in range(4):
+        timeouts.record('detail_load', 'proxy-a', 1.0)
+
+    assert timeouts.get('detail_load', 'proxy-a') == 20000
+    assert timeouts.get('selector', default=1000) == 1000
+
+
+def test_timeouts_follow_p99_per_proxy_and_clamp():
+    timeouts = AdaptiveTimeouts(percentile=99, factor=2.0, min_samples=5)
+    for _ in range(50):
+        timeouts.record('detail_load', 'fast', 1.0)
+        timeouts.record('detail_load', 'slow', 12.0)
+
+    # Dead pages on a fast proxy stop costing the 20s default
+    assert timeouts.get('detail_load', 'fast') == 4000
+    # A slow but healthy proxy gets more than the default instead of timing out
+    assert timeouts.get('detail_load', 'slow') == 24000
+
+    for _ in range(50):
+        timeouts.record('detail_load', 'crawling', 40.0)
+    assert timeouts.get('detail_load', 'crawling') == 45000
+
+    # A proxy without its own history uses the pooled histogram
+    assert 4000 <= timeouts.get('detail_load', 'new-proxy') <= 45000
+
+
+def test_timeouts_widen_when_timeout_rate_is_high():
+    timeouts = AdaptiveTimeouts(factor=2.0, min_samples=5, timeout_tolerance=0.1, timeout_backoff=1.5)
+    for _ in range(20):
+        timeouts.record('detail_load', 'proxy-a', 2.0)
+    assert timeouts.get('detail_load', 'proxy-a') == 4000
+
+    for _ in range(5):
+        timeouts.record_timeout('detail_load', 'proxy-a')
+    assert timeouts.get('detail_load', 'proxy-a') == 6000
+
+    stats = timeouts.get_stats()
+    assert stats['detail_load']['proxy-a'] == {'timeout_ms': 6000, 'samples': 25, 'timeouts': 5}
+
+
+def test_hedge_budget_caps_hedge_rate():
+    policy = HedgePolicy(max_hedge_rate=0.1, min_samples=1)
+    for _ in range(20):
+        policy.record_attempt()
+
+    granted = sum(policy.try_acquire() for _ in range(10))
+    assert granted == 2
+    assert policy.get_stats()['hedges_denied'] == 8
+
+
+def test_hedged_tab_takes_first_result_and_cancels_the_other():
+    scraper = GoogleMapsScraper(proxy_manager=SimpleNamespace(proxies=[]), headless=True)
+    scraper.hedging = HedgePolicy(percentile=95, max_hedge_rate=1.0, min_samples=5)
+    for _ in range(10):
+        scraper.hedging.record_latency(0.05)
+    scraper.hedge_context = object()
+    cancelled = []
+
+    async def fake_tab(url, index, total, page_ref=None, context=None):
+        try:
+            if context is None:
+                await asyncio.sleep(5)
+                return {'name': 'primary'}
+            await asyncio.sleep(0.01)
+            return {'name': 'hedge'}
+        except asyncio.CancelledError:
+            cancelled.append('primary' if context is None else 'hedge')
+            raise
+
+    scraper._scrape_single_business = fake_tab
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await scraper._scrape_with_hedge('https://maps/place/x', 1, 1)
+        return result, loop.time() - started
+
+    result, elapsed = asyncio.run(run())
+
+    assert result == {'name': 'hedge'}
+    assert elapsed < 1
+    assert cancelled == ['primary']
+    stats = scraper.hedging.get_stats()
+    assert stats['hedges'] == 1 and stats['hedge_wins'] == 1
+
+
+def test_rate_limit_wait_is_not_charged_to_the_tab_deadline():
+    scraper = GoogleMapsScraper(proxy_manager=SimpleNamespace(proxies=[]), headless=True)
+    scraper.hedging = None
+    scraper.supervisor.tab_deadline = 0.1
+    waited = []
+
+    class SlowLimiter:
+        async def acquire(self, key):
+            waited.append(key)
+            await asyncio.sleep(0.2)
+
+    async def fake_tab(url, index, total, page_ref=None, context=None):
+        await asyncio.sleep(0.01)
+        return {'name': 'tab'}
+
+    scraper.rate_limiter = SlowLimiter()
+    scraper._scrape_single_business = fake_tab
+
+    assert asyncio.run(scraper._scrape_with_hedge('https://maps/place/x', 1, 1)) == {'name': 'tab'}
+    assert waited == ['direct']
+    assert scraper.supervisor.tabs_killed == 0
+
+
+def test_selector_misses_that_time_out_widen_the_selector_timeout(monkeypatch):
+    timeouts = AdaptiveTimeouts(min_samples=5)
+    monkeypatch.setattr(DataExtractor, 'timeouts', timeouts)
+
+    async def run():
+        started = asyncio.get_running_loop().time()
+        for _ in range(10):
+            DataExtractor._record_selector('name', 'h1', True, started)
+        fast = timeouts.get('selector')
+        for _ in range(5):
+            DataExtractor._record_selector('name', 'h1', False, started, timed_out=True)
+        # An empty-text miss did not wait for anything and is not a timeout
+        DataExtractor._record_selector('name', 'h1', False, started)
+        return fast, timeouts.get('selector')
+
+    fast, widened = asyncio.run(run())
+
+    assert list(timeouts.samples[('selector', None)]).count(None) == 5
+    # Instant hits alone would derive ~0 ms; the floor keeps slower pages extractable
+    assert fast == 1000
+    assert widened >= fast
+
+
+def test_selector_misses_count_as_timeouts_only_while_the_page_is_loading(monkeypatch):
+    timeouts = AdaptiveTimeouts(min_samples=5)
+    monkeypatch.setattr(DataExtractor, 'timeouts', timeouts)
+
+    class MissingElement:
+        async def text_content(self, timeout=None):
+            raise TimeoutError('element never appeared')
+
+    class Locator:
+        first = MissingElement()
+
+    class Page:
+        def __init__(self, ready_state):
+            self.ready_state = ready_state
+
+        def locator(self, selector):
+            return Locator()
+
+        async def evaluate(self, script):
+            return self.ready_state
+
+    asyncio.run(DataExtractor._read_field(Page('complete'), 'name'))
+    assert ('selector', None) not in timeouts.samples
+
+    asyncio.run(DataExtractor._read_field(Page('loading'), 'name'))
+    assert list(timeouts.samples[('selector', None)]).count(None) == len(DataExtractor.DETAIL_SELECTORS['name']['selectors'])
+
+
+def test_timed_charges_latency_to_the_proxy_that_did_the_work():
+    scraper = GoogleMapsScraper(proxy_manager=SimpleNamespace(proxies=[]), headless=True)
+    scraper.timeouts = AdaptiveTimeouts(min_samples=1)
+    scraper.current_proxy = {'ip': '1.1.1.1', 'port': '80'}
+
+    async def navigation():
+        await asyncio.sleep(0.01)
+
+    async def run():
+        await scraper._timed('detail_load', navigation(), '2.2.2.2:80')
+        await scraper._timed('detail_load', navigation())
+
+    asyncio.run(run())
+
+    assert len(scraper.timeouts.samples[('detail_load', '2.2.2.2:80')]) == 1
+    assert len(scraper.timeouts.samples[('detail_load', '1.1.1.1:80')]) == 1
@@ -0,0 +1,127 @@
+"""
+Asset Cache Tests
+Checks LRU storage, eviction, hit-rate reporting and the Playwright route handler.
+"""
+
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+from modules.asset_cache import AssetCache
+
+
+JS_URL = 'https://www.google.com/maps/_/js/k=maps.m.en.abc123/m=sc2,per/rt=j'
+
+
+class FakeRequest:
+    """Stands in for a Playwright request."""
+
+    def __init__(self, url):
+        self.url = url
+        self.method = 'GET'
+
+
+class FakeRoute:
+    """Stands in for a Playwright route."""
+
+    def __init__(self, url, fetched_body=b'console.log(1)'):
+        self.request = FakeRequest(url)
+        self.fetched_body = fetched_body
+        self.fetches = 0
+        self.fulfilled = None
+
+    async def fetch(self):
+        self.fetches += 1
+        body = self.fetched_body
+
+        async def read_body():
+            return body
+
+        return SimpleNamespace(
+            status=200,
+            headers={'content-type': 'text/javascript', 'content-encoding': 'gzip',
+                     'cache-control': 'public, max-age=31536000'},
+            body=read_body
+        )
+
+    async def fulfill(self, status, headers, body):
+        self.fulfilled = (status, headers, body)
+
+    async def continue_(self):
+        self.fulfilled = 'continued'
+
+
+def test_static_asset_urls():
+    assert AssetCache.is_cacheable_url(JS_URL)
+    assert AssetCache.is_cacheable_url('https://fonts.gstatic.com/s/roboto/v30/font.woff2')
+    assert not AssetCache.is_cacheable_url('https://www.google.com/maps/place/Joe')
+    assert not AssetCache.is_cacheable_url('https://www.google.com/maps/search/dentist')
+    assert AssetCache.is_cacheable_url('https://www.gstatic.com/_/mss/boq-maps/_/js/k=boq.en.abc/m=main')
+    assert AssetCache.is_cacheable_url('https://maps.gstatic.com/mapfiles/transparent.png')
+    # Only the static asset paths of gstatic hosts
+    assert not AssetCache.is_cacheable_url('https://www.gstatic.com/recaptcha/releases/abc/recaptcha__en.js')
+    assert not AssetCache.is_cacheable_url('https://maps.gstatic.com/maps-api-v3/api/js/55/main.js')
+
+
+def test_route_miss_then_hit(tmp_path):
+    cache = AssetCache(directory=str(tmp_path))
+
+    first = FakeRoute(JS_URL)
+    asyncio.run(cache.handle_route(first))
+    assert first.fetches == 1
+    assert first.fulfilled[2] == b'console.log(1)'
+    # The body is already decoded, so the wire encoding must not be replayed
+    assert 'content-encoding' not in first.fulfilled[1]
+
+    second = FakeRoute(JS_URL)
+    asyncio.run(cache.handle_route(second))
+    assert second.fetches == 0
+    assert second.fulfilled == (200, {'content-type': 'text/javascript',
+                                      'cache-control': 'public, max-age=31536000'}, b'console.log(1)')
+    assert cache.was_served(second.request)
+    assert not cache.was_served(first.request)
+
+    stats = cache.get_stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1
+    assert stats['hit_rate'] == 50.0
+    assert stats['bytes_saved'] == len(b'console.log(1)')
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = AssetCache(directory=str(tmp_path), max_bytes=250)
+    urls = [f'https://maps.gstatic.com/mapfiles/asset{i}.js' for i in range(3)]
+
+    for index, url in enumerate(urls[:2]):
+        cache.put(url, 200, {}, b'x' * 100)
+        past = time.time() - 100 + index
+        os.utime(cache._paths(url)[0], (past, past))
+
+    # Touch the oldest entry so the other one becomes least recently used
+    assert cache.get(urls[0]) is not None
+    cache.put(urls[2], 200, {}, b'x' * 100)
+
+    assert cache.get(urls[0]) is not None
+    assert cache.get(urls[1]) is None
+    assert cache.get(urls[2]) is not None
+    assert cache.get_stats()['evictions'] == 1
+    assert cache.get_stats()['stored_bytes'] == 200
+
+
+def test_cache_is_shared_between_instances(tmp_path):
+    AssetCache(directory=str(tmp_path)).put(JS_URL, 200, {'content-type': 'text/javascript'}, b'shared')
+    assert AssetCache(directory=str(tmp_path)).get(JS_URL)[2] == b'shared'
+
+
+def test_put_leaves_no_temp_files_and_pairs_are_checked(tmp_path):
+    cache = AssetCache(directory=str(tmp_path))
+    cache.put(JS_URL, 200, {}, b'first')
+    cache.put(JS_URL, 200, {}, b'second version')
+
+    assert sorted(name.rsplit('.', 1)[1] for name in os.listdir(tmp_path)) == ['body', 'meta']
+    assert cache.get(JS_URL)[2] == b'second version'
+
+    # A body replaced by another writer without its metadata is a miss, not a mixed response
+    with open(cache._paths(JS_URL)[0], 'wb') as f:
+        f.write(b'third')
+    assert cache.get(JS_URL) is None
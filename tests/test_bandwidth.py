@@ -0,0 +1,42 @@
+"""
+Bandwidth Tests
+Checks byte accounting per proxy, query, job and business.
+"""
+
+from modules.bandwidth import BandwidthMeter, GB, classify_url
+
+
+def test_classify_url():
+    assert classify_url('https://www.google.com/maps/place/x') == 'maps'
+    assert classify_url('https://maps.gstatic.com/app.js') == 'maps'
+    assert classify_url('https://joespizza.example.com/contact') == 'website'
+    assert classify_url('https://notgoogle.com/') == 'website'
+
+
+def test_record_aggregates_every_level():
+    meter = BandwidthMeter(cost_per_gb=10.0)
+    meter.start_query('pizza - 10014')
+    meter.record('1.1.1.1:80', 500, 9500, url='https://www.google.com/maps/place/a', business='a')
+    meter.record('1.1.1.1:80', 100, 1900, url='https://a.example.com/', business='a')
+    meter.start_query('dentist - 10001')
+    meter.record('2.2.2.2:80', 0, GB // 10, business='b', kind='maps')
+
+    proxies = meter.get_proxy_stats()
+    assert proxies['1.1.1.1:80']['total_bytes'] == 12000
+    assert proxies['1.1.1.1:80']['website_bytes'] == 2000
+    assert proxies['2.2.2.2:80']['cost'] == 1.0
+
+    summary = meter.get_job_summary()
+    assert summary['total']['requests'] == 3
+    assert summary['queries']['pizza - 10014']['total_bytes'] == 12000
+    assert summary['per_business']['businesses'] == 2
+    assert summary['top_businesses'][0]['business'] == 'b'
+
+
+def test_new_job_keeps_proxy_totals():
+    meter = BandwidthMeter()
+    meter.record('1.1.1.1:80', 10, 90, url='https://www.google.com/')
+    meter.start_job()
+
+    assert meter.get_job_summary()['total']['total_bytes'] == 0
+    assert meter.get_proxy_stats()['1.1.1.1:80']['total_bytes'] == 100
@@ -0,0 +1,96 @@
+"""
+Browser Supervisor Tests
+Checks the tab watchdog's hard deadline (kill and force-close) and page-count recycling.
+"""
+
+import asyncio
+
+from modules.browser_supervisor import BrowserSupervisor
+
+
+class StuckPage:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+def test_tab_within_deadline_returns_its_result():
+    supervisor = BrowserSupervisor(tab_deadline=1)
+
+    async def tab():
+        await asyncio.sleep(0.01)
+        return {'name': 'ok'}
+
+    assert asyncio.run(supervisor.run_tab(tab(), {})) == {'name': 'ok'}
+    assert supervisor.tabs_killed == 0
+
+
+def test_stuck_tab_is_killed_and_its_page_force_closed():
+    supervisor = BrowserSupervisor(tab_deadline=0.05, close_timeout=0.1)
+    page = StuckPage()
+    page_ref = {'page': page}
+    cancelled = []
+
+    async def tab():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await supervisor.run_tab(tab(), page_ref, label='[Tab 1/1]')
+        return result, loop.time() - started
+
+    result, elapsed = asyncio.run(run())
+
+    assert result is None
+    assert elapsed < 1
+    assert cancelled == [True]
+    assert page.closed
+    assert supervisor.tabs_killed == 1
+
+
+def test_tab_swallowing_the_cancel_does_not_block_the_job():
+    supervisor = BrowserSupervisor(tab_deadline=0.05, close_timeout=0.05)
+
+    async def tab():
+        # A bare except in the tab code swallows the first cancel
+        try:
+            await asyncio.sleep(10)
+        except BaseException:
+            await asyncio.sleep(10)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        task = asyncio.ensure_future(supervisor.run_tab(tab(), {}))
+        result = await task
+        return result, loop.time() - started
+
+    result, elapsed = asyncio.run(run())
+
+    assert result is None
+    assert elapsed < 1
+    assert supervisor.tabs_killed == 1
+
+
+def test_recycle_after_max_pages():
+    supervisor = BrowserSupervisor(max_pages=3, max_rss_mb=0)
+    supervisor.record_launch()
+
+    for _ in range(2):
+        supervisor.record_page()
+    assert not supervisor.should_recycle()
+
+    supervisor.record_page()
+    assert supervisor.should_recycle()
+
+    supervisor.record_recycle()
+    supervisor.record_launch()
+    assert not supervisor.should_recycle()
+    assert supervisor.browser_recycles == 1
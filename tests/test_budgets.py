@@ -0,0 +1,42 @@
+"""
+Budget Tests
+Checks per-query and per-job budget parsing and exhaustion.
+"""
+
+from modules.budgets import Budget
+
+
+def test_from_options_reads_prefixed_limits():
+    budget, error = Budget.from_options({'job_max_businesses': '50', 'job_max_seconds': '1.5'}, 'job', prefix='job_')
+
+    assert error is None
+    assert budget.max_businesses == 50
+    assert budget.max_seconds == 1.5
+    assert budget.max_bytes is None
+
+
+def test_from_options_without_limits_or_with_bad_values():
+    assert Budget.from_options({}, 'query') == (None, None)
+    assert Budget.from_options({'max_bytes': 'lots'}, 'query') == (None, 'max_bytes must be a number')
+    assert Budget.from_options({'max_businesses': 0}, 'query') == (None, 'max_businesses must be positive')
+
+
+def test_check_reports_the_exhausted_budget():
+    budget = Budget('query', max_businesses=2, max_bytes=1000)
+    assert budget.check() is None
+    assert budget.remaining_businesses() == 2
+
+    budget.add_bytes(1200)
+    assert budget.check() == 'query max_bytes'
+
+    budget.start()
+    budget.add_business(2)
+    assert budget.remaining_businesses() == 0
+    assert budget.check() == 'query max_businesses'
+    assert budget.to_dict()['exhausted_by'] == 'query max_businesses'
+
+
+def test_time_budget_runs_out():
+    budget = Budget('job', max_seconds=0.01)
+    budget.started_at -= 1
+    assert budget.check() == 'job max_seconds'
@@ -0,0 +1,93 @@
+"""
+Field Projection Tests
+Checks that jobs extract only the requested fields (plus dependencies) and output only those.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from modules.data_extractor import DataExtractor
+from modules.filters import BusinessFilter
+from modules.scraper import GoogleMapsScraper
+
+PLACE_URL = 'https://www.google.com/maps/place/Joes/@40.73,-74.00,17z/data=!4m2!3m1!1s0x89c2:0x6f0a'
+
+ELEMENTS = {
+    'h1.DUwDvf': "Joe's Pizza",
+    'button[jsaction*="category"]': 'Pizza',
+    'div.F7nice': '4.6(12,345)',
+    'button[data-item-id="address"]': '7 Carmine St',
+    'button[data-item-id*="phone"]': '(212) 366-1182'
+}
+
+
+class DetailPage:
+    """Detail page that records every selector the extractor waits on."""
+
+    def __init__(self):
+        self.url = PLACE_URL
+        self.queried = []
+
+    def locator(self, selector):
+        self.queried.append(selector)
+        return Element(selector)
+
+
+class Element:
+    def __init__(self, selector):
+        self.selector = selector
+
+    @property
+    def first(self):
+        return self
+
+    async def text_content(self, timeout=None):
+        if self.selector not in ELEMENTS:
+            raise TimeoutError(self.selector)
+        return ELEMENTS[self.selector]
+
+    async def get_attribute(self, name, timeout=None):
+        return await self.text_content(timeout)
+
+    async def click(self, timeout=None):
+        raise TimeoutError(self.selector)
+
+
+def test_expand_fields_adds_dependencies():
+    assert DataExtractor.expand_fields(None) is None
+    assert DataExtractor.expand_fields(['phone']) == {'phone', 'name', 'cid', 'url'}
+    assert {'website', 'email'} <= DataExtractor.expand_fields(['email'])
+    assert {'latitude', 'longitude'} <= DataExtractor.expand_fields(['latitude'])
+
+
+def test_unrequested_fields_cost_no_selector_waits():
+    page = DetailPage()
+
+    info = asyncio.run(DataExtractor.extract_detailed_business_info(page, ['phone']))
+
+    assert info == {'name': "Joe's Pizza", 'phone': '(212) 366-1182', 'cid': '0x89c2:0x6f0a', 'url': PLACE_URL}
+    assert page.queried == ['h1.DUwDvf', 'button[data-item-id*="phone"]']
+
+
+def test_all_fields_when_none_requested():
+    page = DetailPage()
+
+    info = asyncio.run(DataExtractor.extract_detailed_business_info(page))
+
+    assert set(info) == set(DataExtractor.DETAIL_FIELDS)
+    assert info['rating'] == 4.6 and info['review_count'] == 12345
+    assert info['latitude'] == '40.73'
+
+
+def test_job_extracts_filter_fields_but_outputs_only_requested():
+    scraper = GoogleMapsScraper(proxy_manager=SimpleNamespace(proxies=[]), headless=True)
+    scraper.set_job_options({'fields': ['phone'], 'filter': BusinessFilter(min_rating=4.0)})
+
+    assert scraper.extract_fields == ['phone', 'rating']
+
+    business = {'name': "Joe's Pizza", 'phone': '1', 'rating': 4.6, 'cid': 'c', 'url': 'u', 'keyword': 'pizza'}
+    assert scraper._project_fields(business) == {'name': "Joe's Pizza", 'phone': '1', 'cid': 'c', 'url': 'u'}
+
+    scraper.set_job_options({})
+    assert scraper.extract_fields is None
+    assert scraper._project_fields(business) is business
@@ -0,0 +1,79 @@
+"""
+Filter Tests
+Checks result-card parsing and the filter predicates pushed down to result cards.
+"""
+
+from modules.data_extractor import DataExtractor
+from modules.filters import BusinessFilter
+
+
+def card(text='', rating_label='', name="Joe's Pizza"):
+    return {'url': 'https://www.google.com/maps/place/joes', 'name': name,
+            'rating_label': rating_label, 'text': text}
+
+
+def test_card_rating_and_reviews_from_star_label():
+    info = DataExtractor.parse_result_card(card(rating_label='4.6 stars 12,345 Reviews'))
+
+    assert info['rating'] == 4.6
+    assert info['review_count'] == 12345
+    assert info['category'] is None
+
+
+def test_card_rating_reviews_and_category_from_text():
+    info = DataExtractor.parse_result_card(card(
+        text="Joe's Pizza\n4.6(12,345)\nPizza · $ · 7 Carmine St\nOpen 24 hours"
+    ))
+
+    assert info['name'] == "Joe's Pizza"
+    assert info['rating'] == 4.6
+    assert info['review_count'] == 12345
+    assert info['category'] == 'Pizza'
+
+
+def test_card_without_reviews_has_no_rating_but_a_category():
+    info = DataExtractor.parse_result_card(card(text="New Place\nNo reviews\nBakery · 1 Main St"))
+
+    assert info['rating'] is None
+    assert info['review_count'] is None
+    assert info['category'] == 'Bakery'
+
+
+def test_card_address_line_is_not_taken_as_category():
+    info = DataExtractor.parse_result_card(card(text="Joe's Pizza\n4.6(12)\n7 Carmine St"))
+
+    assert info['category'] is None
+
+
+def test_filter_on_card_data():
+    business_filter = BusinessFilter(min_rating=4.0, min_reviews=100, categories=['pizza'])
+    good = DataExtractor.parse_result_card(card(text="Joe's\n4.6(12,345)\nPizza · $"))
+    few_reviews = DataExtractor.parse_result_card(card(text="Joe's\n4.6(12)\nPizza · $"))
+    no_rating = DataExtractor.parse_result_card(card(text="Joe's\nNo reviews\nPizza · $"))
+    wrong_category = DataExtractor.parse_result_card(card(text="Joe's\n4.6(12,345)\nBakery · $"))
+
+    assert business_filter.matches(good, partial=True)
+    assert not business_filter.matches(few_reviews, partial=True)
+    assert not business_filter.matches(no_rating, partial=True)
+    assert not business_filter.matches(wrong_category, partial=True)
+
+
+def test_missing_category_only_passes_on_card_data():
+    business_filter = BusinessFilter(categories=['pizza'])
+    no_category = DataExtractor.parse_result_card(card(rating_label='4.6 stars 20 Reviews'))
+
+    # The card may not show the category; the detail page decides
+    assert business_filter.matches(no_category, partial=True)
+    assert not business_filter.matches({'category': 'Not given'})
+    assert business_filter.matches({'category': 'Pizza restaurant'})
+
+
+def test_filter_from_options():
+    business_filter, error = BusinessFilter.from_options({'min_rating': '4.5', 'categories': 'pizza, bakery'})
+    assert error is None
+    assert business_filter.to_dict() == {'min_rating': 4.5, 'min_reviews': None, 'categories': ['pizza', 'bakery']}
+    assert business_filter.required_fields() == {'rating', 'category'}
+
+    assert BusinessFilter.from_options({}) == (None, None)
+    assert BusinessFilter.from_options({'min_rating': '7'})[1] == 'min_rating must be between 0 and 5'
+    assert BusinessFilter.from_options({'min_reviews': 'many'})[1] == 'min_reviews must be an integer'
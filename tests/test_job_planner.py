@@ -0,0 +1,90 @@
+"""
+Job Planner Tests
+Checks duration and cost estimates from recorded throughput, and the live ETA.
+"""
+
+from modules.budgets import Budget
+from modules.job_planner import ThroughputHistory, JobPlanner, LiveEta, GB
+
+
+SEARCH = {'keyword': 'dentist', 'zip_code': '10001', 'url': ''}
+PLACE = {'keyword': '', 'zip_code': '', 'url': 'https://www.google.com/maps/place/Joe/data=!1s0x1:0x2'}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_history(tmp_path=None):
+    history = ThroughputHistory(str(tmp_path / 'history.json') if tmp_path else None)
+    # 20 businesses in 60s at 5 tabs = 15 tab-seconds per business, 1 MB per business
+    for _ in range(10):
+        history.record_query('search', 60, 20, 20 * 1024 * 1024, 5)
+    for _ in range(10):
+        history.record_query('place', 8, 1, 2 * 1024 * 1024, 5)
+    return history
+
+
+def test_estimate_scales_with_concurrency_and_counts_cost():
+    history = make_history()
+    queries = [SEARCH] * 100 + [PLACE] * 10
+
+    plan = JobPlanner(history, parallel_tabs=5, cost_per_gb=4.0).estimate(queries)
+    assert plan['samples'] == {'search': 10, 'place': 10}
+    assert plan['seconds'] == 100 * 60 + 10 * 8
+    assert plan['businesses'] == 100 * 20 + 10
+    assert plan['gb'] == round((100 * 20 + 10 * 2) * 1024 * 1024 / GB, 3)
+    assert plan['cost'] == round(plan['gb'] * 4.0, 2)
+
+    # Twice the tabs halves the detail time of search queries
+    faster = JobPlanner(history, parallel_tabs=10).estimate(queries)
+    assert faster['seconds'] == 100 * 30 + 10 * 8
+
+
+def test_rate_limit_and_budgets_bound_the_estimate():
+    history = make_history()
+
+    # 21 navigations per query at 0.1/s cannot finish in less than 210s
+    limited = JobPlanner(history, parallel_tabs=5, rate_limit=0.1).estimate([SEARCH] * 10)
+    assert limited['seconds'] == 10 * 210
+
+    options = {
+        'query_budget': Budget('query', max_businesses=10),
+        'job_budget': Budget('job', max_businesses=50)
+    }
+    capped = JobPlanner(history, parallel_tabs=5).estimate([SEARCH] * 10, options)
+    assert capped['businesses'] == 50
+    assert capped['seconds'] == 5 * 30
+
+
+def test_defaults_without_history_and_persistence(tmp_path):
+    empty = JobPlanner(ThroughputHistory(), parallel_tabs=5).estimate([SEARCH])
+    assert empty['samples'] == {'search': 0, 'place': 0}
+    assert empty['seconds'] > 0
+
+    make_history(tmp_path)
+    reloaded = ThroughputHistory(str(tmp_path / 'history.json'))
+    assert len(reloaded.get_records('search')) == 10
+
+
+def test_live_eta_follows_observed_throughput():
+    clock = FakeClock()
+    eta = LiveEta(10, planned_seconds_per_query=60, planned_bytes_per_query=GB / 10, prior_weight=3, clock=clock)
+    assert eta.get()['seconds_remaining'] == 600
+
+    # Queries run at 120s each: the ETA moves from the plan towards the observed rate
+    for _ in range(5):
+        clock.now += 120
+        eta.query_done(bytes_used=GB // 10)
+    status = eta.get()
+    assert status['seconds_per_query'] == (60 * 3 + 600) / 8
+    assert status['seconds_remaining'] == 5 * status['seconds_per_query']
+
+    # Time spent on the query in flight is counted
+    clock.now += 30
+    assert eta.get()['seconds_remaining'] == 5 * status['seconds_per_query'] - 30
+    assert eta.get()['projected_gb'] == 1.0
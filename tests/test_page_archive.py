@@ -0,0 +1,164 @@
+"""
+Page Archive Tests
+Checks compressed append-only storage keyed by CID and time, and offline re-extraction in a process pool.
+"""
+
+import asyncio
+import csv
+
+from modules.data_extractor import DataExtractor
+from modules.page_archive import PageArchive, parse_archived_page, parse_detail_html, reextract
+
+
+URL = 'https://www.google.com/maps/place/Joe%27s+Pizza/data=!4m7!3m6!1s0x89c2:0xabc!8m2!3d40.7306!4d-73.9866'
+
+DETAIL_PAGE = """<html><body><div role="main">
+  <h1 class="DUwDvf lfPIob">Joe's Pizza <span></span></h1>
+  <div class="F7nice"><span>4.5</span><span>(1,234)</span></div>
+  <button jsaction="pane.rating.category">Pizza restaurant</button>
+  <button data-item-id="address" aria-label="Address: 7 Carmine St"><div>7 Carmine St, New York, NY 10014</div></button>
+  <div aria-label="Open &#8901; Closes 11 PM. Hours: Monday 10 AM-11 PM"><img src="x.png"><br></div>
+  <a data-item-id="authority" href="https://www.joespizzanyc.com/">joespizzanyc.com</a>
+  <button data-item-id="phone:tel:+12123661182"><div>+1 212-366-1182</div></button>
+  <button data-item-id="oloc"><div>Q6FM+7G New York</div></button>
+  <div jsaction="pane.description"><span>Classic New York slice shop since 1975</span></div>
+</div></body></html>"""
+
+# What a browser returns for the DETAIL_SELECTORS entries that match DETAIL_PAGE
+LIVE_ELEMENTS = {
+    'h1.DUwDvf': {'text': "Joe's Pizza "},
+    'h1': {'text': "Joe's Pizza "},
+    'div[role="main"] h1': {'text': "Joe's Pizza "},
+    'button[jsaction*="category"]': {'text': 'Pizza restaurant'},
+    'div.F7nice': {'text': '4.5(1,234)'},
+    'button[data-item-id="address"]': {'text': '7 Carmine St, New York, NY 10014', 'aria-label': 'Address: 7 Carmine St'},
+    'div[aria-label*="Hours"]': {'text': '', 'aria-label': 'Open \u22c5 Closes 11 PM. Hours: Monday 10 AM-11 PM'},
+    'a[data-item-id="authority"]': {'text': 'joespizzanyc.com', 'href': 'https://www.joespizzanyc.com/'},
+    'button[data-item-id*="phone"]': {'text': '+1 212-366-1182'},
+    'button[data-item-id="oloc"]': {'text': 'Q6FM+7G New York'},
+    'div[jsaction*="description"]': {'text': 'Classic New York slice shop since 1975'}
+}
+
+
+class LivePage:
+    """Stands in for the Playwright page the live extractor reads DETAIL_PAGE from."""
+
+    def __init__(self, url):
+        self.url = url
+
+    def locator(self, selector):
+        return LiveElement(LIVE_ELEMENTS.get(selector))
+
+
+class LiveElement:
+    def __init__(self, element):
+        self.element = element
+
+    @property
+    def first(self):
+        return self
+
+    async def text_content(self, timeout=None):
+        if self.element is None:
+            raise TimeoutError('no element')
+        return self.element['text']
+
+    async def get_attribute(self, name, timeout=None):
+        if self.element is None:
+            raise TimeoutError('no element')
+        return self.element.get(name)
+
+    async def click(self, timeout=None):
+        raise TimeoutError('no element')
+
+
+def detail_page(name):
+    return DETAIL_PAGE.replace("Joe's Pizza", name)
+
+
+def test_parse_detail_html():
+    business = parse_detail_html(DETAIL_PAGE, URL)
+
+    assert business['name'] == "Joe's Pizza"
+    assert business['rating'] == 4.5
+    assert business['review_count'] == 1234
+    assert business['category'] == 'Pizza restaurant'
+    assert business['full_address'] == '7 Carmine St, New York, NY 10014'
+    assert business['opening_hours'].startswith('Open')
+    assert business['website'] == 'https://www.joespizzanyc.com/'
+    assert business['phone'] == '+1 212-366-1182'
+    assert business['plus_code'] == 'Q6FM+7G New York'
+    assert business['cid'] == '0x89c2:0xabc'
+    assert business['latitude'] == '40.7306'
+    assert business['description'] == 'Classic New York slice shop since 1975'
+    assert business['email'] == 'Not given'
+
+    assert parse_detail_html('<html><body><h1>Results</h1></body></html>', URL) is None
+
+
+def test_archive_versions_by_cid_and_time(tmp_path):
+    archive = PageArchive(str(tmp_path), max_segment_bytes=300)
+    archive.add('cid1', URL, detail_page('Old Name'), archived_at=100.0)
+    archive.add('cid1', URL, detail_page('New Name'), archived_at=200.0)
+    archive.add(None, 'https://maps/place/x', '<html>raw</html>', kind='raw', archived_at=150.0)
+
+    assert 'Old Name' in archive.get('cid1', at=150.0)
+    assert 'New Name' in archive.get('cid1')
+    assert archive.get('cid1', at=50.0) is None
+    assert archive.get('https://maps/place/x') == '<html>raw</html>'
+
+    assert [entry['archived_at'] for entry in archive.entries()] == [200.0, 150.0]
+    assert len(archive.entries(latest_only=False)) == 3
+    # Pages are stored compressed, spread over size-limited segments
+    assert len(list(tmp_path.glob('pages-*.z'))) > 1
+    assert archive.get_stats()['compressed_bytes'] < archive.get_stats()['bytes']
+
+    # A second writer (e.g. another worker process) appends to its own segment
+    PageArchive(str(tmp_path)).add('cid2', URL, detail_page('Other'), archived_at=300.0)
+    assert len(archive.entries()) == 3
+
+
+def test_reextract_with_process_pool(tmp_path):
+    archive = PageArchive(str(tmp_path / 'archive'))
+    for number in range(25):
+        archive.add(f'cid{number}', URL, detail_page(f'Business {number}'))
+    archive.add('broken', URL, '<html><body>CAPTCHA</body></html>')
+
+    output = tmp_path / 'out' / 'reextracted.csv'
+    summary = reextract(str(tmp_path / 'archive'), str(output), workers=2, batch_size=4)
+
+    assert summary['pages'] == 26
+    assert summary['businesses'] == 25
+    assert summary['failed'] == 1
+    with open(output, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert sorted(row['name'] for row in rows) == sorted(f'Business {number}' for number in range(25))
+    assert rows[0]['phone'] == '+1 212-366-1182'
+
+
+def test_archived_page_reparses_like_the_live_extractor(tmp_path):
+    live = asyncio.run(DataExtractor.extract_detailed_business_info(LivePage(URL)))
+
+    archive = PageArchive(str(tmp_path))
+    archive.add(live['cid'], URL, DETAIL_PAGE)
+    entry = archive.entries()[0]
+    offline = parse_archived_page(archive.get(live['cid']), entry)
+
+    assert offline == live
+    assert live['name'] == "Joe's Pizza" and live['review_count'] == 1234
+
+
+def test_selector_fix_applies_to_live_and_archive(monkeypatch):
+    page = DETAIL_PAGE.replace('class="DUwDvf lfPIob"', 'class="renamed"').replace('<h1', '<h2').replace('</h1>', '</h2>')
+    assert parse_detail_html(page, URL) is None
+
+    # One edit to the shared table fixes both extractors
+    name = dict(DataExtractor.DETAIL_SELECTORS['name'])
+    name['selectors'] = name['selectors'] + [('h2.renamed', 'text')]
+    monkeypatch.setitem(DataExtractor.DETAIL_SELECTORS, 'name', name)
+    monkeypatch.setitem(LIVE_ELEMENTS, 'h2.renamed', {'text': "Joe's Pizza"})
+    for selector in ('h1.DUwDvf', 'h1', 'div[role="main"] h1'):
+        monkeypatch.delitem(LIVE_ELEMENTS, selector)
+
+    assert parse_detail_html(page, URL)['name'] == "Joe's Pizza"
+    assert asyncio.run(DataExtractor.extract_detailed_business_info(LivePage(URL), ['name']))['name'] == "Joe's Pizza"
@@ -0,0 +1,149 @@
+"""
+Panel Extraction Tests
+Checks panel mode: cards are clicked in the results list, duplicates and filtered cards are
+skipped, and the list is restored between cards.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from modules.data_extractor import DataExtractor
+from modules.filters import BusinessFilter
+from modules.scraper import GoogleMapsScraper
+
+CARDS = [
+    {'url': 'https://www.google.com/maps/place/a', 'name': 'A', 'rating_label': '4.8 stars 120 Reviews', 'text': ''},
+    {'url': 'https://www.google.com/maps/place/b', 'name': 'B', 'rating_label': '3.1 stars 40 Reviews', 'text': ''},
+    {'url': 'https://www.google.com/maps/place/a', 'name': 'A', 'rating_label': '4.8 stars 120 Reviews', 'text': ''},
+    {'url': 'https://www.google.com/maps/place/c', 'name': 'C', 'rating_label': '4.5 stars 80 Reviews', 'text': ''}
+]
+
+
+class PanelPage:
+    """Results page whose cards open a detail side panel in place."""
+
+    def __init__(self):
+        self.url = 'https://www.google.com/maps/search/pizza'
+        self.panel_open = False
+        self.clicked = []
+        self.backs = 0
+
+    def locator(self, selector):
+        if selector == '[role="feed"] a[href*="/maps/place/"]':
+            return Cards(self)
+        if selector == 'button[aria-label="Back"]':
+            return Button(self)
+        return Feed(self)
+
+    async def wait_for_url(self, pattern, timeout=None):
+        pass
+
+    async def wait_for_selector(self, selector, timeout=None, state=None):
+        pass
+
+
+class Cards:
+    def __init__(self, page):
+        self.page = page
+
+    async def count(self):
+        return len(CARDS)
+
+    def nth(self, index):
+        return Card(self.page, CARDS[index])
+
+
+class Card:
+    def __init__(self, page, data):
+        self.page = page
+        self.data = data
+
+    async def evaluate(self, script, timeout=None):
+        return dict(self.data)
+
+    async def scroll_into_view_if_needed(self, timeout=None):
+        pass
+
+    async def click(self, timeout=None):
+        self.page.url = self.data['url']
+        self.page.panel_open = True
+        self.page.clicked.append(self.data['name'])
+
+
+class Feed:
+    def __init__(self, page):
+        self.page = page
+
+    @property
+    def first(self):
+        return self
+
+    async def is_visible(self):
+        return not self.page.panel_open
+
+    async def wait_for(self, state=None, timeout=None):
+        if self.page.panel_open:
+            raise TimeoutError('results list hidden')
+
+
+class Button:
+    def __init__(self, page):
+        self.page = page
+
+    @property
+    def first(self):
+        return self
+
+    async def click(self, timeout=None):
+        self.page.panel_open = False
+        self.page.backs += 1
+
+
+async def fake_extract(page, fields=None):
+    name = page.url.rsplit('/', 1)[-1].upper()
+    rating = {'A': 4.8, 'B': 3.1, 'C': 4.5}[name]
+    return {'name': name, 'url': page.url, 'rating': rating, 'email': 'Not given', 'website': 'Not given'}
+
+
+def make_scraper(monkeypatch, options=None):
+    monkeypatch.setattr(DataExtractor, 'extract_detailed_business_info', staticmethod(fake_extract))
+    scraper = GoogleMapsScraper(proxy_manager=SimpleNamespace(proxies=[]), headless=True)
+    scraper.page = PanelPage()
+
+    async def no_scroll(*args, **kwargs):
+        pass
+
+    scraper._scroll_results = no_scroll
+    scraper.set_job_options(options)
+    return scraper
+
+
+def test_panel_mode_is_selected_by_job_option(monkeypatch):
+    scraper = make_scraper(monkeypatch, {'extraction_mode': 'panel'})
+    assert scraper._get_extraction_mode() == 'panel'
+
+    scraper.set_job_options({'extraction_mode': 'bogus'})
+    assert scraper._get_extraction_mode() == 'tab'
+
+
+def test_panel_mode_clicks_each_card_once_and_returns_to_the_list(monkeypatch):
+    scraper = make_scraper(monkeypatch)
+    delivered = []
+
+    businesses = asyncio.run(scraper.extract_business_data_panel(delivered.append))
+
+    assert [business['name'] for business in businesses] == ['A', 'B', 'C']
+    assert delivered == businesses
+    # The duplicate card is never clicked
+    assert scraper.page.clicked == ['A', 'B', 'C']
+    assert scraper.page.backs == 3
+
+
+def test_panel_mode_skips_cards_failing_the_filter_without_clicking(monkeypatch):
+    scraper = make_scraper(monkeypatch, {'filter': BusinessFilter(min_rating=4.0)})
+
+    businesses = asyncio.run(scraper.extract_business_data_panel())
+
+    assert [business['name'] for business in businesses] == ['A', 'C']
+    assert scraper.page.clicked == ['A', 'C']
+    assert scraper.filtered_out == 1
@@ -0,0 +1,137 @@
+"""
+Pipelined Scroll Tests
+Checks the handoff from the scrolling results list to the detail tabs through the URL queue.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from modules.filters import BusinessFilter
+from modules.scraper import GoogleMapsScraper
+
+real_sleep = asyncio.sleep
+
+
+@pytest.fixture(autouse=True)
+def fast_sleep(monkeypatch):
+    # The scroller waits a second per scroll; keep the order of events but not the waiting
+    async def sleep(delay, *args, **kwargs):
+        await real_sleep(delay / 100, *args, **kwargs)
+
+    monkeypatch.setattr(asyncio, 'sleep', sleep)
+
+
+class ResultsPage:
+    """Results list that loads three more cards per scroll."""
+
+    def __init__(self, total=7, per_scroll=3):
+        self.total = total
+        self.per_scroll = per_scroll
+        self.loaded = per_scroll
+        self.scrolls = 0
+        self.url = 'https://www.google.com/maps/search/pizza'
+
+    def locator(self, selector):
+        return Feed(self)
+
+    async def eval_on_selector_all(self, selector, script):
+        return [
+            {'url': f'https://www.google.com/maps/place/{index}', 'name': str(index),
+             'rating_label': f'{4.9 if index % 2 else 3.0} stars 10 Reviews', 'text': ''}
+            for index in range(self.loaded)
+        ]
+
+
+class Feed:
+    def __init__(self, page):
+        self.page = page
+
+    @property
+    def first(self):
+        return self
+
+    async def evaluate(self, script):
+        self.page.scrolls += 1
+        self.page.loaded = min(self.page.total, self.page.loaded + self.page.per_scroll)
+
+
+def make_scraper(page, options=None):
+    scraper = GoogleMapsScraper(proxy_manager=SimpleNamespace(proxies=[]), headless=True)
+    scraper.page = page
+    scraper.supervisor.max_rss_mb = 0
+    scraper.set_job_options(options)
+    return scraper
+
+
+def drain(queue):
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def test_scroller_publishes_each_url_once_then_sentinel():
+    scraper = make_scraper(ResultsPage())
+    queue = asyncio.Queue()
+
+    asyncio.run(scraper._scroll_results(queue, max_results=100))
+
+    urls = drain(queue)
+    assert urls[-1] is None
+    assert urls[:-1] == [f'https://www.google.com/maps/place/{index}' for index in range(7)]
+    assert scraper.published_count == 7
+
+
+def test_scroller_stops_at_max_results_and_skips_filtered_cards():
+    scraper = make_scraper(ResultsPage(total=20), {'filter': BusinessFilter(min_rating=4.0)})
+    queue = asyncio.Queue()
+
+    asyncio.run(scraper._scroll_results(queue, max_results=3))
+
+    urls = drain(queue)
+    assert urls == [f'https://www.google.com/maps/place/{index}' for index in (1, 3, 5)] + [None]
+    # No scrolling past the cap
+    assert scraper.page.scrolls < 8
+
+
+def test_tabs_start_while_scrolling_continues():
+    page = ResultsPage()
+    scraper = make_scraper(page)
+    started = []
+
+    async def fake_tab(url, index, total):
+        started.append((url, page.scrolls))
+        await real_sleep(0)
+        return {'name': url}
+
+    scraper._scrape_with_hedge = fake_tab
+
+    businesses = asyncio.run(scraper.extract_business_data_parallel(max_concurrent=5))
+
+    assert sorted(business['name'] for business in businesses) == sorted(url for url, _ in started)
+    assert len(businesses) == 7
+    # The first cards were opened before the list had finished loading
+    assert started[0][1] < page.scrolls
+
+
+def test_query_reports_the_tab_limit_in_effect():
+    scraper = make_scraper(ResultsPage(total=9))
+    limits = iter([2, 2, 3])
+    scraper.concurrency = SimpleNamespace(get_limit=lambda key: next(limits, 3), adjust=lambda key: None)
+
+    async def fake_tab(url, index, total):
+        await real_sleep(0)
+        return {'name': url}
+
+    scraper._scrape_with_hedge = fake_tab
+    scraper._start_query('pizza - 10001')
+    assert scraper.get_query_tabs() == 1
+
+    businesses = asyncio.run(scraper.extract_business_data_parallel(max_concurrent=5))
+
+    assert len(businesses) == 9
+    # The adaptive limit, not the configured 5 tabs
+    assert 2 <= scraper.get_query_tabs() <= 3
+    assert scraper.get_query_tabs() == round(sum(scraper.query_tab_limits) / len(scraper.query_tab_limits), 2)
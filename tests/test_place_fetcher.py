@@ -0,0 +1,97 @@
+"""
+Place Fetcher Tests
+Parses saved place page fixtures and fetches them from a local stub server.
+"""
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from modules.place_fetcher import PlaceFetcher
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+PLACE_URL = (
+    'https://www.google.com/maps/place/Joe%27s+Pizza/@40.7306,-73.9866,17z/'
+    'data=!4m6!3m5!1s0x89c259a2e8f4c5ad:0x6f0a1c2bd9c3e111!8m2!3d40.7306!4d-73.9866'
+)
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_parse_place_payload_fixture():
+    info = PlaceFetcher.parse_place_html(read_fixture('place_page.html'), PLACE_URL)
+
+    assert info['name'] == "Joe's Pizza"
+    assert info['full_address'] == '7 Carmine St, New York, NY 10014'
+    assert info['phone'] == '(212) 366-1182'
+    assert info['website'] == 'https://joespizza.example.com/'
+    assert info['rating'] == 4.6
+    assert info['review_count'] == 1287
+    assert info['category'] == 'Pizza restaurant'
+    assert info['cid'] == '0x89c259a2e8f4c5ad:0x6f0a1c2bd9c3e111'
+    assert info['latitude'] == '40.7306'
+    assert info['plus_code'] == 'PXQM+7G New York'
+    assert info['opening_hours'].startswith('Monday: 10 AM')
+    assert info['email'] == 'Not given'
+
+
+def test_meta_tags_only_is_not_a_fast_fetch_result():
+    # Phone, website and hours are not in the meta tags: the caller must render the page
+    assert PlaceFetcher.parse_place_html(read_fixture('place_page_meta_only.html'), PLACE_URL) is None
+
+
+def test_parse_meta_tag_fallback():
+    info = PlaceFetcher.parse_place_html(read_fixture('place_page_meta_only.html'), PLACE_URL, partial=True)
+
+    assert info['name'] == "Joe's Pizza"
+    assert info['full_address'] == '7 Carmine St, New York, NY 10014'
+    assert info['category'] == 'Pizza restaurant'
+    assert info['cid'] == '0x89c259a2e8f4c5ad:0x6f0a1c2bd9c3e111'
+
+
+def test_parse_unknown_page_returns_none():
+    assert PlaceFetcher.parse_place_html('<html><body>Before you continue</body></html>') is None
+
+
+def test_fetch_from_stub_server():
+    body = read_fixture('place_page.html').encode('utf-8')
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f'http://127.0.0.1:{server.server_port}/maps/place/Joe/data=!1sstub'
+        fetcher = PlaceFetcher(timeout=5)
+
+        start = time.perf_counter()
+        info = fetcher.fetch(url)
+        elapsed = time.perf_counter() - start
+
+        assert info is not None
+        assert info['name'] == "Joe's Pizza"
+        assert info['url'] == url
+        # No rendering involved: a local fetch + parse is far below a page render
+        assert elapsed < 1.0
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fetch_unreachable_returns_none():
+    assert PlaceFetcher(timeout=1).fetch('http://127.0.0.1:9/maps/place/x') is None
@@ -0,0 +1,221 @@
+"""
+Proxy Health Tests
+Checks time-decayed scoring, the circuit breaker and health-weighted proxy rotation.
+"""
+
+import random
+
+from modules.proxy_manager import ProxyManager
+from modules.utils import ProxyHealthMonitor
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_manager(tmp_path, monitor, count=3):
+    proxy_file = tmp_path / 'proxies.txt'
+    proxy_file.write_text(''.join(f'10.0.0.{i}:8080:user:pass\n' for i in range(1, count + 1)))
+    return ProxyManager(str(proxy_file), rotation_threshold=14, health_monitor=monitor)
+
+
+def test_score_prefers_successful_fast_proxies():
+    monitor = ProxyHealthMonitor(clock=FakeClock())
+    for _ in range(10):
+        monitor.record_success('fast:1', latency=1.0)
+        monitor.record_success('slow:1', latency=20.0)
+        monitor.record_failure('flaky:1')
+        monitor.record_success('flaky:1', latency=1.0)
+
+    assert monitor.get_weight('fast:1') > monitor.get_weight('flaky:1')
+    assert monitor.get_weight('fast:1') > monitor.get_weight('slow:1')
+    assert monitor.get_weight('unknown:1') == 0.5
+    assert monitor.get_best_proxy() == 'fast:1'
+
+
+def test_old_outcomes_decay():
+    clock = FakeClock()
+    monitor = ProxyHealthMonitor(half_life=60, failure_threshold=100, clock=clock)
+    for _ in range(10):
+        monitor.record_failure('p:1')
+    low = monitor.get_weight('p:1')
+
+    clock.now += 600
+    monitor.record_success('p:1')
+
+    assert monitor.get_weight('p:1') > 0.6 > low
+    # Lifetime counters are not decayed
+    assert monitor.get_proxy_stats()['p:1']['total'] == 11
+
+
+def test_circuit_opens_then_half_opens_with_longer_cooldown():
+    clock = FakeClock()
+    monitor = ProxyHealthMonitor(failure_threshold=3, cooldown=60, max_cooldown=100, clock=clock)
+
+    monitor.record_failure('p:1')
+    monitor.record_failure('p:1')
+    assert monitor.is_available('p:1')
+    monitor.record_failure('p:1')
+    assert not monitor.is_available('p:1')
+    assert monitor.get_proxy_stats()['p:1']['circuit'] == 'open'
+
+    clock.now += 61
+    assert monitor.is_available('p:1')
+    assert monitor.get_proxy_stats()['p:1']['circuit'] == 'half_open'
+
+    # One failure while half-open re-opens the circuit, for twice as long (capped)
+    monitor.record_failure('p:1')
+    assert monitor.get_proxy_stats()['p:1']['cooldown_remaining'] == 100
+
+    clock.now += 101
+    monitor.record_success('p:1', latency=2.0)
+    stats = monitor.get_proxy_stats()['p:1']
+    assert stats['circuit'] == 'closed'
+    assert stats['trips'] == 0
+
+
+def test_rotation_skips_circuit_broken_proxies(tmp_path):
+    monitor = ProxyHealthMonitor(failure_threshold=1, clock=FakeClock())
+    manager = make_manager(tmp_path, monitor)
+    monitor.record_failure('10.0.0.2:8080')
+
+    random.seed(1)
+    picked = set()
+    for _ in range(30):
+        manager.mark_failure(manager.get_next_proxy())
+        picked.add(manager.get_current_proxy_info())
+        # Keep the failed proxies usable so only 10.0.0.2 stays broken
+        monitor.record_success('10.0.0.1:8080')
+        monitor.record_success('10.0.0.3:8080')
+
+    assert picked == {'10.0.0.1:8080', '10.0.0.3:8080'}
+
+
+def test_rotation_is_weighted_by_health(tmp_path):
+    monitor = ProxyHealthMonitor(failure_threshold=100, clock=FakeClock())
+    manager = make_manager(tmp_path, monitor)
+    for _ in range(20):
+        monitor.record_success('10.0.0.2:8080', latency=1.0)
+        monitor.record_failure('10.0.0.3:8080')
+
+    random.seed(2)
+    counts = {}
+    for _ in range(300):
+        manager._rotate()
+        key = manager.get_current_proxy_info()
+        counts[key] = counts.get(key, 0) + 1
+
+    assert counts['10.0.0.2:8080'] > counts.get('10.0.0.3:8080', 0) * 5
+
+
+def test_get_next_proxy_leaves_open_circuit(tmp_path):
+    monitor = ProxyHealthMonitor(failure_threshold=2, clock=FakeClock())
+    manager = make_manager(tmp_path, monitor)
+    current = manager.get_next_proxy()
+
+    # Tab timeouts are recorded without rotating; the open circuit rotates on the next pick
+    manager.record_failure(current)
+    manager.record_failure(current)
+
+    assert manager.get_next_proxy() is not current
+
+
+def test_sequential_rotation_without_monitor(tmp_path):
+    manager = make_manager(tmp_path, None)
+    manager.mark_failure()
+    assert manager.get_current_proxy_info() == '10.0.0.2:8080'
+
+
+def test_health_survives_restart(tmp_path):
+    from modules.proxy_health_store import ProxyHealthStore
+
+    clock = FakeClock()
+    db_path = str(tmp_path / 'health.db')
+    monitor = ProxyHealthMonitor(half_life=600, failure_threshold=2, clock=clock,
+                                 store=ProxyHealthStore(db_path), flush_interval=3600)
+    for latency in (1.0, 2.0, 3.0, 4.0):
+        monitor.record_success('good:1', latency=latency)
+    monitor.record_captcha('bad:1')
+    monitor.record_failure('bad:1')
+    monitor.record_failure('bad:1')
+    before = monitor.get_proxy_stats()
+    monitor.flush()
+
+    # Restart shortly after: same scores, same open circuit
+    clock.now += 10
+    restarted = ProxyHealthMonitor(half_life=600, failure_threshold=2, clock=clock,
+                                   store=ProxyHealthStore(db_path))
+    after = restarted.get_proxy_stats()
+
+    assert after['good:1']['total'] == 4
+    assert after['good:1']['latency_p50'] == before['good:1']['latency_p50'] == 3.0
+    assert after['good:1']['latency_p95'] == 4.0
+    assert after['bad:1']['captcha_rate'] == 50.0
+    assert after['bad:1']['last_failure_at'] == before['bad:1']['last_failure_at']
+    assert after['bad:1']['circuit'] == 'open'
+    assert restarted.get_best_proxy() == 'good:1'
+    assert restarted.get_weight('good:1') > restarted.get_weight('bad:1')
+
+    # Old data fades: a day later both proxies are close to unknown again
+    clock.now += 86400
+    later = ProxyHealthMonitor(half_life=600, clock=clock, store=ProxyHealthStore(db_path))
+    assert abs(later.get_weight('bad:1') - 0.5) < 0.01
+    assert later.get_proxy_stats()['bad:1']['circuit'] == 'half_open'
+
+
+def test_reading_weights_marks_nothing_dirty():
+    clock = FakeClock()
+    monitor = ProxyHealthMonitor(half_life=600, clock=clock)
+    monitor.record_failure('a:1')
+    monitor._dirty.clear()
+
+    clock.now += 600
+    weight = monitor.get_weight('a:1')
+    monitor.get_proxy_stats()
+
+    assert monitor._dirty == set()
+    # The weight still decays: one half-life later the failure counts half
+    assert abs(weight - 1 / 2.5) < 1e-9
+
+
+def test_removed_proxy_health_forgotten_once_drained(tmp_path):
+    from modules.proxy_health_store import ProxyHealthStore
+
+    db_path = str(tmp_path / 'health.db')
+    monitor = ProxyHealthMonitor(store=ProxyHealthStore(db_path), flush_interval=0)
+    manager = make_manager(tmp_path, monitor)
+    in_flight = manager.lease(proxy=manager.proxies[2])
+    for proxy in manager.proxies:
+        manager.record_success(proxy, 1.0)
+
+    (tmp_path / 'proxies.txt').write_text('10.0.0.1:8080:user:pass\n10.0.0.2:8080:user:pass\n')
+    assert manager.reload()
+    assert '10.0.0.3:8080' in ProxyHealthStore(db_path).load()
+
+    # The outcome of the in-flight lease still counts, then the proxy is forgotten
+    manager.release(in_flight, success=False)
+    monitor.flush()
+    assert '10.0.0.3:8080' not in monitor.get_proxy_stats()
+    assert set(ProxyHealthStore(db_path).load()) == {'10.0.0.1:8080', '10.0.0.2:8080'}
+
+
+def test_stats_skip_a_proxy_forgotten_while_reporting():
+    monitor = ProxyHealthMonitor(clock=FakeClock())
+    monitor.record_success('a:1', latency=1.0)
+    monitor.record_success('b:1', latency=1.0)
+
+    # The reload thread forgets a drained proxy between listing and reading it
+    get_weight = monitor.get_weight
+
+    def forget_then_weigh(proxy_id):
+        monitor.forget('b:1')
+        return get_weight(proxy_id)
+
+    monitor.get_weight = forget_then_weigh
+    assert list(monitor.get_proxy_stats()) == ['a:1']
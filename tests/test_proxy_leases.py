@@ -0,0 +1,279 @@
+"""
+Proxy Lease Tests
+Checks the per-proxy user limit and fair spreading under threads, asyncio tasks and processes.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from types import SimpleNamespace
+
+from modules.proxy_leases import SharedLeaseTable
+from modules.proxy_manager import ProxyManager
+from modules.scraper import GoogleMapsScraper
+from modules.utils import ProxyHealthMonitor
+
+
+def make_manager(tmp_path, count=3, **kwargs):
+    proxy_file = tmp_path / 'proxies.txt'
+    proxy_file.write_text(''.join(f'10.0.0.{i}:8080:user:pass\n' for i in range(1, count + 1)))
+    return ProxyManager(str(proxy_file), **kwargs)
+
+
+def test_leases_spread_and_respect_limit(tmp_path):
+    manager = make_manager(tmp_path, max_users_per_proxy=2)
+
+    leases = [manager.lease() for _ in range(6)]
+    assert all(leases)
+    assert manager.get_lease_stats()['active'] == {f'10.0.0.{i}:8080': 2 for i in (1, 2, 3)}
+    # The first three leases land on three different proxies
+    assert len({lease.key for lease in leases[:3]}) == 3
+
+    assert manager.lease() is None
+
+    manager.release(leases[0])
+    manager.release(leases[0])  # Releasing twice is harmless
+    again = manager.lease()
+    assert again.key == leases[0].key
+
+
+def test_release_reports_outcome(tmp_path):
+    monitor = ProxyHealthMonitor(failure_threshold=1)
+    manager = make_manager(tmp_path, count=2, health_monitor=monitor)
+
+    lease = manager.lease()
+    manager.release(lease, success=False)
+    assert not monitor.is_available(lease.key)
+
+    # The circuit-broken proxy is not leased while others are available
+    assert all(manager.lease().key != lease.key for _ in range(5))
+
+    other = manager.lease()
+    manager.release(other, success=True, latency=1.5)
+    assert monitor.get_proxy_stats()[other.key]['latency'] == 1.5
+
+
+def test_exclude_and_specific_proxy(tmp_path):
+    manager = make_manager(tmp_path, count=2, max_users_per_proxy=1)
+    first = manager.proxies[0]
+
+    assert manager.lease(exclude={'10.0.0.1:8080'}).key == '10.0.0.2:8080'
+    assert manager.lease(proxy=first).key == '10.0.0.1:8080'
+    assert manager.lease(proxy=first) is None
+
+
+def test_threads_never_exceed_limit(tmp_path):
+    manager = make_manager(tmp_path, max_users_per_proxy=2)
+    peak = {}
+    in_use = {}
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(50):
+            lease = manager.lease()
+            if not lease:
+                continue
+            with lock:
+                in_use[lease.key] = in_use.get(lease.key, 0) + 1
+                peak[lease.key] = max(peak.get(lease.key, 0), in_use[lease.key])
+            time.sleep(0.001)
+            with lock:
+                in_use[lease.key] -= 1
+            manager.release(lease)
+
+    threads = [threading.Thread(target=worker) for _ in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak.values()) <= 2
+    assert manager.get_lease_stats()['active'] == {}
+
+
+def test_async_lease_waits_for_a_slot(tmp_path):
+    manager = make_manager(tmp_path, count=1, max_users_per_proxy=1)
+
+    async def run():
+        held = manager.lease()
+
+        async def give_back():
+            await asyncio.sleep(0.05)
+            manager.release(held)
+
+        asyncio.get_running_loop().create_task(give_back())
+        assert await manager.lease_async(timeout=0.01, poll_interval=0.005) is None
+        lease = await manager.lease_async(timeout=1, poll_interval=0.005)
+        return lease
+
+    assert asyncio.run(run()).key == '10.0.0.1:8080'
+
+
+def _lease_in_process(db_path, keys, results, done):
+    table = SharedLeaseTable(db_path)
+    results.put(table.acquire(keys, 1))
+    # Hold the lease until the parent has checked
+    done.wait(10)
+
+
+def test_shared_table_is_shared_between_processes(tmp_path):
+    db_path = str(tmp_path / 'leases.db')
+    table = SharedLeaseTable(db_path)
+    keys = ['a:1', 'b:1', 'c:1']
+    held = table.acquire(keys, 1)
+
+    results = multiprocessing.Queue()
+    done = multiprocessing.Event()
+    processes = [
+        multiprocessing.Process(target=_lease_in_process, args=(db_path, keys, results, done))
+        for _ in range(3)
+    ]
+    for process in processes:
+        process.start()
+    leased = [results.get(timeout=10) for _ in processes]
+    done.set()
+    for process in processes:
+        process.join(10)
+
+    # One slot per proxy: the parent holds one, the children get the other two and one gets nothing
+    assert sorted(str(item[0]) if item else 'none' for item in leased) == sorted(
+        ['none'] + [key for key in keys if key != held[0]]
+    )
+
+    # Leases of the exited children are reclaimed; the parent's lease stays
+    assert table.acquire(keys, 1) is not None
+    assert table.active_counts()[held[0]] == 1
+
+
+def test_shared_table_expires_leases(tmp_path):
+    table = SharedLeaseTable(str(tmp_path / 'leases.db'), lease_ttl=-1)
+    table.acquire(['a:1'], 1)
+    assert table.active_counts() == {}
+    assert table.acquire(['a:1'], 1) is not None
+
+
+def test_hot_reload_swaps_pool_and_drains_removed(tmp_path):
+    manager = make_manager(tmp_path, count=3)
+    removed_lease = manager.lease(proxy=manager.proxies[2])
+    manager.select_proxy('10.0.0.2:8080')
+
+    probed = []
+    proxy_file = tmp_path / 'proxies.txt'
+    proxy_file.write_text('10.0.0.1:8080:user:pass\n10.0.0.2:8080:user:pass\n10.0.0.4:8080:user:pass\n')
+    assert manager.reload_if_changed(probe=lambda proxies: probed.extend(p['ip'] for p in proxies))
+    assert not manager.reload_if_changed()
+
+    assert probed == ['10.0.0.4']
+    assert [p['ip'] for p in manager.proxies] == ['10.0.0.1', '10.0.0.2', '10.0.0.4']
+    # The current proxy survives the swap
+    assert manager.get_current_proxy_info() == '10.0.0.2:8080'
+
+    # The removed proxy gets no new leases but drains its in-flight one
+    assert manager.get_lease_stats()['draining'] == ['10.0.0.3:8080']
+    assert all(manager.lease().key != '10.0.0.3:8080' for _ in range(6))
+    manager.release(removed_lease)
+    assert manager.get_lease_stats()['draining'] == []
+
+
+def test_hot_reload_ignores_empty_file(tmp_path):
+    manager = make_manager(tmp_path, count=2)
+    (tmp_path / 'proxies.txt').write_text('# being edited\n')
+
+    assert not manager.reload()
+    assert manager.get_proxy_count() == 2
+
+
+def test_browser_leases_another_proxy_or_waits(tmp_path):
+    manager = make_manager(tmp_path, count=2, max_users_per_proxy=1)
+    scraper = GoogleMapsScraper(proxy_manager=manager, headless=True)
+    held = manager.lease(proxy=manager.get_next_proxy())
+
+    # The rotation's proxy is full, so the browser gets the other one
+    proxy = asyncio.run(scraper._lease_browser_proxy())
+    assert manager.proxy_key(proxy) != held.key
+    assert scraper.proxy_lease.key == manager.proxy_key(proxy)
+
+    async def wait_for_slot():
+        await scraper.close_browser()
+        manager.lease()
+        asyncio.get_running_loop().call_later(0.2, manager.release, held)
+        return await scraper._lease_browser_proxy()
+
+    # Every proxy full: the browser waits for a slot instead of running unleased
+    assert manager.proxy_key(asyncio.run(wait_for_slot())) == held.key
+
+
+def test_browser_not_launched_on_full_proxy(tmp_path):
+    manager = make_manager(tmp_path, count=1, max_users_per_proxy=1)
+    scraper = GoogleMapsScraper(proxy_manager=manager, headless=True)
+    scraper.playwright = SimpleNamespace(chromium=SimpleNamespace(launch=None))
+    manager.lease()
+
+    assert asyncio.run(scraper.initialize_browser(manager.proxies[0])) is False
+    assert scraper.browser is None
+    assert scraper.proxy_lease is None
+
+
+def test_current_proxy_readers_wait_for_a_shrinking_reload(tmp_path):
+    manager = make_manager(tmp_path, count=3)
+    manager.select_proxy('10.0.0.3:8080')
+    (tmp_path / 'proxies.txt').write_text('10.0.0.9:8080:user:pass\n')
+    seen, errors = [], []
+
+    def read_current():
+        try:
+            seen.append(manager.get_current_proxy_info())
+            manager.record_failure()
+        except Exception as e:
+            errors.append(e)
+
+    # Run a reader from another thread while the reload is between swapping the list and its index
+    key_of = ProxyManager.proxy_key
+    readers = []
+
+    def proxy_key(proxy):
+        if not readers and len(manager.proxies) == 1:
+            reader = threading.Thread(target=read_current)
+            readers.append(reader)
+            reader.start()
+            reader.join(timeout=0.2)
+        return key_of(proxy)
+
+    manager.proxy_key = proxy_key
+    assert manager.reload()
+    readers[0].join()
+
+    assert errors == []
+    assert seen == ['10.0.0.9:8080']
+
+
+def test_shared_table_is_queried_off_the_event_loop(tmp_path):
+    class LockedTable(SharedLeaseTable):
+        """Shared table whose database is write-locked by another process for a moment."""
+
+        def acquire(self, keys, max_users):
+            time.sleep(0.3)
+            return super().acquire(keys, max_users)
+
+    manager = make_manager(tmp_path, count=1, lease_table=LockedTable(str(tmp_path / 'leases.db')))
+
+    async def run():
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(asyncio.get_running_loop().time())
+                await asyncio.sleep(0.01)
+
+        task = asyncio.get_running_loop().create_task(ticker())
+        lease = await manager.lease_async(timeout=0)
+        await manager.release_async(lease)
+        task.cancel()
+        return lease, ticks
+
+    lease, ticks = asyncio.run(run())
+    assert lease.key == '10.0.0.1:8080'
+    # Other tasks kept running while the lease waited on the database
+    assert len(ticks) > 10
+    assert manager.get_lease_stats()['active'] == {}
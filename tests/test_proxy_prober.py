@@ -0,0 +1,139 @@
+"""
+Proxy Prober Tests
+Probes stub proxies on localhost: healthy, bad credentials, silent and closed.
+"""
+
+import asyncio
+import base64
+import socket
+
+from modules.proxy_prober import ProxyProber
+from modules.utils import ProxyHealthMonitor
+
+
+GOOD_AUTH = 'Basic ' + base64.b64encode(b'user:pass').decode('ascii')
+
+
+async def start_stub_proxy(mode):
+    """Start a stub proxy answering CONNECT: 'ok' checks credentials, 'slow' answers late, 'silent' never answers."""
+    async def handle(reader, writer):
+        headers = []
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            headers.append(line.decode('latin-1').strip())
+
+        if mode == 'slow':
+            await asyncio.sleep(0.2)
+        if mode in ('ok', 'slow'):
+            if f'Proxy-Authorization: {GOOD_AUTH}' in headers:
+                writer.write(b'HTTP/1.1 200 Connection established\r\n\r\n')
+            else:
+                writer.write(b'HTTP/1.1 407 Proxy Authentication Required\r\n\r\n')
+            await writer.drain()
+        elif mode == 'silent':
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                pass
+        writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def closed_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def proxy(port, username='user', password='pass'):
+    return {'ip': '127.0.0.1', 'port': str(port), 'username': username, 'password': password}
+
+
+def test_probe_all_ranks_and_quarantines():
+    monitor = ProxyHealthMonitor()
+    prober = ProxyProber(health_monitor=monitor, target='example.com:443', timeout=0.5)
+    dead_port = closed_port()
+
+    async def run():
+        servers = [await start_stub_proxy(mode) for mode in ('ok', 'ok', 'silent')]
+        (_, ok_port), (_, bad_auth_port), (_, silent_port) = servers
+        proxies = [
+            proxy(silent_port),
+            proxy(bad_auth_port, password='wrong'),
+            proxy(dead_port),
+            proxy(ok_port)
+        ]
+        try:
+            return await prober.probe_all(proxies), ok_port, bad_auth_port, silent_port
+        finally:
+            for server, _ in servers:
+                server.close()
+
+    ranked, ok_port, bad_auth_port, silent_port = asyncio.run(run())
+    errors = {result['proxy']: result['error'] for result in ranked}
+
+    assert ranked[0]['ok'] and ranked[0]['proxy'] == f'127.0.0.1:{ok_port}'
+    assert errors == {
+        f'127.0.0.1:{ok_port}': None,
+        f'127.0.0.1:{bad_auth_port}': 'auth_failed',
+        f'127.0.0.1:{silent_port}': 'timeout',
+        f'127.0.0.1:{dead_port}': 'connect_failed'
+    }
+
+    # Failing proxies are quarantined before any job uses them
+    assert monitor.is_available(f'127.0.0.1:{ok_port}')
+    for port in (bad_auth_port, silent_port, dead_port):
+        assert not monitor.is_available(f'127.0.0.1:{port}')
+    assert monitor.get_proxy_stats()[f'127.0.0.1:{silent_port}']['probe']['error'] == 'timeout'
+
+    stats = prober.get_stats()
+    assert stats['runs'] == 1
+    assert stats['last_run']['healthy'] == 1
+    assert stats['last_run']['quarantined'] == 3
+
+
+def test_passing_probe_leaves_open_circuit_alone():
+    monitor = ProxyHealthMonitor(failure_threshold=1)
+    prober = ProxyProber(health_monitor=monitor, target='example.com:443', timeout=1)
+
+    async def run():
+        server, port = await start_stub_proxy('ok')
+        try:
+            key = f'127.0.0.1:{port}'
+            monitor.record_failure(key)
+            assert not monitor.is_available(key)
+            await prober.probe_all([proxy(port)])
+            return key
+        finally:
+            server.close()
+
+    key = asyncio.run(run())
+    stats = monitor.get_proxy_stats()[key]
+    # Reachable is not the same as served by Google: the cooldown still runs
+    assert not monitor.is_available(key)
+    assert stats['circuit'] == 'open'
+    assert stats['trips'] == 1
+    assert stats['success'] == 0
+    assert stats['probe']['ok'] is True
+    assert stats['probe']['latency'] is not None
+
+
+def test_slow_proxies_fail():
+    prober = ProxyProber(target='example.com:443', timeout=1, slow_latency=0.1)
+
+    async def run():
+        server, port = await start_stub_proxy('slow')
+        try:
+            return await prober.probe(proxy(port))
+        finally:
+            server.close()
+
+    result = asyncio.run(run())
+    assert result['ok'] is False
+    assert result['error'] == 'slow'
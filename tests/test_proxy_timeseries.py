@@ -0,0 +1,83 @@
+"""
+Proxy Time Series Tests
+Checks per-minute proxy samples, cursor reads and the bounded ring buffer.
+"""
+
+from modules.proxy_timeseries import ProxyTimeSeries
+from modules.utils import ProxyHealthMonitor
+from modules.bandwidth import BandwidthMeter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 6000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_samples_per_proxy_per_minute():
+    clock = FakeClock()
+    series = ProxyTimeSeries(interval=60, clock=clock)
+    monitor = ProxyHealthMonitor(clock=clock, timeseries=series)
+    meter = BandwidthMeter(timeseries=series)
+
+    for latency in (1.0, 2.0, 3.0, 10.0):
+        monitor.record_success('p1', latency)
+    monitor.record_failure('p1')
+    monitor.record_captcha('p1')
+    monitor.record_success('p2', 0.5)
+    meter.record('p1', 100, 900, url='https://www.google.com/maps')
+
+    # The current minute is still open
+    assert series.get_samples()['samples'] == []
+
+    clock.now += 60
+    result = series.get_samples()
+    samples = {sample['proxy']: sample for sample in result['samples']}
+
+    assert result['cursor'] == 2
+    assert samples['p1']['success'] == 4
+    assert samples['p1']['failure'] == 1
+    assert samples['p1']['success_rate'] == 80.0
+    assert samples['p1']['latency_p50'] == 2.0
+    assert samples['p1']['latency_p95'] == 10.0
+    assert samples['p1']['captchas'] == 1
+    assert samples['p1']['bytes'] == 1000
+    assert samples['p2']['start'] == 6000.0
+
+
+def test_cursor_returns_only_newer_samples():
+    clock = FakeClock()
+    series = ProxyTimeSeries(interval=60, clock=clock)
+
+    series.record_request('p1', True, 1.0)
+    clock.now += 60
+    first = series.get_samples()
+    assert len(first['samples']) == 1
+
+    series.record_request('p1', False)
+    series.record_request('p2', True)
+    clock.now += 60
+    second = series.get_samples(since=first['cursor'])
+    assert [sample['seq'] for sample in second['samples']] == [2, 3]
+    assert series.get_samples(since=second['cursor'])['samples'] == []
+    assert [sample['proxy'] for sample in series.get_samples(proxy='p2')['samples']] == ['p2']
+
+
+def test_memory_is_bounded():
+    clock = FakeClock()
+    series = ProxyTimeSeries(interval=60, capacity=10, max_latency_samples=5, clock=clock)
+
+    for minute in range(100):
+        for _ in range(20):
+            series.record_request('p1', True, 1.0)
+        assert len(series.open_buckets['p1']['_latencies']) == 5
+        clock.now += 60
+
+    result = series.get_samples()
+    assert len(series.samples) == 10
+    assert [sample['seq'] for sample in result['samples']] == list(range(91, 101))
+    # A client whose cursor fell out of the buffer is told it missed samples
+    assert series.get_samples(since=5)['truncated'] is True
+    assert series.get_samples(since=95)['truncated'] is False
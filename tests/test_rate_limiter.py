@@ -0,0 +1,104 @@
+"""
+Rate Limiter Tests
+Checks per-proxy token buckets: burst, refill rate, independent proxies and sharing between processes.
+"""
+
+import asyncio
+import multiprocessing
+import time
+
+from modules.rate_limiter import ProxyRateLimiter, SharedProxyRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_then_refill_rate():
+    clock = FakeClock()
+    limiter = ProxyRateLimiter(rate=2, burst=3, clock=clock)
+
+    assert [limiter.reserve('p1') for _ in range(3)] == [0, 0, 0]
+    # Empty bucket: each further navigation waits one more refill interval
+    assert limiter.reserve('p1') == 0.5
+    assert limiter.reserve('p1') == 1.0
+
+    # After the debt is repaid the bucket refills up to the burst size only
+    clock.now += 10
+    assert [limiter.reserve('p1') for _ in range(3)] == [0, 0, 0]
+    assert limiter.reserve('p1') == 0.5
+
+
+def test_proxies_have_independent_buckets():
+    limiter = ProxyRateLimiter(rate=1, burst=1, clock=FakeClock())
+
+    assert limiter.reserve('p1') == 0
+    assert limiter.reserve('p1') == 1.0
+    assert limiter.reserve('p2') == 0
+
+
+def test_acquire_waits_and_counts():
+    limiter = ProxyRateLimiter(rate=20, burst=1)
+
+    async def run():
+        return [await limiter.acquire('p1') for _ in range(3)]
+
+    waits = asyncio.run(run())
+    assert waits[0] == 0
+    assert all(wait > 0 for wait in waits[1:])
+
+    stats = limiter.get_stats()['proxies']['p1']
+    assert stats['navigations'] == 3
+    assert stats['throttled'] == 2
+
+
+def _reserve_in_process(db_path, results):
+    limiter = SharedProxyRateLimiter(db_path, rate=0.001, burst=4)
+    results.put([limiter.reserve('p1') > 0 for _ in range(3)])
+
+
+def test_shared_bucket_across_processes(tmp_path):
+    db_path = str(tmp_path / 'rate_limits.db')
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_reserve_in_process, args=(db_path, results)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    throttled = results.get(timeout=30) + results.get(timeout=30)
+    for worker in workers:
+        worker.join(timeout=30)
+
+    # Six navigations against one shared bucket of four: exactly two must wait
+    assert throttled.count(True) == 2
+
+
+def test_shared_reservation_runs_off_the_event_loop(tmp_path):
+    class LockedLimiter(SharedProxyRateLimiter):
+        """Shared limiter whose database is write-locked by another process for a moment."""
+
+        def reserve(self, key):
+            time.sleep(0.3)
+            return super().reserve(key)
+
+    limiter = LockedLimiter(str(tmp_path / 'rate.db'), rate=1, burst=5)
+
+    async def run():
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0.01)
+
+        task = asyncio.get_running_loop().create_task(ticker())
+        waited = await limiter.acquire('a:1')
+        task.cancel()
+        return waited, ticks
+
+    waited, ticks = asyncio.run(run())
+    assert waited == 0
+    # Other tasks kept running while the reservation waited on the database
+    assert len(ticks) > 10
@@ -0,0 +1,174 @@
+"""
+Reviews Tests
+Checks review streaming with a per-place cap, de-duplication and resumption from checkpoints.
+"""
+
+import asyncio
+
+from modules.reviews import ReviewsExtractor, ReviewCheckpoints, HARVEST_REVIEWS_JS, job_fingerprint
+
+
+class FakeLocator:
+    """Stands in for a Playwright locator; every click succeeds."""
+
+    @property
+    def first(self):
+        return self
+
+    async def click(self, timeout=None):
+        pass
+
+
+class FakeReviewsPage:
+    """Serves reviews in scroll batches, like the reviews pane loading more on each scroll."""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.harvests = 0
+
+    def locator(self, selector):
+        return FakeLocator()
+
+    async def wait_for_selector(self, selector, timeout=None):
+        pass
+
+    async def evaluate(self, script):
+        if script != HARVEST_REVIEWS_JS:
+            return None
+        self.harvests += 1
+        return self.batches.pop(0) if self.batches else []
+
+
+def raw_review(number):
+    return {
+        'review_id': f'r{number}',
+        'author': f'Author {number}',
+        'rating_label': '4 stars',
+        'date': 'a week ago',
+        'text': f'Review text {number}',
+        'owner_response': ''
+    }
+
+
+def collect(extractor, page, place_id, max_reviews=None):
+    async def run():
+        return [review async for review in extractor.stream_reviews(page, place_id, max_reviews)]
+    return asyncio.run(run())
+
+
+def make_extractor(checkpoints=None, **kwargs):
+    return ReviewsExtractor(checkpoints=checkpoints, scroll_pause=0, idle_rounds=2, **kwargs)
+
+
+def test_streams_all_reviews_and_drops_duplicates():
+    # The last review of a batch stays in the DOM as the scroll anchor and is read again
+    page = FakeReviewsPage([
+        [raw_review(1), raw_review(2)],
+        [raw_review(2), raw_review(3)],
+        [raw_review(3)]
+    ])
+    reviews = collect(make_extractor(), page, 'cid1')
+
+    assert [review['review_id'] for review in reviews] == ['r1', 'r2', 'r3']
+    assert reviews[0]['place_id'] == 'cid1'
+    assert reviews[0]['rating'] == 4.0
+    assert reviews[0]['author'] == 'Author 1'
+
+
+def test_per_place_cap():
+    page = FakeReviewsPage([[raw_review(i) for i in range(1, 11)]])
+    checkpoints = ReviewCheckpoints()
+    reviews = collect(make_extractor(checkpoints), page, 'cid1', max_reviews=4)
+
+    assert len(reviews) == 4
+    assert checkpoints.get('cid1')['done'] is True
+    assert checkpoints.get('cid1')['count'] == 4
+
+    # A finished place is skipped without opening the pane
+    page = FakeReviewsPage([[raw_review(i) for i in range(1, 11)]])
+    assert collect(make_extractor(checkpoints), page, 'cid1', max_reviews=4) == []
+    assert page.harvests == 0
+
+
+def test_resumes_after_last_review_seen(tmp_path):
+    checkpoint_file = str(tmp_path / 'reviews.json')
+    all_reviews = [raw_review(i) for i in range(1, 8)]
+
+    # First run stops early (e.g. the job was stopped) after three reviews
+    async def partial():
+        stream = make_extractor(ReviewCheckpoints(checkpoint_file)).stream_reviews(
+            FakeReviewsPage([all_reviews]), 'cid1', 0
+        )
+        seen = []
+        async for review in stream:
+            seen.append(review['review_id'])
+            if len(seen) == 3:
+                break
+        await stream.aclose()
+        return seen
+
+    assert asyncio.run(partial()) == ['r1', 'r2', 'r3']
+
+    # Second run, new process: continues after r3 and finishes the place
+    checkpoints = ReviewCheckpoints(checkpoint_file)
+    assert checkpoints.get('cid1')['last_review_id'] == 'r3'
+    reviews = collect(make_extractor(checkpoints), FakeReviewsPage([all_reviews]), 'cid1', 0)
+
+    assert [review['review_id'] for review in reviews] == ['r4', 'r5', 'r6', 'r7']
+    assert checkpoints.get('cid1')['count'] == 7
+    # Running out of new reviews may be a stall, so the place is not marked done
+    assert checkpoints.get('cid1')['done'] is False
+
+
+def test_seen_window_is_bounded():
+    extractor = make_extractor(seen_window=5)
+    page = FakeReviewsPage([[raw_review(i) for i in range(1, 51)]])
+
+    assert len(collect(extractor, page, 'cid1', 0)) == 50
+
+
+def test_checkpoints_belong_to_one_job(tmp_path):
+    checkpoint_file = str(tmp_path / 'reviews.json')
+    checkpoints = ReviewCheckpoints(checkpoint_file)
+    checkpoints.start_job('job-a')
+    collect(make_extractor(checkpoints), FakeReviewsPage([[raw_review(i) for i in range(1, 11)]]), 'cid1', 4)
+
+    # The same job restarted skips the finished place
+    resumed = ReviewCheckpoints(checkpoint_file)
+    resumed.start_job('job-a')
+    assert collect(make_extractor(resumed), FakeReviewsPage([[raw_review(1)]]), 'cid1', 4) == []
+
+    # Another job reads the place from the top
+    other = ReviewCheckpoints(checkpoint_file)
+    other.start_job('job-b')
+    reviews = collect(make_extractor(other), FakeReviewsPage([[raw_review(i) for i in range(1, 11)]]), 'cid1', 4)
+    assert [review['review_id'] for review in reviews] == ['r1', 'r2', 'r3', 'r4']
+
+
+def test_finished_and_expired_jobs_drop_their_progress(tmp_path):
+    checkpoint_file = str(tmp_path / 'reviews.json')
+    checkpoints = ReviewCheckpoints(checkpoint_file)
+    checkpoints.start_job('job-a')
+    checkpoints.update('cid1', 'r3', 3)
+    checkpoints.finish_job()
+
+    reloaded = ReviewCheckpoints(checkpoint_file)
+    reloaded.start_job('job-a')
+    assert reloaded.get('cid1') is None
+
+    reloaded.update('cid1', 'r3', 3)
+    reloaded.save()
+    expired = ReviewCheckpoints(checkpoint_file, max_age=60)
+    expired.jobs['job-a']['updated_at'] -= 120
+    expired.start_job('job-a')
+    assert expired.get('cid1') is None
+
+
+def test_job_fingerprint_follows_queries_and_cap():
+    queries = [{'keyword': 'pizza', 'zip_code': '10001'}]
+
+    assert job_fingerprint(queries, {'max_reviews_per_place': 50}) == job_fingerprint(
+        [dict(queries[0], extra='ignored')], {'max_reviews_per_place': 50, 'reviews': True}
+    )
+    assert job_fingerprint(queries, {'max_reviews_per_place': 50}) != job_fingerprint(queries, {})
+    assert job_fingerprint(queries) != job_fingerprint([{'keyword': 'pizza', 'zip_code': '10002'}])
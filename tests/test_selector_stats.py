@@ -0,0 +1,69 @@
+"""
+Selector Stats Tests
+Checks selector ordering by hit rate, skipping after N misses, rediscovery and persistence.
+"""
+
+from modules.selector_stats import SelectorStats
+
+SELECTORS = ['h1.DUwDvf', 'h1[class*="fontHeadline"]', 'h1']
+
+
+def test_unseen_selectors_keep_default_order():
+    stats = SelectorStats(skip_after=5, explore_every=0)
+
+    assert stats.order('name', SELECTORS) == SELECTORS
+
+
+def test_selectors_ordered_by_hit_rate_then_speed():
+    stats = SelectorStats(skip_after=0, explore_every=0)
+    for _ in range(5):
+        stats.record('name', 'h1.DUwDvf', False, 3.0)
+        stats.record('name', 'h1', True, 0.2)
+        stats.record('name', 'h1[class*="fontHeadline"]', True, 0.05)
+
+    assert stats.order('name', SELECTORS) == ['h1[class*="fontHeadline"]', 'h1', 'h1.DUwDvf']
+
+
+def test_selector_skipped_after_n_misses_and_reset_by_a_hit():
+    stats = SelectorStats(skip_after=3, explore_every=0)
+    for _ in range(3):
+        stats.record('name', 'h1.DUwDvf', False, 3.0)
+
+    assert 'h1.DUwDvf' not in stats.order('name', SELECTORS)
+    assert stats.get_stats()['name']['selectors'][-1]['skipped']
+
+    stats.record('name', 'h1.DUwDvf', True, 0.1)
+    assert 'h1.DUwDvf' in stats.order('name', SELECTORS)
+
+
+def test_never_skips_every_selector():
+    stats = SelectorStats(skip_after=1, explore_every=0)
+    for selector in SELECTORS:
+        stats.record('name', selector, False, 1.0)
+
+    assert sorted(stats.order('name', SELECTORS)) == sorted(SELECTORS)
+
+
+def test_skipped_selector_rediscovered_on_explore_pages():
+    stats = SelectorStats(skip_after=2, explore_every=4)
+    for _ in range(2):
+        stats.record('name', 'h1.DUwDvf', False, 3.0)
+
+    tried = [stats.order('name', SELECTORS) for _ in range(4)]
+
+    assert all('h1.DUwDvf' not in ordered for ordered in tried[:3])
+    # Every 4th page tries all selectors; a hit there brings the selector back
+    assert 'h1.DUwDvf' in tried[3]
+    stats.record('name', 'h1.DUwDvf', True, 0.1)
+    assert 'h1.DUwDvf' in stats.order('name', SELECTORS)
+
+
+def test_stats_persist_across_instances(tmp_path):
+    stats_file = str(tmp_path / 'selector_stats.json')
+    stats = SelectorStats(stats_file=stats_file, skip_after=2, explore_every=0)
+    for _ in range(2):
+        stats.record('name', 'h1.DUwDvf', False, 3.0)
+    stats.save()
+
+    reloaded = SelectorStats(stats_file=stats_file, skip_after=2, explore_every=0)
+    assert reloaded.order('name', SELECTORS) == SELECTORS[1:]
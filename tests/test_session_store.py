@@ -0,0 +1,88 @@
+"""
+Session Store Tests
+Checks per-proxy storage_state persistence, expiry and invalidation.
+"""
+
+import asyncio
+import json
+import os
+import time
+from types import SimpleNamespace
+
+from modules.scraper import GoogleMapsScraper
+from modules.session_store import SessionStore
+
+
+class FakeContext:
+    """Stands in for a Playwright browser context."""
+
+    async def storage_state(self, path):
+        with open(path, 'w') as f:
+            json.dump({'cookies': [{'name': 'CONSENT', 'value': 'YES+'}], 'origins': []}, f)
+
+
+def test_save_then_load(tmp_path):
+    store = SessionStore(directory=str(tmp_path / 'sessions'))
+
+    assert store.load('1.2.3.4:8080') is None
+    assert asyncio.run(store.save(FakeContext(), '1.2.3.4:8080'))
+
+    path = store.load('1.2.3.4:8080')
+    assert path == store.path_for('1.2.3.4:8080')
+    with open(path) as f:
+        assert json.load(f)['cookies'][0]['name'] == 'CONSENT'
+    assert store.get_stats() == {'stored': 1, 'loaded': 1, 'saved': 1, 'expired': 0, 'invalidated': 0}
+
+
+def test_expired_session_is_dropped(tmp_path):
+    store = SessionStore(directory=str(tmp_path), max_age=60)
+    asyncio.run(store.save(FakeContext(), '1.2.3.4:8080'))
+
+    old = time.time() - 120
+    os.utime(store.path_for('1.2.3.4:8080'), (old, old))
+
+    assert store.load('1.2.3.4:8080') is None
+    assert not os.path.exists(store.path_for('1.2.3.4:8080'))
+    assert store.get_stats()['expired'] == 1
+
+
+def test_invalidate_after_captcha(tmp_path):
+    store = SessionStore(directory=str(tmp_path))
+    asyncio.run(store.save(FakeContext(), '1.2.3.4:8080'))
+    asyncio.run(store.save(FakeContext(), '5.6.7.8:3128'))
+
+    store.invalidate('1.2.3.4:8080')
+    store.invalidate('9.9.9.9:1')
+
+    assert store.load('1.2.3.4:8080') is None
+    assert store.load('5.6.7.8:3128') is not None
+    assert store.get_stats()['invalidated'] == 1
+
+
+def test_captcha_in_hedge_context_invalidates_the_hedge_proxy_session(tmp_path):
+    store = SessionStore(directory=str(tmp_path))
+    asyncio.run(store.save(FakeContext(), '1.1.1.1:80'))
+    asyncio.run(store.save(FakeContext(), '2.2.2.2:80'))
+
+    captchas = []
+    hedge_proxy = {'ip': '2.2.2.2', 'port': '80'}
+    scraper = GoogleMapsScraper(
+        proxy_manager=SimpleNamespace(proxies=[], record_captcha=captchas.append), headless=True
+    )
+    scraper.session_store = store
+    scraper.current_proxy = {'ip': '1.1.1.1', 'port': '80'}
+    scraper.hedge_context = object()
+    scraper.hedge_proxy_key = '2.2.2.2:80'
+    scraper.hedge_lease = SimpleNamespace(proxy=hedge_proxy)
+
+    class ChallengedPage:
+        context = scraper.hedge_context
+
+        async def query_selector(self, selector):
+            return object()
+
+    assert asyncio.run(scraper._detect_captcha(ChallengedPage()))
+
+    assert store.load('2.2.2.2:80') is None
+    assert store.load('1.1.1.1:80') is not None
+    assert captchas == [hedge_proxy]
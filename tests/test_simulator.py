@@ -0,0 +1,78 @@
+"""
+Simulator Tests
+Checks the virtual-clock loop and that simulated jobs drive the real scraper to reproducible reports.
+"""
+
+import asyncio
+import time
+
+from config import Config
+from modules.data_extractor import DataExtractor
+from modules.simulator import VirtualClockLoop, compare, simulate
+
+SMALL_WORLD = {
+    'proxies': [{'count': 3, 'latency': 2.0, 'sigma': 0.3, 'failure_rate': 0.0, 'error_rate': 0.0, 'captcha_rate': 0.0}],
+    'results_per_query': [10, 10]
+}
+
+BAD_WORLD = {
+    'proxies': [{'count': 3, 'latency': 5.0, 'sigma': 1.0, 'failure_rate': 0.3, 'error_rate': 0.1, 'captcha_rate': 0.2}],
+    'results_per_query': [10, 10]
+}
+
+
+def test_virtual_clock_skips_idle_time():
+    loop = VirtualClockLoop()
+    try:
+        async def job():
+            await asyncio.sleep(3600)
+            done, _ = await asyncio.wait({asyncio.ensure_future(asyncio.sleep(100))}, timeout=10)
+            return done
+
+        started = time.perf_counter()
+        done = loop.run_until_complete(job())
+        assert time.perf_counter() - started < 1
+        assert not done
+        assert 3610 <= loop.time() < 3611
+    finally:
+        loop.close()
+
+
+def test_simulated_job_reports_policy_metrics():
+    report = simulate(scenario=SMALL_WORLD, queries=2, seed=1)
+
+    # Clean proxies: every business is delivered and only the needed navigations happen
+    assert report['businesses'] == 20
+    assert report['failed_queries'] == 0
+    assert report['navigations'] == 22
+    assert report['wasted_requests'] == 0
+    assert report['virtual_seconds'] > 0
+    assert report['businesses_per_hour'] > 0
+    assert report['tab_latency']['p50'] <= report['tab_latency']['p99']
+    assert report['cpu_seconds'] < report['virtual_seconds']
+
+
+def test_failures_and_captchas_show_up_as_wasted_requests():
+    reports = compare({'one-tab': {'PARALLEL_TABS': 1, 'ADAPTIVE_CONCURRENCY': False}},
+                      scenario=BAD_WORLD, queries=2, seed=3)
+    report = reports['one-tab']
+
+    assert report['wasted_requests'] > 0
+    assert report['outcomes'].get('timeout', 0) + report['outcomes'].get('captcha', 0) > 0
+    assert report['businesses'] < 20
+
+
+def test_same_seed_same_report_and_config_restored():
+    tabs = Config.PARALLEL_TABS
+    timeouts = DataExtractor.timeouts
+
+    first = simulate({'PARALLEL_TABS': 3, 'HEDGE_REQUESTS': True}, scenario=BAD_WORLD, queries=2, seed=7)
+    second = simulate({'PARALLEL_TABS': 3, 'HEDGE_REQUESTS': True}, scenario=BAD_WORLD, queries=2, seed=7)
+    for report in (first, second):
+        report.pop('cpu_seconds')
+        report.pop('wall_seconds')
+
+    assert first == second
+    assert Config.PARALLEL_TABS == tabs
+    assert not hasattr(Config, 'MAX_RETRIES')
+    assert DataExtractor.timeouts is timeouts